@@ -100,7 +100,7 @@ from .classes import SignalObj, ImpulsiveResponse,\
     Measurement, RecMeasure, PlayRecMeasure, FRFMeasure,\
     Streaming, Monitor,\
     OctFilter, weighting,\
-    Analysis, RoomAnalysis
+    Analysis, AnalysisSet, RoomAnalysis
 
 from . import _h5utils
 from . import _plot
@@ -163,6 +163,7 @@ __all__ = [  # Apps
            'SignalObj',
            'ImpulsiveResponse',
            'Analysis',
+           'AnalysisSet',
            'RoomAnalysis',
            'OctFilter',
            'Monitor',
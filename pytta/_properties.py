@@ -52,6 +52,11 @@ default_ = {'samplingRate': 44100,
             'stopMargin': 0.7,
             'startMargin': 0.3,
             'comment': 'No comments.',
+            'filterCacheSize': 64,
+            'filterCacheDir': None,
+            'filterResponseCacheBytes': 2**28,
+            'backend': 'numpy',
+            'precision': 'float32',
             }
 
 
@@ -71,6 +76,11 @@ class Default(object):
     _stopMargin = []
     _startMargin = []
     _comment = []
+    _filterCacheSize = []
+    _filterCacheDir = []
+    _filterResponseCacheBytes = []
+    _backend = []
+    _precision = []
     _instance = None
 
     def __init__(self):
@@ -243,5 +253,40 @@ class Default(object):
         """Commentary."""
         return self._comment
 
+    @property
+    def filterCacheSize(self):
+        """Maximum number of filter bank designs kept in memory."""
+        return self._filterCacheSize
+
+    @property
+    def filterCacheDir(self):
+        """Directory to persist filter bank designs, or None."""
+        return self._filterCacheDir
+
+    @property
+    def filterResponseCacheBytes(self):
+        """Maximum memory, in bytes, of the 'freq' domain band responses kept."""
+        return self._filterResponseCacheBytes
+
+    @property
+    def backend(self):
+        """
+        Room acoustics kernels implementation.
+
+        May be 'numpy' or 'numba', the last one falling back to 'numpy' if
+        Numba is not available.
+        """
+        return self._backend
+
+    @property
+    def precision(self):
+        """
+        Floating point precision of new SignalObjs and their analysis.
+
+        May be 'float32', with complex64 spectra, for throughput, or
+        'float64', with complex128 spectra, for accuracy.
+        """
+        return self._precision
+
 
 default = Default()
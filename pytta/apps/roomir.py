@@ -56,17 +56,20 @@ Authors:
 """
 
 from pytta.classes._base import ChannelObj, ChannelsList
-from pytta import generate, SignalObj, ImpulsiveResponse, Analysis
+from pytta import generate, SignalObj, ImpulsiveResponse, Analysis, \
+    RoomAnalysis
 from pytta import rooms
 from pytta.functions import __h5_unpack as pyttah5unpck
 from pytta import _h5utils as _h5
+from pytta.utils import mean_confidence_interval
 import numpy as np
-import scipy.stats
 from scipy import interpolate
 import h5py
 from os import getcwd, listdir, mkdir
 from os.path import isfile, join, exists
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 import copy as cp
+import hashlib
 import traceback
 
 # Dict with the measurementKinds
@@ -740,6 +743,58 @@ class MeasurementData(object):
                 print('Skipping _h5_link as no MeasuredThing was provided.')
         return
 
+    def _h5_save_link(self, newMeasuredThing):
+        """
+        Method for saving a new MeasuredThing to disc and linking it to
+        MeasurementData.hdf5.
+        """
+        _h5_save(self.path + newMeasuredThing.creation_name + '.hdf5',
+                 newMeasuredThing)
+        self._h5_link(newMeasuredThing)
+        return
+
+    def _calibration_take(self, calibrationTake, kind, *tags):
+        """
+        Method for getting the calibrationTake MeasuredThing of the given kind
+        and tags, or None if there isn't any.
+        """
+        calibThngs = list(self.get(kind, *tags, skipMsgs=True).values())
+        if len(calibThngs) == 0:
+            return None
+        return calibThngs[calibrationTake-1]
+
+    def _inputs_hash(self, msdThng, options, *calibThngs):
+        """
+        Method for getting the content hash of everything a MeasuredThing
+        derived from msdThng is calculated from.
+        """
+        hasher = hashlib.sha1()
+        _hash_update(hasher, (msdThng.kind,
+                              repr(msdThng.inChannels),
+                              repr(msdThng.outChannel),
+                              msdThng.outputAmplification,
+                              msdThng.measuredSignals,
+                              sorted(options.items()),
+                              calibThngs))
+        # Compensations of the msdThng channels
+        for inChCode in msdThng.inChannels.codes:
+            _hash_update(hasher, self.MS.inCompensations.get(inChCode))
+        if msdThng.outChannel is not None:
+            for outChCode in msdThng.outChannel.codes:
+                _hash_update(hasher, self.MS.outCompensations.get(outChCode))
+        return hasher.hexdigest()
+
+    def _saved_hash(self, fileName):
+        """
+        Method for getting the inputs hash of the MeasuredThing saved as
+        fileName, or None if there isn't any.
+        """
+        if not exists(self.path + fileName + '.hdf5'):
+            return None
+        with h5py.File(self.path + fileName + '.hdf5', 'r') as f:
+            if fileName not in f:
+                return None
+            return f[fileName].attrs.get('inputsHash')
 
     def save_take(self, TakeMeasureObj):
         """
@@ -932,7 +987,9 @@ class MeasurementData(object):
                      IREndManualCut=None,
                      IRStartManualCut=None,
                      skipSave=False,
-                     whereToOutComp='excitation'):
+                     whereToOutComp='excitation',
+                     force=False,
+                     workers=None):
         """
         Gets the dict returned from the roomir.MeasuremenData.get() method,
         calculate the impulsive responses, store to disc, and return the
@@ -993,6 +1050,18 @@ class MeasurementData(object):
                 with different options and don't want to override the one saved
                 previously.
 
+            * force (False), (bool):
+                Recalculate the impulsive responses even if the ones saved in
+                disc were calculated from the same inputs. The inputs are the
+                recordings, the excitation signal, the compensation curves, the
+                calibration takes, and the options;
+
+            * workers (None), (int):
+                Number of processes calculating the MeasuredThings' impulsive
+                responses. The new MeasuredThings are saved to disc by a
+                single thread meanwhile. None calculates and saves them one
+                after another;
+
 
         Return (type):
         --------------
@@ -1008,285 +1077,140 @@ class MeasurementData(object):
         self._h5_update_MS()
         self._h5_update_links()
         IRMsdThngs = {}
-        for msdThngName, msdThng in getDict.items():
-            print("Calculating impulsive " +
-                  "response for '{}'".format(msdThngName))
-            if not isinstance(msdThng, MeasuredThing):
-                raise TypeError("'roomir.calculate_ir' only works with " +
-                                "MeasuredThing objects.")
-            elif msdThng.kind not in ['roomres',
-                                      'sourcerecalibration',
-                                      'channelcalibration']:
-                print("-- Impulsive responses can only be calculated " +
-                      "from a MeasuredThing of 'roomres', " +
-                      "'sourcerecalibration' or 'channelcalibration' kind.")
-                continue
-
-            # Getting the excitation signal
-            kind = msdThng.kind
-            origExcitationTimeSig = \
-                cp.copy(self.MS.excitationSignals[msdThng.excitation].
-                    timeSignal)
-            origExctSamplingRate = \
-                self.MS.excitationSignals[msdThng.excitation].samplingRate
-            timeSigWGain = origExcitationTimeSig*msdThng.outputLinearGain
-            excitationWGain = SignalObj(signalArray=timeSigWGain,
-                                        domain='time',
-                                        samplingRate=origExctSamplingRate)
-
-            # Calculate the IRs
-            IRs = []
-
-            if kind in ['channelcalibration']:
-                skipIndCalibration = True
-                skipBypCalibration = True
-                skipInCompensation = True
-                skipOutCompensation = True
-                skipRegularization = True
-                print("- Skipping calibrations and compensations as it's a " +
-                        "channel calibration IR.")
-
-            # Apply compensation for output transducer
-            if not skipOutCompensation and whereToOutComp == 'excitation':
-                outChCode = msdThng.outChannel.codes[0]
-                print("-- Applying compensation to the output " +
-                        "signal for output '{}'.".format(outChCode))
-                if outChCode not in self.MS.outCompensations:
-                    print("--- No compensation found for output " +
-                            "channel " +
-                            "'{}'. ".format(outChCode) +
-                            "Skipping compensation on this " +
-                            "channel.")
-                else:
-                    excitFreqVector = \
-                        excitationWGain.freqVector
-                    excitFreqSignal = \
-                        excitationWGain.freqSignal[:,0]
-                    excitdBMag = \
-                        20*np.log10(np.abs(excitFreqSignal))
-                    outTransSensFreq = \
-                        self.MS.outCompensations[outChCode][0]
-                    outTransSensdBMag = \
-                        self.MS.outCompensations[outChCode][1]
-                    interp_func = \
-                        interpolate.interp1d(outTransSensFreq,
-                                                outTransSensdBMag,
-                                                fill_value= \
-                                                (outTransSensdBMag[0],
-                                                outTransSensdBMag[-1]),
-                                                bounds_error=False)
-                    interpOutTransSensdBMag = \
-                        interp_func(excitFreqVector)
-                    correctedExcitdBMag = \
-                        excitdBMag + interpOutTransSensdBMag
-                    correctedExcitFreqSignal = \
-                        10**(correctedExcitdBMag/20)
-                    r = correctedExcitFreqSignal
-                    teta = np.angle(excitFreqSignal)
-                    correctedExcitFreqSignal = \
-                        r*np.cos(teta) + r*np.sin(teta)*1j
-                    excitationWGain.freqSignal = \
-                        correctedExcitFreqSignal
-            else:
-                print("-- Skipping output transducer compensation on " +
-                      "excitation signal.")
-
-            for avg in range(msdThng.averages):
-                print('- Calculating average {}'.format(avg+1))
-
-                recording = msdThng.measuredSignals[avg]
-
-                # Apply compensation for input transducer
-                if not skipInCompensation:
-                    newFreqSignal = np.zeros(recording.freqSignal.shape,
-                                            dtype=np.complex64)
-                    for chIndex in range(msdThng.numChannels):
-                        inChCode = msdThng.inChannels.codes[chIndex]
-                        outChCode = msdThng.outChannel.codes[0]
-                        print("-- Applying compensation for the input " +
-                                "transducer '{}'.".format(inChCode))
-                        if inChCode not in self.MS.inCompensations:
-                            print("--- No compensation found for input " +
-                                    "channel " +
-                                    "'{}'. ".format(inChCode) +
-                                    "Skipping compensation on this " +
-                                    "channel.")
-                            newFreqSignal[:, chIndex] = \
-                                recording.freqSignal[:, chIndex]
-                        else:
-                            roomResFreqVector = recording.freqVector
-                            roomResFreqSignal = recording.freqSignal[:,chIndex]
-                            roomResdBMag = \
-                                20*np.log10(np.abs(roomResFreqSignal))
-
-                            inTransSensFreq = \
-                                self.MS.inCompensations[inChCode][0]
-                            inTransSensdBMag = \
-                                self.MS.inCompensations[inChCode][1]
-                            in_interp_func = \
-                                interpolate.interp1d(inTransSensFreq,
-                                                     inTransSensdBMag,
-                                                     fill_value= \
-                                                        (inTransSensdBMag[0],
-                                                        inTransSensdBMag[-1]),
-                                                     bounds_error=False)
-                            interpInTransSensdBMag = \
-                                in_interp_func(roomResFreqVector)
-
-                            if not skipOutCompensation and \
-                                 whereToOutComp == 'recording':
-                                print("-- Applying compensation to the " +
-                                       "recording signal for output " +
-                                       "'{}'.".format(outChCode))
-                                outTransSensFreq = \
-                                    self.MS.outCompensations[outChCode][0]
-                                outTransSensdBMag = \
-                                    self.MS.outCompensations[outChCode][1]
-                                out_interp_func = \
-                                    interpolate.interp1d(outTransSensFreq,
-                                                            outTransSensdBMag,
-                                                            fill_value= \
-                                                            (outTransSensdBMag[0],
-                                                            outTransSensdBMag[-1]),
-                                                            bounds_error=False)
-                                interpOutTransSensdBMag = \
-                                    out_interp_func(roomResFreqVector)
-
-                                correctedRoomResdBMag = \
-                                    roomResdBMag - interpInTransSensdBMag - \
-                                        interpOutTransSensdBMag
-                            else:
-                                correctedRoomResdBMag = \
-                                    roomResdBMag - interpInTransSensdBMag
-
-                            correctedRoomResFreqSignal = \
-                                10**(correctedRoomResdBMag/20)
-                            r = correctedRoomResFreqSignal
-                            teta = np.angle(roomResFreqSignal)
-                            correctedRoomResFreqSignal = \
-                                r*np.cos(teta) + r*np.sin(teta)*1j
-                            newFreqSignal[:,chIndex] = \
-                                correctedRoomResFreqSignal
-
-                    recording.freqSignal = newFreqSignal
-                else:
-                    print("-- Skipping input transducer compensation.")
-
-                if skipRegularization:
-                    regularization = False
-                    print("-- Skipping Kirkeby IR regularization.")
-                else:
-                    regularization = True
-
-                IR = ImpulsiveResponse(excitation=excitationWGain,
-                                       recording=recording,
-                                       regularization=regularization)
-
-                # Applying bypass calibration to in/out channel
-                if not skipBypCalibration:
-                    newFreqSignal = np.zeros(IR.systemSignal.freqSignal.shape,
-                                            dtype=np.complex64)
-                    # bypFreqSignal = np.ones(IR.systemSignal.freqSignal.shape,
-                    #                         dtype=np.complex64)
-                    for chIndex in range(msdThng.numChannels):
-                        inChCode = msdThng.inChannels.codes[chIndex]
-                        outChCode = msdThng.outChannel.codes[0]
-                        chFreqSignal = IR.systemSignal.freqSignal[:, chIndex]
-                        chSignal = SignalObj(chFreqSignal, 'freq',
-                                             self.MS.samplingRate)
-                        # chSignal = IR.systemSignal
-                        print("-- Applying the bypass calibration on" +
-                                " '{}' channel.".format(inChCode))
-                        # Get the channelcalibir signal
-                        chCalibThngs = [calib for calib in
-                                        self.get('channelcalibir',
-                                                    inChCode,
-                                                    outChCode,
-                                                    skipMsgs=True).values()]
-                        if len(chCalibThngs) == 0:
-                            print("--- No channelcalibir found for input/" +
-                                    "output channels " +
-                                    "'{}/{}'. ".format(inChCode,outChCode) +
-                                    "Skipping channel calibration on this " +
-                                    "channels.")
-                            newFreqSignal[:, chIndex] = \
-                                IR.systemSignal.freqSignal[:, chIndex]
-                        else:
-                            # Getting the bypass IR
-                            chCalibThng = chCalibThngs[calibrationTake-1]
-                            chCalibIR = chCalibThng.measuredSignals[
-                                            chCalibThng.averages//2]. \
-                                                systemSignal
-
-                            # Normalize with 1000.00 [Hz] spectrum magnitude
-                            idx1k = \
-                                np.where(chCalibIR.freqVector>=1000)[0][0]
-                            chCalibIR.freqSignal = chCalibIR._freqSignal / \
-                                float(np.abs(chCalibIR.freqSignal[idx1k]))
-
-                            # Deconvolution
-                            newIR = \
-                                ImpulsiveResponse(recording=chSignal,
-                                                excitation=chCalibIR,
-                                                regularization=False)
-                            newFreqSignal[:, chIndex] = \
-                                newIR.systemSignal.freqSignal[:, 0]
-                    IR.systemSignal.freqSignal = newFreqSignal
-                else:
-                    print("-- Skipping the bypass calibration.")
-
-                # Applying input indirect calibration
-                for chIndex in range(msdThng.numChannels):
-                    inChCode = msdThng.inChannels.codes[chIndex]
-                    outChCode = msdThng.outChannel.codes[0]
-
-                    if not skipIndCalibration:
-                        print("-- Applying the input indirect calibration on" +
-                                " '{}' channel.".format(inChCode))
-                        # Get the miccalibration signal
-                        calibThngs = [calib for calib in
-                                        self.get('miccalibration', inChCode,
-                                                skipMsgs=True).values()]
-                        if len(calibThngs) == 0:
-                            print("--- No miccalibration found for channel " +
-                                    "'{}'. Skipping ".format(inChCode) +
-                                    "calibration in this channel.")
-                        else:
-                            calib = calibThngs[calibrationTake-1]. \
-                                measuredSignals[calibThngs[calibrationTake-1].
-                                    averages//2]
-                            IR.systemSignal.calib_pressure(chIndex, calib, 1, 1000)
+        # The channel calibration IRs are calculated and saved first, so the
+        # other MeasuredThings take them for the bypass calibration
+        calibNames = [msdThngName for msdThngName, msdThng in getDict.items()
+                      if isinstance(msdThng, MeasuredThing) and
+                      msdThng.kind == 'channelcalibration']
+        groups = [calibNames, [msdThngName for msdThngName in getDict
+                               if msdThngName not in calibNames]]
+        fileNames = {}
+        # Calculate the IRs, in other processes if asked for, while the
+        # MeasuredThings are saved by a single thread
+        pool = None if workers is None else ProcessPoolExecutor(workers)
+        writer = None if workers is None else ThreadPoolExecutor(1)
+        try:
+            for group in groups:
+                jobs = []
+                for msdThngName in group:
+                    setup = self._ir_job(msdThngName, getDict[msdThngName],
+                                       calibrationTake, force,
+                                       skipInCompensation=skipInCompensation,
+                                       skipOutCompensation=skipOutCompensation,
+                                       skipBypCalibration=skipBypCalibration,
+                                       skipRegularization=skipRegularization,
+                                       skipIndCalibration=skipIndCalibration,
+                                       IREndManualCut=IREndManualCut,
+                                       IRStartManualCut=IRStartManualCut,
+                                       whereToOutComp=whereToOutComp)
+                    if setup is None:
+                        continue
+                    fileName, job, IRMsdThng = setup
+                    fileNames[msdThngName] = fileName
+                    if IRMsdThng is None:
+                        jobs.append(job)
                     else:
-                        print("-- Skipping the input indirect calibration on" +
-                                " '{}' channel.".format(inChCode))
-
-                # Copying channel names and codes
-                for idx, chNum in \
-                    enumerate(IR.systemSignal.channels.mapping):
-                    IR.systemSignal.channels[chNum].name = \
-                        msdThng.inChannels.names[idx]
-                    IR.systemSignal.channels[chNum].code = \
-                        msdThng.inChannels.codes[idx]
-
-                # Cutting the IR
-                if IRStartManualCut is not None or IREndManualCut is not None:
-                    IREndManualCut = \
-                        'end' if IREndManualCut is None else IREndManualCut
-                    IRStartManualCut = \
-                        0 if IRStartManualCut is None else IRStartManualCut
-
-                    IR.systemSignal.crop(IRStartManualCut, IREndManualCut)
+                        IRMsdThngs[fileName] = IRMsdThng
+                self._run_ir_jobs(jobs, IRMsdThngs, skipSave, pool, writer)
+        finally:
+            if pool is not None:
+                pool.shutdown()
+                writer.shutdown()
+        print('Done.')
 
-                IRs.append(IR)
+        # Keeping the getDict order
+        return {fileNames[msdThngName]: IRMsdThngs[fileNames[msdThngName]]
+                for msdThngName in getDict if msdThngName in fileNames}
 
+    def _ir_job(self, msdThngName, msdThng, calibrationTake, force,
+                **options):
+        """
+        Method for setting up the impulsive responses calculation of a
+        MeasuredThing for calculate_ir. Returns None if it can't be
+        calculated, or a tuple with the new MeasuredThing's file name, the
+        calculation job, and the MeasuredThing loaded from disc if it was
+        already calculated from the same inputs (None otherwise).
+        """
+        print("Calculating impulsive " +
+              "response for '{}'".format(msdThngName))
+        if not isinstance(msdThng, MeasuredThing):
+            raise TypeError("'roomir.calculate_ir' only works with " +
+                            "MeasuredThing objects.")
+        elif msdThng.kind not in ['roomres',
+                                  'sourcerecalibration',
+                                  'channelcalibration']:
+            print("-- Impulsive responses can only be calculated " +
+                  "from a MeasuredThing of 'roomres', " +
+                  "'sourcerecalibration' or 'channelcalibration' kind.")
+            return None
+        kind = msdThng.kind
+        if kind == 'roomres':
+            newKind = 'roomir'
+        elif kind == 'sourcerecalibration':
+            newKind = 'recalibir'
+        elif kind == 'channelcalibration':
+            newKind = 'channelcalibir'
+        fileName = msdThngName.replace(kind, newKind)
+
+        if kind in ['channelcalibration']:
+            options.update(dict.fromkeys(['skipInCompensation',
+                                          'skipOutCompensation',
+                                          'skipBypCalibration',
+                                          'skipRegularization',
+                                          'skipIndCalibration'], True))
+            print("- Skipping calibrations and compensations as it's a " +
+                    "channel calibration IR.")
+
+        # Getting the calibration takes, once for all averages
+        outChCode = msdThng.outChannel.codes[0]
+        chCalibThngs = {}
+        micCalibThngs = {}
+        for inChCode in msdThng.inChannels.codes:
+            if not options['skipBypCalibration']:
+                chCalibThngs[inChCode] = self._calibration_take(
+                    calibrationTake, 'channelcalibir', inChCode, outChCode)
+            if not options['skipIndCalibration']:
+                micCalibThngs[inChCode] = self._calibration_take(
+                    calibrationTake, 'miccalibration', inChCode)
+
+        # Skipping if the saved IR was calculated from the same inputs
+        inputsHash = self._inputs_hash(
+            msdThng, options, chCalibThngs, micCalibThngs,
+            self.MS.excitationSignals[msdThng.excitation])
+        if not force and self._saved_hash(fileName) == inputsHash:
+            print("- Inputs unchanged. Loading '{}'".format(fileName))
+            IRMsdThng = _h5_load(self.path + fileName + '.hdf5',
+                                 skipMsgs=True)[fileName]
+            return fileName, None, IRMsdThng
+
+        return (fileName,
+                (fileName, newKind, inputsHash, msdThng,
+                 (msdThng,
+                  self.MS.excitationSignals[msdThng.excitation],
+                  self.MS.samplingRate, self.MS.inCompensations,
+                  self.MS.outCompensations, chCalibThngs,
+                  micCalibThngs),
+                 options),
+                None)
+
+    def _run_ir_jobs(self, jobs, IRMsdThngs, skipSave, pool, writer):
+        """
+        Method for calculating the impulsive responses of the jobs set up by
+        calculate_ir and saving the new MeasuredThings to disc. Returns after
+        all of them are saved.
+        """
+        if pool is None:
+            results = (_calculate_irs(*args, **options)
+                       for *_, args, options in jobs)
+        else:
+            results = [pool.submit(_calculate_irs, *args, **options)
+                       for *_, args, options in jobs]
+            results = (future.result() for future in results)
+        saves = []
+        for (fileName, newKind, inputsHash, msdThng, *_), IRs in \
+                zip(jobs, results):
             # Construct the MeasuredThing
             print('- Constructing the new MeasuredThing.')
-            if kind == 'roomres':
-                newKind = 'roomir'
-            elif kind == 'sourcerecalibration':
-                newKind = 'recalibir'
-            elif kind == 'channelcalibration':
-                newKind = 'channelcalibir'
             IRMsdThng = MeasuredThing(kind=newKind,
                                       arrayName=msdThng.arrayName,
                                       sourcePos=msdThng.sourcePos,
@@ -1298,26 +1222,24 @@ class MeasurementData(object):
                                       inChannels=msdThng.inChannels,
                                       outChannel=msdThng.outChannel,
                                       outputAmplification=msdThng.
-                                        outputAmplification)
+                                        outputAmplification,
+                                      inputsHash=inputsHash)
             # Saving
-            fileName = msdThngName
-            # Number the file checking if any measurement with the same configs
-            # was take
-            fileName = fileName.replace(kind, newKind)
             if not skipSave:
                 print("-- Saving '{}'".format(fileName))
-                # Saving the MeasuredThing to the disc
                 IRMsdThng.creation_name = fileName
-                _h5_save(self.path + fileName + '.hdf5', IRMsdThng)
-                # Save the MeasuredThing link to measurementData.hdf5
-                self._h5_link(IRMsdThng)
+                if writer is None:
+                    self._h5_save_link(IRMsdThng)
+                else:
+                    saves.append(writer.submit(self._h5_save_link,
+                                               IRMsdThng))
             IRMsdThngs[fileName] = IRMsdThng
-        print('Done.')
-
-        return IRMsdThngs
+        for save in saves:
+            save.result()
+        return
 
     def calibrate_res(self, getDict, calibrationTake=1,
-                      skipInCompensation=False, skipSave=False):
+                      skipInCompensation=False, skipSave=False, force=False):
         """
         Gets the dict returned from the roomir.MeasuremenData.get() method,
         apply the indirect calibration, store to disc, and return the
@@ -1349,6 +1271,11 @@ class MeasurementData(object):
             * skipSave (False), (bool):
                 Option to skip saving the new MeasuredThings to disc.
 
+            * force (False), (bool):
+                Recalibrate the responses even if the ones saved in disc were
+                calibrated from the same inputs. The inputs are the recordings,
+                the compensation curves, the calibration takes, and the options;
+
 
         Return (type):
         --------------
@@ -1376,6 +1303,24 @@ class MeasurementData(object):
                       "'sourcerecalibration' kind")
                 continue
             kind = msdThng.kind
+            newKind = 'calibrated-' + kind
+            fileName = msdThngName.replace(kind, newKind)
+
+            # Getting the calibration takes, once for all averages
+            micCalibThngs = {}
+            for inChCode in msdThng.inChannels.codes:
+                micCalibThngs[inChCode] = self._calibration_take(
+                    calibrationTake, 'miccalibration', inChCode)
+
+            # Skipping if the saved response was calibrated from the same
+            # inputs
+            options = {'skipInCompensation': skipInCompensation}
+            inputsHash = self._inputs_hash(msdThng, options, micCalibThngs)
+            if not force and self._saved_hash(fileName) == inputsHash:
+                print("- Inputs unchanged. Loading '{}'".format(fileName))
+                CalibMsdThngs[fileName] = _h5_load(
+                    self.path + fileName + '.hdf5', skipMsgs=True)[fileName]
+                continue
 
             # Calibrate the SignalObjs
             SigObjs = []
@@ -1447,24 +1392,19 @@ class MeasurementData(object):
                     inChCode = msdThng.inChannels.codes[chIndex]
                     print("-- Applying the input calibration on " +
                             "'{}' channel.".format(inChCode))
-                    calibThngs = [calib for calib in
-                                    self.get('miccalibration', inChCode,
-                                            skipMsgs=True).values()]
-                    if len(calibThngs) == 0:
+                    calibThng = micCalibThngs[inChCode]
+                    if calibThng is None:
                         print("--- No miccalibration found for channel " +
                                 "'{}'. Skipping ".format(inChCode) +
                                 "calibration in this channel.")
                         continue
-                    calib = calibThngs[calibrationTake-1]. \
-                        measuredSignals[calibThngs[calibrationTake-1].
-                            averages//2]
+                    calib = calibThng.measuredSignals[calibThng.averages//2]
                     SigObj.calib_pressure(chIndex, calib, 1, 1000)
 
                 SigObjs.append(SigObj)
 
             # Construct the MeasuredThing
             print('- Constructing the new MeasuredThing.')
-            newKind = 'calibrated-' + kind
             CalibMsdThng = MeasuredThing(kind=newKind,
                                       arrayName=msdThng.arrayName,
                                       sourcePos=msdThng.sourcePos,
@@ -1476,12 +1416,9 @@ class MeasurementData(object):
                                       inChannels=msdThng.inChannels,
                                       outChannel=msdThng.outChannel,
                                       outputAmplification=msdThng.
-                                        outputAmplification)
+                                        outputAmplification,
+                                      inputsHash=inputsHash)
             # Saving
-            fileName = msdThngName
-            # Number the file checking if any measurement with the same configs
-            # was take
-            fileName = fileName.replace(kind, newKind)
             if not skipSave:
                 print("-- Saving '{}'".format(fileName))
                 # Saving the MeasuredThing to the disc
@@ -2028,6 +1965,10 @@ class MeasuredThing(object):
         * averages (int):
             The number of averages;
 
+        * inputsHash (str):
+            Content hash of the inputs of a calculated MeasuredThing, e.g.
+            'roomir' or 'calibrated-roomres'. None for measured ones;
+
 
     """
 
@@ -2044,7 +1985,8 @@ class MeasuredThing(object):
                  receiverPos=None,
                  excitation=None,
                  outChannel=None,
-                 outputAmplification=0):
+                 outputAmplification=0,
+                 inputsHash=None):
         self.kind = kind
         self.arrayName = arrayName
         self.sourcePos = sourcePos
@@ -2056,6 +1998,7 @@ class MeasuredThing(object):
         self.inChannels = inChannels
         self.outChannel = outChannel
         self.outputAmplification = outputAmplification
+        self.inputsHash = inputsHash
 
     # Magic methods
 
@@ -2071,7 +2014,8 @@ class MeasuredThing(object):
                 f'receiverPos={self.receiverPos!r}, '
                 f'excitation={self.excitation!r}, '
                 f'outChannel={self.outChannel!r}, '
-                f'outputAmplification={self.outputAmplification!r})')
+                f'outputAmplification={self.outputAmplification!r}, '
+                f'inputsHash={self.inputsHash!r})')
 
     def __str__(self):
         str = self.kind + '_'  # Kind info
@@ -2107,6 +2051,8 @@ class MeasuredThing(object):
         h5group.attrs['outChannel'] = repr(self.outChannel)
         h5group.attrs['outputAmplification'] = self.outputAmplification
         h5group.attrs['timeStamps'] = self.timeStamps
+        if self.inputsHash is not None:
+            h5group.attrs['inputsHash'] = self.inputsHash
         h5group['tempHumids'] = self.tempHumids
         h5group.create_group('measuredSignals')
         for idx, msdSignal in enumerate(self.measuredSignals):
@@ -2134,12 +2080,280 @@ class MeasuredThing(object):
         return 10**(self.outputAmplification/20)
 
 
-def _mean_confidence_interval(data, confidence=0.95):
-    a = 1.0 * np.array(data)
-    n = len(a)
-    m, se = np.mean(a), scipy.stats.sem(a)
-    h = se * scipy.stats.t.ppf((1 + confidence) / 2., n-1)
-    return m, h
+def _calculate_irs(msdThng, excitation, samplingRate, inCompensations,
+                   outCompensations, chCalibThngs, micCalibThngs,
+                   skipInCompensation, skipOutCompensation,
+                   skipBypCalibration, skipRegularization, skipIndCalibration,
+                   IREndManualCut, IRStartManualCut, whereToOutComp):
+    """
+    Calculate the impulsive responses of each msdThng average. Used by
+    MeasurementData.calculate_ir, possibly in other processes, so everything
+    it needs from the MeasurementSetup and the calibration takes is passed in.
+    """
+    # Getting the excitation signal
+    origExcitationTimeSig = cp.copy(excitation.timeSignal)
+    origExctSamplingRate = excitation.samplingRate
+    timeSigWGain = origExcitationTimeSig*msdThng.outputLinearGain
+    excitationWGain = SignalObj(signalArray=timeSigWGain,
+                                domain='time',
+                                samplingRate=origExctSamplingRate)
+
+    # Calculate the IRs
+    IRs = []
+
+    # Apply compensation for output transducer
+    if not skipOutCompensation and whereToOutComp == 'excitation':
+        outChCode = msdThng.outChannel.codes[0]
+        print("-- Applying compensation to the output " +
+                "signal for output '{}'.".format(outChCode))
+        if outChCode not in outCompensations:
+            print("--- No compensation found for output " +
+                    "channel " +
+                    "'{}'. ".format(outChCode) +
+                    "Skipping compensation on this " +
+                    "channel.")
+        else:
+            excitFreqVector = \
+                excitationWGain.freqVector
+            excitFreqSignal = \
+                excitationWGain.freqSignal[:,0]
+            excitdBMag = \
+                20*np.log10(np.abs(excitFreqSignal))
+            outTransSensFreq = \
+                outCompensations[outChCode][0]
+            outTransSensdBMag = \
+                outCompensations[outChCode][1]
+            interp_func = \
+                interpolate.interp1d(outTransSensFreq,
+                                        outTransSensdBMag,
+                                        fill_value= \
+                                        (outTransSensdBMag[0],
+                                        outTransSensdBMag[-1]),
+                                        bounds_error=False)
+            interpOutTransSensdBMag = \
+                interp_func(excitFreqVector)
+            correctedExcitdBMag = \
+                excitdBMag + interpOutTransSensdBMag
+            correctedExcitFreqSignal = \
+                10**(correctedExcitdBMag/20)
+            r = correctedExcitFreqSignal
+            teta = np.angle(excitFreqSignal)
+            correctedExcitFreqSignal = \
+                r*np.cos(teta) + r*np.sin(teta)*1j
+            excitationWGain.freqSignal = \
+                correctedExcitFreqSignal
+    else:
+        print("-- Skipping output transducer compensation on " +
+              "excitation signal.")
+
+    for avg in range(msdThng.averages):
+        print('- Calculating average {}'.format(avg+1))
+
+        recording = msdThng.measuredSignals[avg]
+
+        # Apply compensation for input transducer
+        if not skipInCompensation:
+            newFreqSignal = np.zeros(recording.freqSignal.shape,
+                                    dtype=np.complex64)
+            for chIndex in range(msdThng.numChannels):
+                inChCode = msdThng.inChannels.codes[chIndex]
+                outChCode = msdThng.outChannel.codes[0]
+                print("-- Applying compensation for the input " +
+                        "transducer '{}'.".format(inChCode))
+                if inChCode not in inCompensations:
+                    print("--- No compensation found for input " +
+                            "channel " +
+                            "'{}'. ".format(inChCode) +
+                            "Skipping compensation on this " +
+                            "channel.")
+                    newFreqSignal[:, chIndex] = \
+                        recording.freqSignal[:, chIndex]
+                else:
+                    roomResFreqVector = recording.freqVector
+                    roomResFreqSignal = recording.freqSignal[:,chIndex]
+                    roomResdBMag = \
+                        20*np.log10(np.abs(roomResFreqSignal))
+
+                    inTransSensFreq = \
+                        inCompensations[inChCode][0]
+                    inTransSensdBMag = \
+                        inCompensations[inChCode][1]
+                    in_interp_func = \
+                        interpolate.interp1d(inTransSensFreq,
+                                             inTransSensdBMag,
+                                             fill_value= \
+                                                (inTransSensdBMag[0],
+                                                inTransSensdBMag[-1]),
+                                             bounds_error=False)
+                    interpInTransSensdBMag = \
+                        in_interp_func(roomResFreqVector)
+
+                    if not skipOutCompensation and \
+                         whereToOutComp == 'recording':
+                        print("-- Applying compensation to the " +
+                               "recording signal for output " +
+                               "'{}'.".format(outChCode))
+                        outTransSensFreq = \
+                            outCompensations[outChCode][0]
+                        outTransSensdBMag = \
+                            outCompensations[outChCode][1]
+                        out_interp_func = \
+                            interpolate.interp1d(outTransSensFreq,
+                                                    outTransSensdBMag,
+                                                    fill_value= \
+                                                    (outTransSensdBMag[0],
+                                                    outTransSensdBMag[-1]),
+                                                    bounds_error=False)
+                        interpOutTransSensdBMag = \
+                            out_interp_func(roomResFreqVector)
+
+                        correctedRoomResdBMag = \
+                            roomResdBMag - interpInTransSensdBMag - \
+                                interpOutTransSensdBMag
+                    else:
+                        correctedRoomResdBMag = \
+                            roomResdBMag - interpInTransSensdBMag
+
+                    correctedRoomResFreqSignal = \
+                        10**(correctedRoomResdBMag/20)
+                    r = correctedRoomResFreqSignal
+                    teta = np.angle(roomResFreqSignal)
+                    correctedRoomResFreqSignal = \
+                        r*np.cos(teta) + r*np.sin(teta)*1j
+                    newFreqSignal[:,chIndex] = \
+                        correctedRoomResFreqSignal
+
+            recording.freqSignal = newFreqSignal
+        else:
+            print("-- Skipping input transducer compensation.")
+
+        if skipRegularization:
+            regularization = False
+            print("-- Skipping Kirkeby IR regularization.")
+        else:
+            regularization = True
+
+        IR = ImpulsiveResponse(excitation=excitationWGain,
+                               recording=recording,
+                               regularization=regularization)
+
+        # Applying bypass calibration to in/out channel
+        if not skipBypCalibration:
+            newFreqSignal = np.zeros(IR.systemSignal.freqSignal.shape,
+                                    dtype=np.complex64)
+            # bypFreqSignal = np.ones(IR.systemSignal.freqSignal.shape,
+            #                         dtype=np.complex64)
+            for chIndex in range(msdThng.numChannels):
+                inChCode = msdThng.inChannels.codes[chIndex]
+                outChCode = msdThng.outChannel.codes[0]
+                chFreqSignal = IR.systemSignal.freqSignal[:, chIndex]
+                chSignal = SignalObj(chFreqSignal, 'freq',
+                                     samplingRate)
+                # chSignal = IR.systemSignal
+                print("-- Applying the bypass calibration on" +
+                        " '{}' channel.".format(inChCode))
+                # Get the channelcalibir signal
+                chCalibThng = chCalibThngs[inChCode]
+                if chCalibThng is None:
+                    print("--- No channelcalibir found for input/" +
+                            "output channels " +
+                            "'{}/{}'. ".format(inChCode,outChCode) +
+                            "Skipping channel calibration on this " +
+                            "channels.")
+                    newFreqSignal[:, chIndex] = \
+                        IR.systemSignal.freqSignal[:, chIndex]
+                else:
+                    # Getting the bypass IR, a copy as it's shared
+                    # by all averages
+                    chCalibIR = cp.deepcopy(chCalibThng.measuredSignals[
+                                    chCalibThng.averages//2].
+                                        systemSignal)
+
+                    # Normalize with 1000.00 [Hz] spectrum magnitude
+                    idx1k = \
+                        np.where(chCalibIR.freqVector>=1000)[0][0]
+                    chCalibIR.freqSignal = chCalibIR.freqSignal / \
+                        float(np.abs(chCalibIR.freqSignal[idx1k]))
+
+                    # Deconvolution
+                    newIR = \
+                        ImpulsiveResponse(recording=chSignal,
+                                        excitation=chCalibIR,
+                                        regularization=False)
+                    newFreqSignal[:, chIndex] = \
+                        newIR.systemSignal.freqSignal[:, 0]
+            IR.systemSignal.freqSignal = newFreqSignal
+        else:
+            print("-- Skipping the bypass calibration.")
+
+        # Applying input indirect calibration
+        for chIndex in range(msdThng.numChannels):
+            inChCode = msdThng.inChannels.codes[chIndex]
+            outChCode = msdThng.outChannel.codes[0]
+
+            if not skipIndCalibration:
+                print("-- Applying the input indirect calibration on" +
+                        " '{}' channel.".format(inChCode))
+                # Get the miccalibration signal
+                calibThng = micCalibThngs[inChCode]
+                if calibThng is None:
+                    print("--- No miccalibration found for channel " +
+                            "'{}'. Skipping ".format(inChCode) +
+                            "calibration in this channel.")
+                else:
+                    calib = calibThng.measuredSignals[
+                        calibThng.averages//2]
+                    IR.systemSignal.calib_pressure(chIndex, calib, 1, 1000)
+            else:
+                print("-- Skipping the input indirect calibration on" +
+                        " '{}' channel.".format(inChCode))
+
+        # Copying channel names and codes
+        for idx, chNum in \
+            enumerate(IR.systemSignal.channels.mapping):
+            IR.systemSignal.channels[chNum].name = \
+                msdThng.inChannels.names[idx]
+            IR.systemSignal.channels[chNum].code = \
+                msdThng.inChannels.codes[idx]
+
+        # Cutting the IR
+        if IRStartManualCut is not None or IREndManualCut is not None:
+            IREndManualCut = \
+                'end' if IREndManualCut is None else IREndManualCut
+            IRStartManualCut = \
+                0 if IRStartManualCut is None else IRStartManualCut
+
+            IR.systemSignal.crop(IRStartManualCut, IREndManualCut)
+
+        IRs.append(IR)
+
+    return IRs
+
+
+def _hash_update(hasher, obj):
+    """
+    Feed the content of MeasuredThings, signals, arrays, and containers of
+    them to a hashlib hasher.
+    """
+    if isinstance(obj, MeasuredThing):
+        _hash_update(hasher, (obj.kind, obj.measuredSignals))
+    elif isinstance(obj, ImpulsiveResponse):
+        _hash_update(hasher, obj.systemSignal)
+    elif isinstance(obj, SignalObj):
+        _hash_update(hasher, (obj.samplingRate, obj.timeSignal))
+    elif isinstance(obj, np.ndarray):
+        hasher.update(repr((obj.dtype.str, obj.shape)).encode())
+        hasher.update(np.ascontiguousarray(obj).data)
+    elif isinstance(obj, dict):
+        _hash_update(hasher, sorted(obj.items()))
+    elif isinstance(obj, (list, tuple)):
+        hasher.update(b'(')
+        for item in obj:
+            _hash_update(hasher, item)
+        hasher.update(b')')
+    else:
+        hasher.update(repr(obj).encode())
+    return
 
 
 class MeasurementPostProcess(object):
@@ -2203,7 +2417,8 @@ class MeasurementPostProcess(object):
         self.minFreq = minFreq
         self.maxFreq = maxFreq
 
-    def RT(self, roomirsGetDict, decay=20, IREndManualCut=None):
+    def RT(self, roomirsGetDict, decay=20, IREndManualCut=None,
+           workers=None):
         """
         Calculates the average reverberation time for each source-receiver
         pair from the dict provided by the roomir.MeasurementData.get method.
@@ -2220,13 +2435,17 @@ class MeasurementPostProcess(object):
                 a dict from the roomir.MeasurementData.get method containing
                 MeasuredThings of the type 'roomir' (room impulsive response);
 
-            * decay (20), (int):
-                dynamic range of the line fit;
+            * decay (20), (int | str):
+                dynamic range of the line fit, 20, 30 or 'EDT';
 
             * IREndManualCut (None), (float):
                 remove the end of the impulsive response from IREndManualCut,
                 given in seconds;
 
+            * workers (None), (int):
+                number of processes analysing the impulsive responses, see
+                pytta.RoomAnalysis.batch;
+
 
         Return (type):
         --------------
@@ -2254,7 +2473,12 @@ class MeasurementPostProcess(object):
 
         # TR in all positions and averagßes
         # TR_avgs = {'S1R1': [Analysis_avg1, An_avg2, ..., An_avgn]}
+        paramName = 'EDT' if str(decay).upper() == 'EDT' else f'T{decay}'
+        if paramName not in ('EDT', 'T20', 'T30'):
+            raise ValueError("decay must be 20, 30 or 'EDT'.")
         TR_avgs = {}
+        SRs = []
+        IRs = []
         roomirs = roomirsGetDict
         for roomir in roomirs.values():
             roomir.sourcePos = \
@@ -2265,32 +2489,35 @@ class MeasurementPostProcess(object):
             if SR not in TR_avgs:
                 TR_avgs[SR] = []
             for IR in roomir.measuredSignals:
-                TR_avgs[SR].append(rooms.analyse(IR, 'RT', decay,
-                                                 nthOct=self.nthOct,
-                                                 minFreq=self.minFreq,
-                                                 maxFreq=self.maxFreq,
-                                                 IREndManualCut=IREndManualCut))
+                SRs.append(SR)
+                IRs.append(IR)
+        # All the impulsive responses analysed at once, for the asked
+        # reverberation time only
+        _, analyses = RoomAnalysis.batch(IRs, workers=workers,
+                                         nthOct=self.nthOct,
+                                         minFreq=self.minFreq,
+                                         maxFreq=self.maxFreq,
+                                         ircut=IREndManualCut,
+                                         parameters=[paramName])
+        for SR, an in zip(SRs, analyses):
+            TR_avgs[SR].append(Analysis(anType='RT', nthOct=self.nthOct,
+                                        minBand=self.minFreq,
+                                        maxBand=self.maxFreq,
+                                        data=getattr(an, paramName)))
 
         # Statistics for TR
         TR_CI = {}
         for SR, TRs in TR_avgs.items():
-            TR_CI[SR] = []
             if len(TRs) < 2:
                 TR_CI[SR] = None
                 continue
             data = np.vstack([an.data for an in TRs])
-            for bandIdx in range(data.shape[1]):
-                TR_CI[SR].append(_mean_confidence_interval(data[:,bandIdx])[1])
+            TR_CI[SR] = mean_confidence_interval(data)[1]
 
         # Calculate mean TR value
         TR = {}
         for SR, TRs in TR_avgs.items():
-            TRs[0].anType = 'L'
-            sum4avg = TRs[0]
-            for TRan in TRs[1:]:
-                TRan.anType = 'L'
-                sum4avg += TRan
-            meanTR = sum4avg/len(TRs)
+            meanTR = Analysis.mean(TRs, energetic=True)
             meanTR.errorLabel = 'Confiança 95% dist. T-Student'
             meanTR.error = TR_CI[SR]
             meanTR.dataLabel = SR
@@ -2351,19 +2578,14 @@ class MeasurementPostProcess(object):
         Lps_CI = {}
         for name, Lpss in Lps_avgs.items():
             data = np.vstack([an.data for an in Lpss])
-            Lps_CI[name] = []
-            for bandIdx in range(data.shape[1]):
-                Lps_CI[name].append(
-                    _mean_confidence_interval(data[:,bandIdx])[1])
+            Lps_CI[name] = mean_confidence_interval(data)[1]
         # Calculate average Lps
         finalLpss = {}
         for name, Lpss in Lps_avgs.items():
-            sum4avg = Lpss[0]
             LpsWindowLimits = [Lpss[0].windowLimits, Lpss[1].windowLimits]
             for Lps in Lpss[1:]:
-                sum4avg += Lps
                 LpsWindowLimits.append(Lps.windowLimits)
-            Lps = sum4avg/len(Lpss)
+            Lps = Analysis.mean(Lpss, energetic=True)
             Lps.errorLabel = 'Confiança 95% dist. T-Student'
             Lps.error = Lps_CI[name]
             Lps.dataLabel = name
@@ -2581,22 +2803,15 @@ class MeasurementPostProcess(object):
         # Statistics for G
         G_CI = {}
         for SR, Gs in G_avgs.items():
-            G_CI[SR] = []
             if len(Gs) < 2:
                 G_CI[SR] = None
                 continue
             data = np.vstack([an.data for an in Gs])
-            for bandIdx in range(data.shape[1]):
-                G_CI[SR].append(_mean_confidence_interval(data[:,bandIdx])[1])
+            G_CI[SR] = mean_confidence_interval(data)[1]
         # Calculate mean G value
         G = {}
         for SR, Gs in G_avgs.items():
-            Gs[0].anType = 'L'
-            sum4avg = Gs[0]
-            for Gan in Gs[1:]:
-                Gan.anType = 'L'
-                sum4avg += Gan
-            meanG = sum4avg/len(Gs)
+            meanG = Analysis.mean(Gs, energetic=True)
             meanG.errorLabel = 'Confiança 95% dist. T-Student'
             meanG.error = G_CI[SR]
             meanG.dataLabel = SR
@@ -2658,19 +2873,8 @@ class MeasurementPostProcess(object):
                 RTs.append(TR)
         # Averaging in space
         bands = RTs[0].bands
-        spacialAvgdRT = []
-        for bandIdx, _ in enumerate(bands):
-            bandRTsum = 0
-            bandRTcount = 0
-            for RTan in RTs:
-                RT = RTan.data[bandIdx]
-                if np.isnan(RT):
-                    continue
-                else:
-                    bandRTcount += 1
-                    bandRTsum += RT
-            bandRTmean = bandRTsum / bandRTcount
-            spacialAvgdRT.append(bandRTmean)
+        spacialAvgdRT = np.nanmean(np.vstack([RTan.data for RTan in RTs]),
+                                   axis=0)
         # Constructing the Analysis
         T_revCh = Analysis(anType='RT', nthOct=self.nthOct,
                            minBand=float(bands[0]), maxBand=float(bands[-1]),
@@ -2859,6 +3063,7 @@ def _h5_unpack(ObjGroup):
             timeStamps = list(ObjGroup.attrs['timeStamps'])
         else:
             timeStamps = []
+        inputsHash = ObjGroup.attrs.get('inputsHash')
         if outChannel is not None:
             outChannel = eval(outChannel)
         measuredSignals = []
@@ -2874,7 +3079,8 @@ def _h5_unpack(ObjGroup):
                                 measuredSignals=measuredSignals,
                                 tempHumids=tempHumids,
                                 timeStamps=timeStamps,
-                                outputAmplification=outputAmplification)
+                                outputAmplification=outputAmplification,
+                                inputsHash=inputsHash)
         return MsdThng
     else:
         return pyttah5unpck(ObjGroup)
@@ -13,6 +13,7 @@ Available classes:
     * SignalObj
     * ImpulsiveResponse
     * Analysis
+    * AnalysisSet
     * RecMeasure
     * PlayRecMeasure
     * FRFMeasure
@@ -41,12 +42,13 @@ from .signal import SignalObj, ImpulsiveResponse
 from .measurement import Measurement, RecMeasure, PlayRecMeasure, FRFMeasure
 from .streaming import Streaming, Monitor
 from .filter import OctFilter, weighting
-from .analysis import Analysis, RoomAnalysis
+from .analysis import Analysis, AnalysisSet, RoomAnalysis
 
 __all__ = [# Classes
            'SignalObj',
            'ImpulsiveResponse',
            'Analysis',
+           'AnalysisSet',
            'RoomAnalysis',
            'RecMeasure',
            'PlayRecMeasure',
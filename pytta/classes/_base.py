@@ -665,8 +665,9 @@ class ChannelsList(object):
                                           for idx in range(len(self))])
         else:
             if len(otherList) > 1:
-                newChList = ChannelsList([self[self.mapping[0]]*otherList[index]
-                                          for index in range(len(otherList))])
+                newChList = ChannelsList([self[self.mapping[0]]*
+                                          otherList[otherList.mapping[idx]]
+                                          for idx in range(len(otherList))])
             else:
                 newChList = ChannelsList([self[self.mapping[0]]*
                                           otherList[otherList.mapping[0]]])
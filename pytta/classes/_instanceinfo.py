@@ -73,6 +73,12 @@ class RememberInstanceCreationInfo:
         if var is not self:
             raise error
 
+    def __getstate__(self):
+        # frames can't be pickled, e.g. to send objects to other processes
+        state = self.__dict__.copy()
+        state.pop('_outer_frame', None)
+        return state
+
     def __repr__(self):
         return super().__repr__()[
                :-1] + " with creation_name '%s'>" % self.creation_name
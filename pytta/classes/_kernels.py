@@ -0,0 +1,343 @@
+# -*- coding: utf-8 -*-
+"""
+Numba compiled room acoustics kernels.
+
+Loop based counterparts of the NumPy implementations in the analysis module,
+selected with
+
+    >>> pytta.default.backend = 'numba'
+
+Kernels are compiled on their first call and cached on disk, so compilation
+happens only once per machine. If Numba can not be imported, the NumPy
+implementations are used instead.
+
+Lundeby's warnings are returned as bit flags, printed by the caller.
+
+"""
+
+import warnings
+import numpy as np
+
+try:
+    import numba as nb
+except ImportError:  # pragma: no cover
+    nb = None
+
+
+available = nb is not None
+"""If Numba is installed, and so the compiled kernels can be used."""
+
+_warned = False
+
+# Warnings flags
+PRELIMINAR_SNR = 1
+PRELIMINAR_REGRESSION = 2
+PRELIMINAR_INTERSECTION = 4
+LATE_SNR = 8
+LATE_REGRESSION = 16
+ITERATIONS = 32
+WINDOW_ITERATIONS = 64
+NOISE_LEVEL_CHECK = 128
+THRESHOLD_DECREASED = 256
+
+
+def enabled(backend: str) -> bool:
+    """Check if the `backend` option asks for, and can use, the kernels."""
+    global _warned
+    if backend != 'numba':
+        return False
+    if not available and not _warned:
+        warnings.warn("Numba is not available, using NumPy backend.")
+        _warned = True
+    return available
+
+
+def _njit(func):
+    if nb is None:  # pragma: no cover
+        return func
+    return nb.njit(cache=True)(func)
+
+
+@_njit
+def start_sample(squaredIR, threshold):
+    """
+    First sample of the impulse response, as in ISO 3382.
+
+    Returns the start sample and the warnings flags.
+    """
+    numSamples = squaredIR.shape[0]
+    last10 = numSamples // 10
+    if last10 == 0:
+        noiseLevel = np.mean(squaredIR)
+    else:
+        noiseLevel = np.mean(squaredIR[numSamples-last10:])
+    maxIdx = np.argmax(squaredIR)
+    maxVal = squaredIR[maxIdx]
+    if maxVal < 100*noiseLevel or maxIdx > int(0.9*numSamples):
+        return 0, NOISE_LEVEL_CHECK
+    threshold = abs(threshold)
+    if maxIdx == 0:
+        return 1, 0
+    minLevel = np.inf
+    for idx in range(maxIdx):
+        level = 10*np.log10(squaredIR[idx]) - 10*np.log10(maxVal)
+        if level < minLevel:
+            minLevel = level
+    thresholdShift = 0
+    if minLevel + threshold >= 0:
+        thresholdShift = int(np.floor(minLevel + threshold)) + 1
+    lastBelowThreshold = 0
+    for idx in range(maxIdx-1, -1, -1):
+        level = 10*np.log10(squaredIR[idx]) - 10*np.log10(maxVal)
+        if level < -threshold + thresholdShift:
+            lastBelowThreshold = idx
+            break
+    flags = THRESHOLD_DECREASED if thresholdShift > 0 else 0
+    if lastBelowThreshold > 0:
+        return lastBelowThreshold, flags
+    return 1, flags
+
+
+@_njit
+def _profile(cumEnergy, start, numSamples, blockSamples):
+    nblocks = max((numSamples - start) // blockSamples, 0)
+    profile = np.empty(nblocks)
+    for idx in range(nblocks):
+        first = start + idx*blockSamples
+        profile[idx] = (cumEnergy[first+blockSamples]
+                        - cumEnergy[first]) / blockSamples
+    return profile
+
+
+@_njit
+def _fit(profile, blockSamples, samplingRate, first, last):
+    n = last - first
+    sumX = 0.
+    sumY = 0.
+    sumXY = 0.
+    sumXX = 0.
+    for idx in range(first, last):
+        x = idx * blockSamples / samplingRate
+        y = 10*np.log10(profile[idx])
+        sumX += x
+        sumY += y
+        sumXY += x*y
+        sumXX += x*x
+    c1 = (n*sumXY - sumX*sumY) / (n*sumXX - sumX**2)
+    c0 = (sumY - c1*sumX) / n
+    return c0, c1
+
+
+@_njit
+def _first_time_above(time, blockSamples, samplingRate, nblocks):
+    for idx in range(nblocks):
+        if idx * blockSamples / samplingRate >= time:
+            return idx
+    return 0
+
+
+@_njit
+def _lundeby_band(cumEnergy, start, numSamples, samplingRate):
+    numParts = 5
+    dBtoNoise = 7
+    useDynRange = 15
+    bgNoiseMargin = 7
+    flags = 0
+    for winTimeLength in (0.01, 0.03):
+        # 1) local time average
+        blockSamples = int(winTimeLength * samplingRate)
+        profile = _profile(cumEnergy, start, numSamples, blockSamples)
+        nblocks = profile.shape[0]
+        if nblocks == 0:
+            continue
+
+        # 2) estimate noise
+        last10 = nblocks // 10
+        if last10 == 0:
+            last10 = nblocks
+        bgNoiseLevel = 10*np.log10(np.mean(profile[nblocks-last10:]))
+
+        # 3) preliminar slope
+        startIdx = np.argmax(profile)
+        stopIdx = startIdx
+        found = False
+        for idx in range(nblocks-1, startIdx, -1):
+            if 10*np.log10(profile[idx]) >= bgNoiseLevel + dBtoNoise:
+                stopIdx = idx - 1
+                found = True
+                break
+        dynRange = 10*np.log10(profile[stopIdx]) \
+            - 10*np.log10(profile[startIdx])
+        if stopIdx == startIdx or dynRange > -5:
+            flags |= PRELIMINAR_SNR
+        if not found or stopIdx - startIdx <= 1:
+            continue
+        c0, c1 = _fit(profile, blockSamples, samplingRate, startIdx, stopIdx)
+        if c1 == 0 or np.isnan(c0) or np.isnan(c1):
+            flags |= PRELIMINAR_REGRESSION
+
+        # 4) preliminary intersection
+        crossingPoint = (bgNoiseLevel - c0) / c1
+        if crossingPoint > 2*numSamples/samplingRate:
+            flags |= PRELIMINAR_INTERSECTION
+
+        # 5) new local time interval length
+        nBlocksInDecay = numParts * dynRange / -10
+        dynRangeTime = stopIdx*blockSamples/samplingRate \
+            - startIdx*blockSamples/samplingRate
+        newBlockSamples = samplingRate * dynRangeTime / nBlocksInDecay
+        if not np.isfinite(newBlockSamples) or newBlockSamples < 1:
+            continue
+        blockSamples = int(newBlockSamples)
+
+        # 6) average
+        profile = _profile(cumEnergy, start, numSamples, blockSamples)
+        nblocks = profile.shape[0]
+        if nblocks == 0:
+            continue
+        lastTime = (nblocks - 1) * blockSamples / samplingRate
+
+        BGL = 0.
+        oldCrossingPoint = 11 + crossingPoint
+        loopCounter = 0
+        while np.abs(oldCrossingPoint - crossingPoint) > 0.001:
+            # 7) background noise level
+            idxLast10Percent = nblocks - nblocks//10
+            bgStartTime = crossingPoint - bgNoiseMargin/c1
+            if bgStartTime > lastTime:
+                idx10dBDecay = nblocks - 1
+            else:
+                idx10dBDecay = _first_time_above(bgStartTime, blockSamples,
+                                                 samplingRate, nblocks)
+            BGL = np.mean(profile[min(idxLast10Percent, idx10dBDecay):])
+            bgNoiseLevel = 10*np.log10(BGL)
+
+            # 8) late decay slope, the first block always satisfies the
+            # start time condition
+            stopTime = (bgNoiseLevel + dBtoNoise - c0)/c1
+            if stopTime > lastTime:
+                stopIdx = 0
+            else:
+                stopIdx = _first_time_above(stopTime, blockSamples,
+                                            samplingRate, nblocks)
+            lateDynRange = np.abs(10*np.log10(profile[stopIdx])
+                                  - 10*np.log10(profile[0]))
+            if stopIdx <= 1 or lateDynRange < useDynRange:
+                flags |= LATE_SNR
+                c1 = 0.
+                break
+            c0, c1 = _fit(profile, blockSamples, samplingRate, 0, stopIdx)
+            if not c1 < 0:
+                flags |= LATE_REGRESSION
+                c1 = 0.
+                break
+
+            # 9) crossing point
+            oldCrossingPoint = crossingPoint
+            crossingPoint = (bgNoiseLevel - c0) / c1
+
+            loopCounter += 1
+            if loopCounter > 30:
+                flags |= ITERATIONS
+                break
+
+        if c1 != 0:
+            interIdx = crossingPoint * samplingRate
+            if not np.isfinite(interIdx):
+                interIdx = 0.
+            return c0, c1, int(interIdx), BGL, flags
+    return 0., 0., 0, 0., flags | WINDOW_ITERATIONS
+
+
+@_njit
+def lundeby(timeSignal, cumEnergy, samplingRate):
+    """
+    Lundeby et al. correction of each band, the columns of `timeSignal`.
+
+    Returns the (c0, c1, interIdx, BGL) arrays and the warnings flags.
+    """
+    numSamples, numBands = timeSignal.shape
+    c0 = np.zeros(numBands)
+    c1 = np.zeros(numBands)
+    interIdx = np.zeros(numBands, dtype=np.int64)
+    BGL = np.zeros(numBands)
+    flags = np.zeros(numBands, dtype=np.int64)
+    for band in range(numBands):
+        start, startFlags = start_sample(timeSignal[:, band]**2, 20)
+        c0[band], c1[band], interIdx[band], BGL[band], bandFlags = \
+            _lundeby_band(cumEnergy[:, band], start, numSamples, samplingRate)
+        flags[band] = startFlags | bandFlags
+    return c0, c1, interIdx, BGL, flags
+
+
+@_njit
+def schroeder(timeSignal, lengths, C, energyDecay):
+    """
+    Backwards integration of each band up to its length, plus the `C`
+    correction, normalized by its first value, written on the zeroed
+    `energyDecay` array.
+    """
+    numSamples, numBands = timeSignal.shape
+    decay = np.empty(numSamples)
+    for band in range(numBands):
+        accumulated = 0.
+        for idx in range(lengths[band]-1, -1, -1):
+            accumulated += np.float64(timeSignal[idx, band])**2
+            decay[idx] = accumulated + C[band]
+        for idx in range(lengths[band]):
+            energyDecay[idx, band] = decay[idx] / decay[0]
+    return energyDecay
+
+
+@_njit
+def decay_regression(energyDecay, energyVector, upperLims, lowerLims):
+    """
+    Reverberation times from the decay between each of the upperLims and
+    lowerLims, all fitted along a single pass over the decay curve.
+    """
+    numSamples = energyDecay.shape[0]
+    numFits = upperLims.shape[0]
+    RT = np.zeros(numFits)
+    first = -np.ones(numFits, dtype=np.int64)
+    last = -np.ones(numFits, dtype=np.int64)
+    nonZero = False
+    for idx in range(numSamples-1, -1, -1):
+        if energyDecay[idx] != 0:
+            nonZero = True
+        level = np.float32(10)*np.log10(energyDecay[idx])
+        for fit in range(numFits):
+            if first[fit] < 0 and level >= upperLims[fit]:
+                first[fit] = idx
+            if last[fit] < 0 and level >= lowerLims[fit]:
+                last[fit] = idx
+    if not nonZero:
+        return RT
+    start = numSamples
+    stop = 0
+    for fit in range(numFits):
+        if first[fit] < 0 or last[fit] < 0:
+            RT[fit] = np.nan
+        elif last[fit] > first[fit]:
+            start = min(start, first[fit])
+            stop = max(stop, last[fit])
+    sumX = np.zeros(numFits)
+    sumY = np.zeros(numFits)
+    sumXY = np.zeros(numFits)
+    sumXX = np.zeros(numFits)
+    for idx in range(start, stop):
+        x = energyVector[idx]
+        y = np.float64(np.float32(10)*np.log10(energyDecay[idx]))
+        for fit in range(numFits):
+            if first[fit] <= idx < last[fit]:
+                sumX[fit] += x
+                sumY[fit] += y
+                sumXY[fit] += x*y
+                sumXX[fit] += x*x
+    for fit in range(numFits):
+        n = last[fit] - first[fit]
+        if first[fit] < 0 or last[fit] < 0 or n <= 0:
+            continue
+        c1 = (n*sumXY[fit] - sumX[fit]*sumY[fit]) \
+            / (n*sumXX[fit] - sumX[fit]**2)
+        RT[fit] = -60/c1
+    return RT
@@ -3,16 +3,22 @@
 from pytta.classes._instanceinfo import RememberInstanceCreationInfo as RICI
 from pytta.classes.filter import fractional_octave_frequencies as FOF
 from pytta.classes import SignalObj, OctFilter, ImpulsiveResponse
-from pytta.utils import fractional_octave_frequencies as FOF, freq_to_band
+from pytta.classes.filter import _cache_set
+from pytta.utils import freq_to_band, mean_confidence_interval
 from math import isnan
 import matplotlib.pyplot as plt
 import matplotlib.ticker as ticker
 import numpy as np
+import json
 import time
 import locale
 from pytta import _h5utils as _h5
 from pytta import _plot as plot
+from pytta import default
+from pytta.classes import _kernels
 import copy as cp
+from functools import lru_cache
+from concurrent.futures import ProcessPoolExecutor
 
 
 # Analysis types and its units
@@ -23,6 +29,34 @@ anTypes = {'RT': ('s', 'Reverberation time'),
            'L': ('dB', 'Level'),
            'mixed': ('-', 'Mixed')}
 
+
+@lru_cache(maxsize=None)
+def _band_table(nthOct, minBand, maxBand):
+    """Read-only center frequencies of the bands, cached by their limits."""
+    bands = FOF(nthOct=nthOct, freqRange=(minBand, maxBand))[:, 1]
+    bands.flags.writeable = False
+    return bands
+
+
+def _level_add(levels, otherLevels):
+    """Energetic sum of two levels in dB, without overflow."""
+    k = np.log(10)/10
+    return np.logaddexp(k*np.asarray(levels), k*np.asarray(otherLevels))/k
+
+
+def _level_sub(levels, otherLevels):
+    """Energetic difference of two levels in dB, without overflow."""
+    k = np.log(10)/10
+    levels = np.asarray(levels)
+    return levels + 10*np.log10(-np.expm1(k*(otherLevels - levels)))
+
+
+def _level_sum(levels, axis=0):
+    """Energetic sum of the levels in dB along `axis`, without overflow."""
+    k = np.log(10)/10
+    return np.logaddexp.reduce(k*np.asarray(levels), axis=axis)/k
+
+
 class Analysis(RICI):
     """
     Objects belonging to the Analysis class holds fractional octave band data.
@@ -106,6 +140,9 @@ class Analysis(RICI):
         * plot_bars():
             Generates a bar plot.
 
+        * sum(analyses, energetic), mean(analyses, energetic):
+            Sum or average of many Analyses, band by band, in one go.
+
     """
 
     # Magic methods
@@ -160,11 +197,7 @@ class Analysis(RICI):
                                     " different band limits.")
             if self.anType == 'L':
                 if other.anType == 'L':
-                    data = []
-                    for idx, value in enumerate(self.data):
-                        d = 10*np.log10(10**(value/10) +
-                                        10**(other.data[idx]/10))
-                        data.append(d)
+                    data = _level_add(self.data, other.data)
                     anType = 'L'
                 elif other.anType in ['mixed', 'C', 'D', 'RT']:
                     data = self.data + other.data
@@ -181,8 +214,7 @@ class Analysis(RICI):
                 anType = 'mixed'
         elif isinstance(other, (int, float)):
             if self.anType == 'L':
-                data = [10*np.log10(10**(dt/10) + 10**(other/10))
-                        for dt in self.data]
+                data = _level_add(self.data, other)
                 anType = 'L'
             else:
                 data = self.data + other
@@ -218,11 +250,7 @@ class Analysis(RICI):
                                     " different band limits.")
             if self.anType == 'L':
                 if other.anType == 'L':
-                    data = []
-                    for idx, value in enumerate(self.data):
-                        d = 10*np.log10(10**(value/10) -
-                                        10**(other.data[idx]/10))
-                        data.append(d)
+                    data = _level_sub(self.data, other.data)
                     anType = 'L'
                 elif other.anType in ['mixed', 'C', 'D', 'RT']:
                     data = self.data - other.data
@@ -239,8 +267,7 @@ class Analysis(RICI):
                 anType = 'mixed'
         elif isinstance(other, (int, float)):
             if self.anType == 'L':
-                data = [10*np.log10(10**(dt/10) - 10**(other/10))
-                        for dt in self.data]
+                data = _level_sub(self.data, other)
                 anType = 'L'
             else:
                 data = self.data - other
@@ -322,8 +349,7 @@ class Analysis(RICI):
                 anType = 'mixed'
         elif isinstance(other, (int, float)):
             if self.anType == 'L':
-                data = [10*np.log10(10**(dt/10) / other)
-                        for dt in self.data]
+                data = self.data - 10*np.log10(other)
                 anType = 'L'
             else:
                 data = other / self.data
@@ -373,8 +399,7 @@ class Analysis(RICI):
                 anType = 'mixed'
         elif isinstance(other, (int, float)):
             if self.anType == 'L':
-                data = [10*np.log10(10**(dt/10) / other)
-                        for dt in self.data]
+                data = self.data - 10*np.log10(other)
                 anType = 'L'
             else:
                 data = self.data / other
@@ -403,6 +428,75 @@ class Analysis(RICI):
 
         return result
 
+    # Reducers
+
+    @staticmethod
+    def sum(analyses, energetic=True):
+        """Sum of the Analyses data, band by band.
+
+        Parameters (default), (type):
+        -----------------------------
+
+            * analyses (), (list):
+                Analysis objects with the same bands;
+
+            * energetic (True), (bool):
+                sum the data as levels in dB, 10*log10(sum(10**(data/10))),
+                or linearly if False.
+
+        Return:
+        -------
+
+            Analysis.
+        """
+        return Analysis._reduce(analyses, energetic, False)
+
+    @staticmethod
+    def mean(analyses, energetic=True):
+        """Mean of the Analyses data, band by band.
+
+        Parameters (default), (type):
+        -----------------------------
+
+            * analyses (), (list):
+                Analysis objects with the same bands;
+
+            * energetic (True), (bool):
+                average the data as levels in dB,
+                10*log10(mean(10**(data/10))), or linearly if False.
+
+        Return:
+        -------
+
+            Analysis.
+        """
+        return Analysis._reduce(analyses, energetic, True)
+
+    @staticmethod
+    def _reduce(analyses, energetic, mean):
+        analyses = list(analyses)
+        if not analyses:
+            raise ValueError("At least one Analysis must be provided.")
+        first = analyses[0]
+        for an in analyses[1:]:
+            if an.range != first.range or an.nthOct != first.nthOct:
+                raise ValueError("Can't operate! The Analyses have " +
+                                 "different band limits.")
+        data = np.stack([an.data for an in analyses])
+        if energetic:
+            data = _level_sum(data, axis=0)
+            if mean:
+                data = data - 10*np.log10(len(analyses))
+        else:
+            data = np.mean(data, axis=0) if mean else np.sum(data, axis=0)
+        types = {an.anType for an in analyses}
+        anType = types.pop() if len(types) == 1 else 'mixed'
+        result = Analysis(anType=anType, nthOct=first.nthOct,
+                          minBand=first.minBand, maxBand=first.maxBand,
+                          data=data, xLabel=first.xLabel,
+                          yLabel=first.yLabel)
+        return result
+
     # Properties
 
     @property
@@ -551,8 +645,7 @@ class Analysis(RICI):
 
     @data.setter
     def data(self, newData):
-        bands = FOF(nthOct=self.nthOct,
-                    freqRange=(self.minBand, self.maxBand))[:,1]
+        bands = _band_table(self.nthOct, self.minBand, self.maxBand)
         self._minBand = float(bands[0])
         self._maxBand = float(bands[-1])
         if not isinstance(newData, list) and \
@@ -821,6 +914,224 @@ class Analysis(RICI):
         return fig
 
 
+class AnalysisSet(RICI):
+    """
+    Columnar container for many Analyses sharing the same bands.
+
+    The data of all items is held in a single (items, bands) array, with tag
+    columns (e.g. source, receiver, take) describing each item, so statistics
+    are computed with one NumPy call instead of stacking Analysis objects.
+
+    Creation parameters (default), (type):
+    --------------------------------------
+
+        * anType, nthOct, minBand, maxBand:
+            See Analysis;
+
+        * data (), (list | numpy array):
+            The (items, bands) data;
+
+        * tags (None), (dict):
+            Tag name to a sequence with one value per item, e.g.
+
+            >>> tags = {'source': ['S1', 'S1'], 'receiver': ['R1', 'R2']}
+
+        * dataLabels (None), (list):
+            One data label per item;
+
+        * comment ('No comments.'), (string):
+            Some comment about the object.
+
+
+    Attributes:
+    -----------
+
+        * data (NumPy array):
+            The (items, bands) data.
+
+        * tags (dict):
+            The tag columns, as NumPy arrays.
+
+        * bands (NumPy array):
+            The bands central frequencies.
+
+
+    Methods:
+    --------
+
+        * from_analyses(analyses, **tags):
+            Create an AnalysisSet from a list of Analysis objects;
+
+        * mean(energetic), std(ddof), confidence_interval(confidence):
+            Statistics across the items, by band;
+
+        * groupby(*names):
+            Split the set by the values of some tags;
+
+        * set[idx]:
+            An Analysis for an int index, or an AnalysisSet for slices,
+            index arrays and boolean masks.
+
+    """
+
+    def __init__(self, anType, nthOct, minBand, maxBand, data,
+                 tags=None, dataLabels=None, comment='No comments.'):
+        super().__init__()
+        data = np.array(data, ndmin=2)
+        bands = _band_table(nthOct, minBand, maxBand)
+        if data.shape[1] != len(bands):
+            raise ValueError("Provided 'data' has different number of bands " +
+                             "then the existent bands between " +
+                             "{} and {} [Hz].".format(minBand, maxBand))
+        if anType not in anTypes:
+            raise ValueError(str(anType) + " type not supported. May be " +
+                             "'RT, 'C', 'D', 'G', 'L', or 'mixed'.")
+        self.anType = anType
+        self.nthOct = nthOct
+        self.minBand = float(bands[0])
+        self.maxBand = float(bands[-1])
+        self.data = data
+        self.tags = {}
+        for name, values in ({} if tags is None else tags).items():
+            values = np.asarray(values)
+            if values.shape != (data.shape[0],):
+                raise ValueError(f"Tag '{name}' must have one value per item.")
+            self.tags[name] = values
+        if dataLabels is None:
+            dataLabels = [None] * data.shape[0]
+        if len(dataLabels) != data.shape[0]:
+            raise ValueError("'dataLabels' must have one label per item.")
+        self.dataLabels = list(dataLabels)
+        self.comment = comment
+        return
+
+    @classmethod
+    def from_analyses(cls, analyses, **tags):
+        """
+        Create an AnalysisSet from Analysis objects with the same bands.
+
+        The keyword arguments are the tag columns, with one value per Analysis.
+        """
+        analyses = list(analyses)
+        if not analyses:
+            raise ValueError("At least one Analysis must be provided.")
+        first = analyses[0]
+        for an in analyses[1:]:
+            if an.range != first.range or an.nthOct != first.nthOct:
+                raise ValueError("Can't stack! The Analyses have " +
+                                 "different band limits.")
+        types = {an.anType for an in analyses}
+        anType = types.pop() if len(types) == 1 else 'mixed'
+        anSet = cls(anType, first.nthOct, first.minBand, first.maxBand,
+                    np.stack([an.data for an in analyses]), tags,
+                    [an.dataLabel for an in analyses])
+        return anSet
+
+    def __len__(self):
+        return self.data.shape[0]
+
+    def __repr__(self):
+        return (f'{self.__class__.__name__}('
+                f'anType={self.anType!r}, '
+                f'nthOct={self.nthOct!r}, '
+                f'minBand={self.minBand!r}, '
+                f'maxBand={self.maxBand!r}, '
+                f'items={len(self)!r}, '
+                f'tags={list(self.tags)!r})')
+
+    def __getitem__(self, key):
+        if isinstance(key, (int, np.integer)):
+            an = Analysis(anType=self.anType, nthOct=self.nthOct,
+                          minBand=self.minBand, maxBand=self.maxBand,
+                          data=self.data[key],
+                          dataLabel=self.dataLabels[key])
+            return an
+        idx = np.arange(len(self))[key]
+        anSet = AnalysisSet(self.anType, self.nthOct, self.minBand,
+                            self.maxBand, self.data[idx],
+                            {name: values[idx]
+                             for name, values in self.tags.items()},
+                            [self.dataLabels[i] for i in idx], self.comment)
+        return anSet
+
+    @property
+    def bands(self):
+        """The octave fraction bands central frequencies."""
+        return _band_table(self.nthOct, self.minBand, self.maxBand)
+
+    @property
+    def range(self):
+        return (self.minBand, self.maxBand)
+
+    def to_analyses(self):
+        """List with an Analysis for each item."""
+        return [self[idx] for idx in range(len(self))]
+
+    def mean(self, energetic=True):
+        """Mean of the items by band, as an Analysis. Same as Analysis.mean
+        over the items.
+
+        Parameters (default), (type):
+        -----------------------------
+
+            * energetic (True), (bool):
+                average the data as levels in dB,
+                10*log10(mean(10**(data/10))), or linearly if False.
+        """
+        if energetic:
+            data = _level_sum(self.data, axis=0) - 10*np.log10(len(self))
+        else:
+            data = np.mean(self.data, axis=0)
+        an = Analysis(anType=self.anType, nthOct=self.nthOct,
+                      minBand=self.minBand, maxBand=self.maxBand, data=data)
+        return an
+
+    def std(self, ddof=1):
+        """Standard deviation of the items by band."""
+        return np.std(self.data, axis=0, ddof=ddof)
+
+    def confidence_interval(self, confidence=0.95):
+        """
+        Half width of the mean's confidence interval by band, from the
+        Student's t distribution.
+        """
+        return mean_confidence_interval(self.data, confidence)[1]
+
+    def groupby(self, *names):
+        """
+        Split the set by the values of the `names` tags.
+
+        Returns a dict from each value, or tuple of values for many names, to
+        the AnalysisSet with the matching items, in order of appearance.
+        """
+        if not names:
+            raise ValueError("At least one tag name must be provided.")
+        keys = list(zip(*(self.tags[name].tolist() for name in names)))
+        groups = {}
+        for idx, key in enumerate(keys):
+            groups.setdefault(key if len(names) > 1 else key[0],
+                              []).append(idx)
+        return {key: self[np.array(idx)] for key, idx in groups.items()}
+
+    def _h5_save(self, h5group):
+        """
+        Saves itself inside a hdf5 group from an already opened file via
+        pytta.save(...), with all the items in a single dataset.
+        """
+        h5group.attrs['class'] = 'AnalysisSet'
+        h5group.attrs['anType'] = self.anType
+        h5group.attrs['nthOct'] = self.nthOct
+        h5group.attrs['minBand'] = self.minBand
+        h5group.attrs['maxBand'] = self.maxBand
+        h5group.attrs['comment'] = _h5.attr_parser(self.comment)
+        h5group.attrs['dataLabels'] = json.dumps(self.dataLabels)
+        h5group.attrs['tags'] = json.dumps({name: values.tolist()
+                                            for name, values
+                                            in self.tags.items()})
+        h5group['data'] = self.data
+        return
+
+
 class RoomAnalysis(Analysis):
     """Room monoaural acoustical parameters for quality analysis.
     
@@ -868,7 +1179,17 @@ class RoomAnalysis(Analysis):
             
         * ircut (None), (float):
             Cut the IR and throw away the silence tail. The default is None.
-            
+
+        * filterDomain ('time'), (str):
+            Octave filter bank domain, 'time' for the IIR band filters or
+            'freq' for the FFT-domain ones. The default is 'time'.
+
+        * parameters (None), (list):
+            Names of the parameters of interest, from `availableParameters`.
+            Each one is estimated on its first access, sharing the filtered
+            bands and energy decay curves with the others. The default is
+            None, for all of them.
+
         * **kwargs (), (Dict):
             See Analysis.
             
@@ -877,7 +1198,6 @@ class RoomAnalysis(Analysis):
         
         * parameters (), (Tuple):
         List of parameters names.
-        return tuple(self._params.keys())
 
         * rms (), (np.ndarray):
             Effective IR amplitude by frequency `band`.
@@ -952,29 +1272,117 @@ class RoomAnalysis(Analysis):
         Matheus Lazarin, matheus.lazarin@eac.ufsm.br
         Rinaldi Petrolli, rinaldi.petrolli@eac.ufsm.br"""
 
+    availableParameters = ('rms', 'SPL', 'Ts', 'D50', 'C80', 'STearly',
+                           'STlate', 'EDT', 'T20', 'T30')
+    """Names of the parameters RoomAnalysis can estimate."""
+
     def __init__(self, ir: SignalObj, nthOct: int = 1,
                  minFreq: float = 2e1, maxFreq: float = 2e4, *args,
                  plotLundeby: bool = False,
                  bypassLundeby: bool = False,
                  suppressWarnings: bool = True,
-                 ircut: float = None, **kwargs):
+                 ircut: float = None,
+                 filterDomain: str = 'time',
+                 parameters: list = None, **kwargs):
         _ir = ir.IR if type(ir) == ImpulsiveResponse else ir
         minBand = freq_to_band(minFreq, nthOct, 1000, 10)
         maxBand = freq_to_band(maxFreq, nthOct, 1000, 10)
         nbands = maxBand - minBand + 1
         super().__init__('mixed', nthOct, minFreq, maxFreq, nbands*[0], *args, **kwargs)
         self.ir = crop_IR(_ir, ircut)
-        self._params = self.estimate_energy_parameters(self.ir, self.bands, plotLundeby,
-                                                       bypassLundeby, suppressWarnings,
-                                                       nthOct=nthOct, minFreq=minFreq,
-                                                       maxFreq=maxFreq)
+        if parameters is None:
+            parameters = self.availableParameters
+        unknown = set(parameters) - set(self.availableParameters)
+        if unknown:
+            raise ValueError(f"Unknown room parameters: {sorted(unknown)}.")
+        self._parameters = tuple(parameters)
+        self._settings = dict(plotLundeby=plotLundeby,
+                              bypassLundeby=bypassLundeby,
+                              suppressWarnings=suppressWarnings,
+                              filterDomain=filterDomain,
+                              nthOct=nthOct, minFreq=minFreq, maxFreq=maxFreq)
+        self._params = {}
+        self._memo = {}
         return
 
+    def _estimate(self, name):
+        if name not in self._params:
+            self._params.update(
+                self.estimate_energy_parameters(self.ir, self.bands,
+                                                parameters=(name,),
+                                                memo=self._memo,
+                                                **self._settings))
+            # Intermediates are only kept while requested parameters remain
+            if all(param in self._params for param in self._parameters):
+                self._memo.clear()
+        return self._params[name]
+
+    @classmethod
+    def batch(cls, irs: list, workers: int = None, nthOct: int = 1,
+              minFreq: float = 2e1, maxFreq: float = 2e4, **kwargs):
+        """
+        Analyse several impulse responses, optionally on a process pool.
+
+        The octave filter bank is designed once, on the calling process, and
+        handed to the workers' filter design cache.
+
+        Parameters
+        ----------
+        irs : list
+            One channel SignalObj or ImpulsiveResponse objects.
+        workers : int, optional
+            Number of worker processes. None or 1 analyses the impulse
+            responses serially on the calling process. The default is None.
+        nthOct, minFreq, maxFreq, **kwargs :
+            Passed on to each RoomAnalysis, see its documentation.
+
+        Returns
+        -------
+        data : np.ndarray
+            The parameters of every impulse response, stacked as
+            `(ir, band, parameter)` in the `parameters` order.
+        analyses : List[RoomAnalysis]
+            One RoomAnalysis for each impulse response.
+
+        """
+        irs = list(irs)
+        if not irs:
+            raise ValueError("At least one impulse response must be provided.")
+        kwargs.update(nthOct=nthOct, minFreq=minFreq, maxFreq=maxFreq)
+        if workers is None or workers < 2 or len(irs) < 2:
+            analyses = [_batch_analyse(ir, kwargs) for ir in irs]
+        else:
+            samplingRates = {ir.samplingRate for ir in irs}
+            designs = {}
+            for samplingRate in samplingRates:
+                of = OctFilter(order=4, nthOct=nthOct,
+                               samplingRate=samplingRate,
+                               minFreq=minFreq, maxFreq=maxFreq,
+                               refFreq=1000, base=10)
+                designs[of.designKey] = (of.center, of.decimation, of.sos)
+            settings = {name: getattr(default, name)
+                        for name in _batch_settings}
+            with ProcessPoolExecutor(max_workers=workers,
+                                     initializer=_batch_init,
+                                     initargs=(designs, settings)
+                                     ) as pool:
+                chunksize = max(len(irs) // (4*workers), 1)
+                analyses = list(pool.map(_batch_analyse, irs,
+                                         [kwargs]*len(irs),
+                                         chunksize=chunksize))
+        data = np.stack([np.stack([an._estimate(name)
+                                   for name in an.parameters], axis=-1)
+                         for an in analyses])
+        return data, analyses
+
     @staticmethod
     def estimate_energy_parameters(ir: SignalObj, bands: np.ndarray,
                                    plotLundeby: bool = False,
                                    bypassLundeby: bool = False,
-                                   suppressWarnings: bool = False, **kwargs):
+                                   suppressWarnings: bool = False,
+                                   filterDomain: str = 'time',
+                                   parameters: list = None,
+                                   memo: dict = None, **kwargs):
         """
         Estimate the Impulse Response energy parameters.
 
@@ -986,6 +1394,15 @@ class RoomAnalysis(Analysis):
         suppressWarnings : bool
             If supress warnings about IR quality and the bypassing of Lundeby calculations.
             The default is False.
+        filterDomain : str
+            The octave filter bank domain, 'time' or 'freq', see OctFilter.
+            The default is 'time'.
+        parameters : list
+            Names of the parameters to estimate. The default is None, for all
+            the RoomAnalysis.availableParameters.
+        memo : dict
+            Holds the filtered bands and energy decay curves between calls,
+            so they are computed only once. The default is None.
 
         Returns
         -------
@@ -993,75 +1410,107 @@ class RoomAnalysis(Analysis):
             A dict with parameters by name.
 
         """
-        listEDC, fhSignal = cumulative_integration(ir, bypassLundeby, plotLundeby, suppressWarnings, **kwargs)
+        if parameters is None:
+            parameters = RoomAnalysis.availableParameters
+        memo = {} if memo is None else memo
+
+        def filtered():
+            if 'hSignal' not in memo:
+                memo['hSignal'] = _filter(ir, domain=filterDomain, **kwargs)
+            return memo['hSignal']
+
+        def decays():
+            if 'listEDC' not in memo:
+                memo['listEDC'], _ = cumulative_integration(
+                    ir, bypassLundeby, plotLundeby, suppressWarnings,
+                    filterDomain, hSignal=filtered(), **kwargs)
+            return memo['listEDC']
+
         params = {}
-        params['rms'] = fhSignal.rms()
-        params['SPL'] = fhSignal.spl()
-        params['Ts'] = central_time(fhSignal.timeSignal**2, fhSignal.timeVector)
-        params['D50'] = definition(listEDC, ir.samplingRate)
-        params['C80'] = clarity(listEDC, ir.samplingRate)
-        params['STearly'] = st_early(listEDC, ir.samplingRate)
-        params['STlate'] = st_late(listEDC, ir.samplingRate)
-        params['EDT'] = reverberation_time('EDT', listEDC)
-        params['T20'] = reverberation_time(20, listEDC)
-        params['T30'] = reverberation_time(30, listEDC)
+        for name in parameters:
+            if name in params:
+                continue
+            elif name == 'rms':
+                params['rms'] = filtered().rms()
+            elif name == 'SPL':
+                params['SPL'] = filtered().spl()
+            elif name == 'Ts':
+                fhSignal = filtered()
+                params['Ts'] = central_time(fhSignal.timeSignal**2, fhSignal.timeVector)
+            elif name in ('D50', 'C80', 'STearly', 'STlate'):
+                # All taken from the same stacked decay curves
+                energyDecay, _ = _stack_decays(decays())
+                D50, C80, STearly, STlate = energy_ratios(
+                    energyDecay, ir.samplingRate,
+                    [(0, 50), (0, 80), (20, 100), (100, None)],
+                    [(0, None), (80, None), (0, 10), (0, 10)])
+                params['D50'] = np.round(100 * D50, 2)  # [%]
+                params['C80'] = np.round(10 * np.log10(C80), 2)  # [dB]
+                params['STearly'] = np.round(10 * np.log10(STearly), 4)  # [dB]
+                params['STlate'] = np.round(10 * np.log10(STlate), 4)  # [dB]
+            elif name in ('EDT', 'T20', 'T30'):
+                # All fitted in the same sweep over the decay curves
+                params['EDT'], params['T20'], params['T30'] = \
+                    reverberation_times(('EDT', 20, 30), decays())
+            else:
+                raise ValueError(f"Unknown room parameter: '{name}'.")
         # self._params['BR'], self._params['TR'] = timbre_ratios(self.T20)
         return params
 
     @property
     def parameters(self):
         """List of parameters names."""
-        return tuple(self._params.keys())
+        return self._parameters
 
     @property
     def rms(self):
         """Effective IR amplitude by frequency `band`."""
-        return self._params['rms']
+        return self._estimate('rms')
 
     @property
     def SPL(self):
         """Equivalent IR level by frequency `band`."""
-        return self._params['SPL']
+        return self._estimate('SPL')
 
     @property
     def D50(self):
         """Room Definition by frequency `band`."""
-        return self._params['D50']
+        return self._estimate('D50')
 
     @property
     def C80(self):
         """Effective IR amplitude, by frequency `band`."""
-        return self._params['C80']
+        return self._estimate('C80')
 
     @property
     def Ts(self):
         """Central Time by frequency `band`."""
-        return self._params['Ts']
+        return self._estimate('Ts')
 
     @property
     def STearly(self):
         """Early energy distribution by frequency `band`."""
-        return self._params['STearly']
+        return self._estimate('STearly')
 
     @property
     def STlate(self):
         """Late energy distribution by frequency `band`."""
-        return self._params['STlate']
+        return self._estimate('STlate')
 
     @property
     def EDT(self):
         """Early Decay Time by frequency `band`."""
-        return self._params['EDT']
+        return self._estimate('EDT')
 
     @property
     def T20(self):
         """Reverberation time with 20 dB decay, by frequency `band`."""
-        return self._params['T20']
+        return self._estimate('T20')
 
     @property
     def T30(self):
         """Reverberation time with 30 dB decay, by frequency `band`."""
-        return self._params['T30']
+        return self._estimate('T30')
 
     # @property
     # def BR(self):
@@ -1091,7 +1540,7 @@ class RoomAnalysis(Analysis):
             The figure of the plot chart.
 
         """
-        self._data = self._params[name]
+        self._data = self._estimate(name)
         f = self.plot(**kwargs)
         self._data = np.zeros(self.bands.shape)
         return f
@@ -1145,99 +1594,173 @@ class RoomAnalysis(Analysis):
     #     return self.plot_param('TR')
 
 
+_batch_settings = ('backend', 'precision', 'filterCacheSize',
+                   'filterResponseCacheBytes')
+"""Defaults copied to the RoomAnalysis.batch workers, which may be spawned."""
+
+
+def _batch_init(designs, settings):
+    for name, value in settings.items():
+        setattr(default, name, value)
+    for key, arrays in designs.items():
+        _cache_set(key, arrays)
+
+
+def _batch_analyse(ir, kwargs):
+    an = RoomAnalysis(ir, **kwargs)
+    for name in an.parameters:
+        an._estimate(name)
+    return an
+
+
 def _filter(signal,
             order: int = 4,
             nthOct: int = 3,
             minFreq: float = 20,
             maxFreq: float = 20000,
             refFreq: float = 1000,
-            base: int = 10):
+            base: int = 10,
+            domain: str = 'time'):
     of = OctFilter(order=order,
                    nthOct=nthOct,
                    samplingRate=signal.samplingRate,
                    minFreq=minFreq,
                    maxFreq=maxFreq,
                    refFreq=refFreq,
-                   base=base)
+                   base=base,
+                   domain=domain)
     result = of.filter(signal)
     return result[0]
 
 
-# @njit
+def _result_dtype(timeSignal):
+    """
+    Floating point dtype of the results calculated from `timeSignal`,
+    double precision for float64 signals and single precision otherwise.
+    """
+    if np.asarray(timeSignal).dtype == np.float64:
+        return np.dtype('float64')
+    return np.dtype('float32')
+
+
+def _energy_cumsum(timeSignal):
+    """
+    Cumulative squared signal, with a leading row of zeros, so that the energy
+    from sample `a` up to `b` is `cumEnergy[b] - cumEnergy[a]`.
+    """
+    cumEnergy = np.zeros((timeSignal.shape[0] + 1, timeSignal.shape[1]))
+    np.cumsum(np.square(timeSignal, dtype='float64'), axis=0,
+              out=cumEnergy[1:])
+    return cumEnergy
+
+
 def _level_profile(timeSignal, samplingRate,
-                   numSamples, numChannels, blockSamples=None):
-    """Get h(t) in octave bands and do the local time averaging in nblocks. Returns h^2_averaged(block)."""
-    def mean_squared(x):
-        return np.mean(x**2)
+                   numSamples, numChannels, blockSamples=None,
+                   startSamples=None, cumEnergy=None):
+    """
+    Get h(t) in octave bands and do the local time averaging in nblocks. Returns h^2_averaged(block).
 
+    The block length and the first sample may be given per channel, as arrays,
+    in which case each channel's profile is NaN padded after its last block.
+    Profiles with different block lengths over the same signal are cheaper when
+    its `cumEnergy`, from `_energy_cumsum`, is provided.
+    """
     if blockSamples is None:
         blockSamples = 100
-    nblocks = int(numSamples // blockSamples)
-    profile = np.zeros((nblocks, numChannels), dtype=np.float32)
-    timeStamp = np.zeros((nblocks, 1))
-
-    for ch in range(numChannels):
-        # if numChannels == 1:
-        #     tmp = timeSignal
-        # else:
-        tmp = timeSignal[:, ch]
-        for idx in range(nblocks):
-            profile[idx, ch] = mean_squared(tmp[:blockSamples])
-            timeStamp[idx, 0] = idx*blockSamples/samplingRate
-            tmp = tmp[blockSamples:]
+    if startSamples is None:
+        startSamples = 0
+    if cumEnergy is None and np.ndim(blockSamples) == 0 \
+            and np.ndim(startSamples) == 0:
+        # Same blocks on all channels, a single reshape does it
+        nblocks = max(int((numSamples - startSamples) // blockSamples), 0)
+        stop = startSamples + nblocks*blockSamples
+        blocks = timeSignal[startSamples:stop, :numChannels]
+        blocks = blocks.reshape(nblocks, blockSamples, numChannels)
+        profile = np.mean(np.square(blocks, dtype='float64'), axis=1)
+        timeStamp = np.arange(nblocks)[:, None] * blockSamples / samplingRate
+        return profile, timeStamp
+
+    if cumEnergy is None:
+        cumEnergy = _energy_cumsum(timeSignal[:, :numChannels])
+    blockSamples = np.broadcast_to(np.asarray(blockSamples, dtype=int),
+                                   (numChannels,))
+    startSamples = np.broadcast_to(np.asarray(startSamples, dtype=int),
+                                   (numChannels,))
+    numBlocks = (numSamples - startSamples) // blockSamples
+    nblocks = int(max(numBlocks.max(), 0))
+    blockIdx = np.arange(nblocks + 1)[:, None]
+    edges = np.minimum(startSamples + blockIdx*blockSamples, numSamples)
+    blockEnergy = np.diff(np.take_along_axis(cumEnergy[:, :numChannels],
+                                             edges, axis=0), axis=0)
+    profile = np.where(blockIdx[:-1] < numBlocks, blockEnergy / blockSamples,
+                       np.nan)
+    timeStamp = blockIdx[:-1] * blockSamples / samplingRate
     return profile, timeStamp
 
 
-# @njit
-def _start_sample_ISO3382(timeSignal, threshold) -> np.ndarray:
+def _start_samples_ISO3382(timeSignal, threshold) -> np.ndarray:
+    """
+    First sample of each channel's impulse response, the columns of
+    `timeSignal`, as in ISO 3382: the last sample before the peak that lies
+    `threshold` dB below it.
+    """
+    if timeSignal.ndim == 1:
+        timeSignal = timeSignal[:, None]
+    numSamples, numChannels = timeSignal.shape
+    if _kernels.enabled(default.backend):
+        startSamples = np.zeros(numChannels, dtype=int)
+        flags = 0
+        for ch in range(numChannels):
+            startSamples[ch], chFlags = _kernels.start_sample(
+                np.ascontiguousarray(timeSignal[:, ch])**2, threshold)
+            flags |= chFlags
+        _print_start_sample_warnings(flags)
+        return startSamples
     squaredIR = timeSignal**2
     # assume the last 10% of the IR is noise, and calculate its noise level
-    last10Idx = -int(len(squaredIR)//10)
-    noiseLevel = np.mean(squaredIR[last10Idx:])
+    last10Idx = -int(numSamples//10)
+    noiseLevel = np.mean(squaredIR[last10Idx:], axis=0)
     # get the maximum of the signal, that is the assumed IR peak
-    max_val = np.max(squaredIR)
-    max_idx = np.argmax(squaredIR)
+    max_idx = np.argmax(squaredIR, axis=0)
+    max_val = squaredIR[max_idx, np.arange(numChannels)]
     # check if the SNR is enough to assume that the signal is an IR. If not,
     # the signal is probably not an IR, so it starts at sample 1
-    idxNoShift = np.asarray([max_val < 100*noiseLevel or
-                             max_idx > int(0.9*squaredIR.shape[0])])
+    idxNoShift = (max_val < 100*noiseLevel) \
+        | (max_idx > int(0.9*numSamples))
     # less than 20dB SNR or in the "noisy" part
     if idxNoShift.any():
         print("noiseLevelCheck: The SNR too bad or this is not an " +
               "impulse response.")
-        return 0
-    # find the first sample that lies under the given threshold
+    # find the last sample before the peak that lies under the given
+    # threshold, which is raised by the smallest number of dB that gets
+    # some sample under it
     threshold = abs(threshold)
-    startSample = 1
-#    # TODO - envelope mar/pdi - check!
-#    if idxNoShift:
-#        print("Something wrong!")
-#        return
+    rows = np.arange(max_idx.max())[:, None]
+    beforePeak = rows < max_idx
+    with np.errstate(divide='ignore'):
+        abs_dat = 10*np.log10(squaredIR[:rows.size]) - 10.*np.log10(max_val)
+    minLevel = np.min(np.where(beforePeak, abs_dat, np.inf), axis=0)
+    thresholdShift = np.where(minLevel + threshold >= 0,
+                              np.floor(minLevel + threshold) + 1, 0)
+    if np.any((thresholdShift > 0) & (max_idx > 0) & ~idxNoShift):
+        print("_start_sample_ISO3382: 20 dB threshold too high. " +
+              "Decreasing it.")
+    belowThreshold = beforePeak & (abs_dat < -threshold + thresholdShift)
+    lastBelowThreshold = rows.size - 1 \
+        - np.argmax(belowThreshold[::-1], axis=0)
     # if maximum lies on the first point, then there is no point in searching
-    # for the beginning of the IR. Just return this position.
-    if max_idx > 0:
-        abs_dat = 10*np.log10(squaredIR[:max_idx]) \
-                  - 10.*np.log10(max_val)
-        thresholdNotOk = True
-        thresholdShift = 0
-        while thresholdNotOk:
-            if len(np.where(abs_dat < (-threshold+thresholdShift))[0]) > 0:
-                lastBelowThreshold = \
-                    np.where(abs_dat < (-threshold+thresholdShift))[0][-1]
-                thresholdNotOk = False
-            else:
-                thresholdShift += 1
-        if thresholdShift > 0:
-            print("_start_sample_ISO3382: 20 dB threshold too high. " +
-                  "Decreasing it.")
-        if lastBelowThreshold > 0:
-            startSample = lastBelowThreshold
-        else:
-            startSample = 1
+    # for the beginning of the IR.
+    startSample = np.where((max_idx > 0) & (lastBelowThreshold > 0),
+                           lastBelowThreshold, 1)
+    startSample[idxNoShift] = 0
     return startSample
 
 
-# @njit
+def _start_sample_ISO3382(timeSignal, threshold) -> int:
+    """Earliest ISO 3382 first sample among the channels of `timeSignal`."""
+    return int(np.min(_start_samples_ISO3382(timeSignal, threshold)))
+
+
 def _circular_time_shift(timeSignal, threshold=20):
     # find the first sample where inputSignal level > 20 dB or > bgNoise level
     startSample = _start_sample_ISO3382(timeSignal, threshold)
@@ -1245,209 +1768,389 @@ def _circular_time_shift(timeSignal, threshold=20):
     return (newTimeSignal, startSample)
 
 
-# @njit
-def _Lundeby_correction(band, timeSignal, samplingRate, numSamples,
-                        numChannels, timeLength, suppressWarnings=True):
-    returnTuple = (np.float32(0), np.float32(0), np.int32(0), np.float32(0))
-    timeSignal, sampleShift = _circular_time_shift(timeSignal)
-    if sampleShift is None:
-        return returnTuple
+def _band_warning(bands, mask, message):
+    for band in np.asarray(bands)[mask]:
+        print(band, "[Hz] band:", message)
+    return
+
+
+def _masked_mean(data, first, last):
+    """Column-wise mean of the `data` rows from `first` up to `last`."""
+    rows = np.arange(data.shape[0])[:, None]
+    mask = (rows >= first) & (rows < last)
+    # Contiguous columns are summed in the same order for any number of them
+    masked = np.ascontiguousarray(np.where(mask, data, 0).T)
+    return np.sum(masked, axis=1) / (last - first)
+
+
+def _running_sums(x, y):
+    """
+    Cumulative sums of x, x**2, y and x*y down the columns, plus the count of
+    non-finite y values, with a leading row of zeros. Any line fit over a
+    range of rows is then taken from two rows of these sums, see _line_fit.
+    """
+    finite = np.isfinite(y)
+    x = np.where(finite, x, 0).astype('float64')
+    y = np.where(finite, y, 0).astype('float64')
+    sums = np.zeros((5, y.shape[0] + 1, y.shape[1]))
+    np.cumsum(np.stack([x, x*x, y, x*y, ~finite]), axis=1, out=sums[:, 1:])
+    return sums
+
+
+def _line_fit(sums, first, last):
+    """
+    Column-wise least squares fit of y = c0 + c1*x over the rows from `first`
+    up to `last`, in closed form from the _running_sums. The limits may have
+    a leading dimension, for several fits of each column. Returns the (c0, c1)
+    arrays, NaN where the range holds non-finite values.
+    """
+    cols = np.arange(sums.shape[2])
+    sumX, sumXX, sumY, sumXY, nonFinite = \
+        sums[:, last, cols] - sums[:, first, cols]
+    n = last - first
+    c1 = (n*sumXY - sumX*sumY) / (n*sumXX - sumX**2)
+    c0 = (sumY - c1*sumX) / n
+    c0[nonFinite > 0] = np.nan
+    c1[nonFinite > 0] = np.nan
+    return c0, c1
+
+
+def _Lundeby_correction(bands, timeSignal, samplingRate,
+                        suppressWarnings=True):
+    """
+    Lundeby et al. truncation point and background noise estimation for all
+    bands, the columns of `timeSignal`, at once.
+
+    The iterative procedure runs in lock-step for every band, each one leaving
+    the iterations as soon as it converges or fails.
 
-    numSamples -= sampleShift  # discount shifted samples
+    Returns the (c0, c1, interIdx, BGL) arrays, with the late decay line
+    coefficients, the truncation sample and the background noise level. Bands
+    where the procedure failed hold zeros.
+    """
+    numSamples, numBands = timeSignal.shape
+    if _kernels.enabled(default.backend):
+        return _Lundeby_correction_jit(bands, timeSignal, samplingRate,
+                                       suppressWarnings)
     numParts = 5  # number of parts per 10 dB decay. N = any([3, 10])
     dBtoNoise = 7  # stop point 10 dB above first estimated background noise
     useDynRange = 15  # dynamic range
-
-    # Window length - 10 to 50 ms, longer periods for lower frequencies and vice versa
-    repeat = True
-    i = 0
-    winTimeLength = 0.01
-    while repeat: # loop to find proper winTimeLength
-        winTimeLength = winTimeLength + 0.01*i
-        # 1) local time average:
-        blockSamples = int(winTimeLength * samplingRate)
-        timeWinData, timeVecWin = _level_profile(timeSignal, samplingRate,
-                                                  numSamples, numChannels,
-                                                  blockSamples)
-
-        # 2) estimate noise from h^2_averaged(block):
-        bgNoiseLevel = 10 * \
-                       np.log10(
-                                np.mean(timeWinData[-int(timeWinData.size/10):]))
-
-        # 3) Calculate preliminar slope
-        startIdx = np.argmax(np.abs(timeWinData/np.max(np.abs(timeWinData))))
-        stopIdx = startIdx + np.where(10*np.log10(timeWinData[startIdx+1:])
-                                      >= bgNoiseLevel + dBtoNoise)[0][-1]
-        dynRange = 10*np.log10(timeWinData[stopIdx]) \
-            - 10*np.log10(timeWinData[startIdx])
-        if (stopIdx == startIdx) or (dynRange > -5)[0]:
+    bgNoiseMargin = 7
+    timeLength = numSamples / samplingRate
+
+    dtype = _result_dtype(timeSignal)
+    c0Out = np.zeros(numBands, dtype=dtype)
+    c1Out = np.zeros(numBands, dtype=dtype)
+    interIdxOut = np.zeros(numBands, dtype=np.int32)
+    BGLOut = np.zeros(numBands, dtype=dtype)
+
+    startSamples = _start_samples_ISO3382(timeSignal, 20)
+    cumEnergy = _energy_cumsum(timeSignal)
+    pending = np.ones(numBands, dtype=bool)
+
+    # Window length - 10 to 50 ms, longer periods for lower frequencies and
+    # vice versa. A second window length is tried on failing bands.
+    for winTimeLength in (0.01, 0.03):
+        idx = np.flatnonzero(pending)
+        if idx.size == 0:
+            break
+        x = timeSignal[:, idx]
+        xCumEnergy = cumEnergy[:, idx]
+        shifts = startSamples[idx]
+        numCh = idx.size
+        chBands = np.asarray(bands)[idx]
+        cols = np.arange(numCh)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            # 1) local time average:
+            blockSamples = int(winTimeLength * samplingRate)
+            timeWinData, timeVecWin = _level_profile(x, samplingRate,
+                                                     numSamples, numCh,
+                                                     blockSamples, shifts,
+                                                     xCumEnergy)
+            nblocks = (numSamples - shifts) // blockSamples
+
+            # 2) estimate noise from h^2_averaged(block):
+            last10 = nblocks // 10
+            last10[last10 == 0] = nblocks[last10 == 0]
+            bgNoiseLevel = 10*np.log10(_masked_mean(timeWinData,
+                                                    nblocks - last10,
+                                                    nblocks))
+
+            # 3) Calculate preliminar slope
+            levels = 10*np.log10(timeWinData)
+            rows = np.arange(timeWinData.shape[0])[:, None]
+            startIdx = np.argmax(np.nan_to_num(timeWinData, nan=-1), axis=0)
+            aboveNoise = (rows > startIdx) & (levels >= bgNoiseLevel + dBtoNoise)
+            ok = aboveNoise.any(axis=0)
+            stopIdx = np.where(ok, rows.size - 2
+                               - np.argmax(aboveNoise[::-1], axis=0), startIdx)
+            dynRange = levels[stopIdx, cols] - levels[startIdx, cols]
             if not suppressWarnings:
-                print(band, "[Hz] band: SNR too low for the preliminar slope",
-                  "calculation.")
-            # return returnTuple
+                _band_warning(chBands, (stopIdx == startIdx) | (dynRange > -5),
+                              "SNR too low for the preliminar slope calculation.")
+            ok &= stopIdx - startIdx > 1
 
-        # X*c = EDC (energy decaying curve)
-        X = np.ones((stopIdx-startIdx, 2), dtype=np.float32)
-        X[:, 1] = timeVecWin[startIdx:stopIdx, 0]
-        c = np.linalg.lstsq(X, 10*np.log10(timeWinData[startIdx:stopIdx]),
-                            rcond=-1)[0]
-
-        if (c[1] == 0)[0] or np.isnan(c).any():
+            # X*c = EDC (energy decaying curve)
+            c0, c1 = _line_fit(_running_sums(timeVecWin, levels),
+                               startIdx, stopIdx)
             if not suppressWarnings:
-                print(band, "[Hz] band: regression failed. T would be inf.")
-            # return returnTuple
+                _band_warning(chBands, ok & ((c1 == 0) | np.isnan(c1) | np.isnan(c0)),
+                              "regression failed. T would be inf.")
 
-        # 4) preliminary intersection
-        crossingPoint = (bgNoiseLevel - c[0]) / c[1]  # [s]
-        if (crossingPoint > 2*(timeLength + sampleShift/samplingRate))[0]:
+            # 4) preliminary intersection
+            crossingPoint = (bgNoiseLevel - c0) / c1  # [s]
             if not suppressWarnings:
-                print(band, "[Hz] band: preliminary intersection point between",
-                      "bgNoiseLevel and the decay slope greater than signal length.")
-            # return returnTuple
+                _band_warning(chBands, ok & (crossingPoint > 2*timeLength),
+                              "preliminary intersection point between "
+                              + "bgNoiseLevel and the decay slope greater "
+                              + "than signal length.")
+
+            # 5) new local time interval length
+            nBlocksInDecay = numParts * dynRange / -10
+            dynRangeTime = timeVecWin[stopIdx, cols] - timeVecWin[startIdx, cols]
+            blockSamples = np.trunc(samplingRate * dynRangeTime / nBlocksInDecay)
+            ok &= np.isfinite(blockSamples) & (blockSamples >= 1)
+            blockSamples = np.where(ok, blockSamples, numSamples).astype(int)
+
+            # 6) average
+            timeWinData, timeVecWin = _level_profile(x, samplingRate,
+                                                     numSamples, numCh,
+                                                     blockSamples, shifts,
+                                                     xCumEnergy)
+            nblocks = (numSamples - shifts) // blockSamples
+            ok &= nblocks > 0
+            levels = 10*np.log10(timeWinData)
+            sums = _running_sums(timeVecWin, levels)
+            lastTime = (nblocks - 1) * blockSamples / samplingRate
+
+            BGL = np.zeros(numCh)
+            c1 = np.where(ok, c1, 0)
+            oldCrossingPoint = 11+crossingPoint  # arbitrary higher value to enter loop
+            active = ok.copy()
+            loopCounter = 0
+            while True:
+                active &= np.abs(oldCrossingPoint - crossingPoint) > 0.001
+                if not active.any():
+                    break
 
-        # 5) new local time interval length
-        nBlocksInDecay = numParts * dynRange[0] / -10
+                # 7) estimate background noise level (BGL)
+                idxLast10Percent = nblocks - nblocks//10
+                bgStartTime = crossingPoint - bgNoiseMargin/c1
+                idx10dBDecayBelowCrossPoint = np.where(
+                    bgStartTime > lastTime, nblocks - 1,
+                    np.argmax(timeVecWin >= bgStartTime, axis=0))
+                BGL = np.where(active, _masked_mean(
+                    timeWinData, np.minimum(idxLast10Percent,
+                                            idx10dBDecayBelowCrossPoint),
+                    nblocks), BGL)
+                bgNoiseLevel = 10*np.log10(BGL)
+
+                # 8) estimate late decay slope
+                stopTime = (bgNoiseLevel + dBtoNoise - c0)/c1
+                stopIdx = np.where(stopTime > lastTime, 0,
+                                   np.argmax(timeVecWin >= stopTime, axis=0))
+                # The first block always satisfies the start time condition
+                startIdx = np.zeros(numCh, dtype=int)
+
+                lateDynRange = np.abs(levels[stopIdx, cols]
+                                      - levels[startIdx, cols])
+
+                # where returns empty
+                failed = active & ((stopIdx <= startIdx + 1)
+                                   | (lateDynRange < useDynRange))
+                if not suppressWarnings:
+                    _band_warning(chBands, failed, "SNR for the Lundeby late "
+                                  + "decay slope too low. Skipping!")
+                c1[failed] = 0
+                active &= ~failed
 
-        dynRangeTime = timeVecWin[stopIdx] - timeVecWin[startIdx]
-        blockSamples = int(samplingRate * dynRangeTime[0] / nBlocksInDecay)
+                newC0, newC1 = _line_fit(sums, startIdx, stopIdx)
+                c0 = np.where(active, newC0, c0)
+                c1 = np.where(active, newC1, c1)
 
-        # 6) average
-        timeWinData, timeVecWin = _level_profile(timeSignal, samplingRate,
-                                                 numSamples, numChannels,
-                                                 blockSamples)
-
-        oldCrossingPoint = 11+crossingPoint  # arbitrary higher value to enter loop
-        loopCounter = 0
-
-        while (np.abs(oldCrossingPoint - crossingPoint) > 0.001)[0]:
-            # 7) estimate background noise level (BGL)
-            bgNoiseMargin = 7
-            idxLast10Percent = int(len(timeWinData)-(len(timeWinData)//10))
-            bgStartTime = crossingPoint - bgNoiseMargin/c[1]
-            if (bgStartTime > timeVecWin[-1:][0])[0]:
-                idx10dBDecayBelowCrossPoint = len(timeVecWin)-1
-            else:
-                idx10dBDecayBelowCrossPoint = \
-                    np.where(timeVecWin >= bgStartTime)[0][0]
-            BGL = np.mean(timeWinData[np.min(
-                    np.array([idxLast10Percent,
-                              idx10dBDecayBelowCrossPoint])):])
-            bgNoiseLevel = 10*np.log10(BGL)
-
-            # 8) estimate late decay slope
-            stopTime = (bgNoiseLevel + dBtoNoise - c[0])/c[1]
-            if (stopTime > timeVecWin[-1])[0]:
-                stopIdx = 0
-            else:
-                stopIdx = int(np.where(timeVecWin >= stopTime)[0][0])
+                failed = active & ~(c1 < 0)
+                if not suppressWarnings:
+                    _band_warning(chBands, failed, "regression did not work, "
+                                  + "T -> inf. Setting slope to 0!")
+                c1[failed] = 0
+                active &= ~failed
+
+                # 9) find crosspoint
+                oldCrossingPoint = np.where(active, crossingPoint,
+                                            oldCrossingPoint)
+                crossingPoint = np.where(active, (bgNoiseLevel - c0) / c1,
+                                         crossingPoint)
+
+                loopCounter += 1
+                if loopCounter > 30:
+                    if not suppressWarnings:
+                        _band_warning(chBands, active, "more than 30 "
+                                      + "iterations on regression. Canceling!")
+                    break
 
-            startTime = (bgNoiseLevel + dBtoNoise + useDynRange - c[0])/c[1]
-            if (startTime < timeVecWin[0])[0]:
-                startIdx = 0
-            else:
-                startIdx = int(np.where(timeVecWin <= startTime)[0][0])
+        done = c1 != 0
+        interIdx = crossingPoint[done] * samplingRate  # [sample]
+        c0Out[idx[done]] = c0[done]
+        c1Out[idx[done]] = c1[done]
+        interIdxOut[idx[done]] = interIdx
+        BGLOut[idx[done]] = BGL[done]
+        pending[idx[done]] = False
 
-            lateDynRange = np.abs(10*np.log10(timeWinData[stopIdx]) \
-                - 10*np.log10(timeWinData[startIdx]))
+    if not suppressWarnings:
+        _band_warning(bands, pending, "too many iterations to find "
+                      + "winTimeLength. Canceling!")
+    return c0Out, c1Out, interIdxOut, BGLOut
 
-            # where returns empty
-            if stopIdx == startIdx or (lateDynRange < useDynRange)[0]:
-                if not suppressWarnings:
-                    print(band, "[Hz] band: SNR for the Lundeby late decay slope too",
-                        "low. Skipping!")
-                # c[1] = np.inf
-                c[1] = 0
-                i += 1
-                break
-
-            X = np.ones((stopIdx-startIdx, 2), dtype=np.float32)
-            X[:, 1] = timeVecWin[startIdx:stopIdx, 0]
-            c = np.linalg.lstsq(X, 10*np.log10(timeWinData[startIdx:stopIdx]),
-                                rcond=-1)[0]
-
-            if (c[1] >= 0)[0]:
-                if not suppressWarnings:
-                    print(band, "[Hz] band: regression did not work, T -> inf.",
-                        "Setting slope to 0!")
-                # c[1] = np.inf
-                c[1] = 0
-                i += 1
-                break
-
-            # 9) find crosspoint
-            oldCrossingPoint = crossingPoint
-            crossingPoint = (bgNoiseLevel - c[0]) / c[1]
-
-            loopCounter += 1
-            if loopCounter > 30:
-                if not suppressWarnings:
-                    print(band, "[Hz] band: more than 30 iterations on regression.",
-                        "Canceling!")
-                break
-
-        interIdx = crossingPoint * samplingRate # [sample]
-        i += i
-        if c[1][0] != 0:
-            repeat = False
-        if i > 5:
-            if not suppressWarnings:
-                print(band, "[Hz] band: too many iterations to find winTimeLength.", "Canceling!")
-            return returnTuple
 
-    return c[0][0], c[1][0], np.int32(interIdx[0]), BGL
+def _print_start_sample_warnings(flags):
+    if flags & _kernels.NOISE_LEVEL_CHECK:
+        print("noiseLevelCheck: The SNR too bad or this is not an " +
+              "impulse response.")
+    if flags & _kernels.THRESHOLD_DECREASED:
+        print("_start_sample_ISO3382: 20 dB threshold too high. " +
+              "Decreasing it.")
+    return
+
+
+def _Lundeby_correction_jit(bands, timeSignal, samplingRate,
+                            suppressWarnings=True):
+    """Numba backend of _Lundeby_correction."""
+    c0, c1, interIdx, BGL, flags = \
+        _kernels.lundeby(timeSignal, _energy_cumsum(timeSignal),
+                         samplingRate)
+    messages = [(_kernels.PRELIMINAR_SNR,
+                 "SNR too low for the preliminar slope calculation."),
+                (_kernels.PRELIMINAR_REGRESSION,
+                 "regression failed. T would be inf."),
+                (_kernels.PRELIMINAR_INTERSECTION,
+                 "preliminary intersection point between bgNoiseLevel and "
+                 + "the decay slope greater than signal length."),
+                (_kernels.LATE_SNR,
+                 "SNR for the Lundeby late decay slope too low. Skipping!"),
+                (_kernels.LATE_REGRESSION,
+                 "regression did not work, T -> inf. Setting slope to 0!"),
+                (_kernels.ITERATIONS,
+                 "more than 30 iterations on regression. Canceling!"),
+                (_kernels.WINDOW_ITERATIONS,
+                 "too many iterations to find winTimeLength. Canceling!")]
+    for bandFlags in flags:
+        _print_start_sample_warnings(bandFlags)
+    if not suppressWarnings:
+        for flag, message in messages:
+            _band_warning(bands, (flags & flag) > 0, message)
+    dtype = _result_dtype(timeSignal)
+    return (c0.astype(dtype), c1.astype(dtype),
+            interIdx.astype(np.int32), BGL.astype(dtype))
+
+
+def energy_decay_curves(timeSignal, samplingRate, bypassLundeby=False,
+                        suppressWarnings=True, bands=None):
+    """
+    Calculate the Energy Decay Curves of all bands at once.
 
+    Parameters
+    ----------
+    timeSignal : np.ndarray
+        Band filtered impulse responses, with shape (samples, bands).
+    samplingRate : int
+        Sampling rate of the impulse responses.
+    bypassLundeby : bool, optional
+        Whether to bypass calculation of Lundeby IR improvements or not.
+        The default is False.
+    suppressWarnings : bool, optional
+        If supress warnings about IR quality and the bypassing of Lundeby
+        calculations. The default is True.
+    bands : np.ndarray, optional
+        Band center frequencies, only used on warnings. The default is None.
 
-# @njit
-def energy_decay_calculation(band, timeSignal, timeVector, samplingRate,
-                             numSamples, numChannels, timeLength, bypassLundeby,
-                             suppressWarnings=True):
-    """Calculate the Energy Decay Curve."""
-    if bypassLundeby is False:
-        lundebyParams = \
-            _Lundeby_correction(band,
-                                timeSignal,
-                                samplingRate,
-                                numSamples,
-                                numChannels,
-                                timeLength,
-                                suppressWarnings=suppressWarnings)
+    Returns
+    -------
+    energyDecay : np.ndarray
+        The normalized EDCs, with shape (samples, bands), each one zero
+        padded after its truncation point. Double precision for float64
+        impulse responses, single precision otherwise.
+    numSamples : np.ndarray
+        Number of samples of each EDC.
+    lundebyParams : Tuple[np.ndarray]
+        The (c0, c1, interIdx, BGL) arrays of the Lundeby correction, zeros
+        if it was bypassed.
+
+    """
+    timeSignal = np.asarray(timeSignal)
+    if timeSignal.ndim == 1:
+        timeSignal = timeSignal[:, None]
+    numSamples, numBands = timeSignal.shape
+    dtype = _result_dtype(timeSignal)
+    if bands is None:
+        bands = np.arange(numBands)
+    if not bypassLundeby:
+        lundebyParams = _Lundeby_correction(bands, timeSignal, samplingRate,
+                                            suppressWarnings)
         _, c1, interIdx, BGL = lundebyParams
-        lateRT = -60/c1 if c1 != 0 else 0
+        with np.errstate(divide='ignore'):
+            lateRT = np.where(c1 != 0, -60/c1, 0)
+        C = samplingRate*BGL*lateRT/(6*np.log(10))
     else:
-        interIdx = 0
-        lateRT = 1
-
-    if interIdx == 0:
-        interIdx = -1
+        lundebyParams = (np.zeros(numBands, dtype=dtype),
+                         np.zeros(numBands, dtype=dtype),
+                         np.zeros(numBands, dtype=np.int32),
+                         np.zeros(numBands, dtype=dtype))
+        interIdx = lundebyParams[2]
+        lateRT = np.ones(numBands)
+        C = np.zeros(numBands)
+
+    interIdx = np.where(interIdx == 0, -1, interIdx)
+    # Same number of samples as slicing up to interIdx
+    lengths = np.where(interIdx < 0, np.maximum(numSamples + interIdx, 0),
+                       np.minimum(interIdx, numSamples))
+
+    if _kernels.enabled(default.backend):
+        energyDecay = np.zeros((numSamples, numBands), dtype=dtype)
+        _kernels.schroeder(timeSignal, lengths,
+                           np.asarray(C, dtype='float64'), energyDecay)
+    else:
+        rows = np.arange(numSamples)[:, None]
+        truncated = rows < lengths
+        sqrIR = np.where(truncated, np.square(timeSignal, dtype='float64'), 0)
+        energyDecay = np.cumsum(sqrIR[::-1], axis=0)[::-1] + C
+        with np.errstate(divide='ignore', invalid='ignore'):
+            energyDecay /= energyDecay[0]
+        energyDecay[~truncated] = 0
+        energyDecay = energyDecay.astype(dtype, copy=False)
+    if not suppressWarnings:
+        _band_warning(bands, lateRT == 0, "could not estimate C factor")
+    energyDecay[:, lateRT == 0] = 0
+    return energyDecay, lengths, lundebyParams
 
-    truncatedTimeSignal = timeSignal[:interIdx, 0]
-    truncatedTimeVector = timeVector[:interIdx]
 
-    if lateRT != 0.0:
-        if not bypassLundeby:
-            C = samplingRate*BGL*lateRT/(6*np.log(10))
-        else:
-            C = 0
-        sqrInv = truncatedTimeSignal[::-1]**2
-        energyDecayFull = np.cumsum(sqrInv)[::-1] + C
-        energyDecay = energyDecayFull/energyDecayFull[0]
-    else:
-        if not suppressWarnings:
-            print(band, "[Hz] band: could not estimate C factor")
-        C = 0
-        energyDecay = np.zeros(truncatedTimeVector.size)
-    return (energyDecay, truncatedTimeVector, lundebyParams)
+def energy_decay_calculation(band, timeSignal, timeVector, samplingRate,
+                             numSamples, numChannels, timeLength, bypassLundeby,
+                             suppressWarnings=True):
+    """Calculate the Energy Decay Curve of one band, see energy_decay_curves."""
+    energyDecay, lengths, lundebyParams = \
+        energy_decay_curves(timeSignal[:, :1], samplingRate, bypassLundeby,
+                            suppressWarnings, [band])
+    return (energyDecay[:lengths[0], 0], timeVector[:lengths[0]],
+            tuple(param[0] for param in lundebyParams))
 
 
 def cumulative_integration(inputSignal,
                            bypassLundeby,
                            plotLundebyResults,
                            suppressWarnings=True,
+                           filterDomain='time',
+                           hSignal=None,
                            **kwargs):
-    """Cumulative integration with proper corrections."""
+    """
+    Cumulative integration with proper corrections.
 
-    def plot_lundeby():
+    The `filterDomain` selects the OctFilter used on the bands, 'time' for
+    the band-pass IIR filters or 'freq' for the FFT-domain filter bank. An
+    already filtered `hSignal` skips the filtering.
+    """
+
+    def plot_lundeby(band, lundebyParams):
         c0, c1, interIdx, BGL = lundebyParams
         fig = plt.figure(figsize=(10, 5))
         ax = fig.add_axes([0.08, 0.15, 0.75, 0.8], polar=False,
@@ -1468,49 +2171,59 @@ def cumulative_integration(inputSignal,
     # timeSignal, sampleShift = _circular_time_shift(timeSignal)
     # del sampleShift
     # hSignal = SignalObj(timeSignal, inputSignal.lengthDomain, inputSignal.samplingRate)
-    hSignal = _filter(inputSignal, **kwargs)
+    if hSignal is None:
+        hSignal = _filter(inputSignal, domain=filterDomain, **kwargs)
     bands = FOF(nthOct=kwargs['nthOct'],
                 freqRange=[kwargs['minFreq'],
                            kwargs['maxFreq']])[:, 1]
+    energyDecay, lengths, lundebyParams = \
+        energy_decay_curves(hSignal.timeSignal, hSignal.samplingRate,
+                            bypassLundeby, suppressWarnings, bands)
     listEDC = []
     for ch in range(hSignal.numChannels):
-        signal = hSignal[ch]
-        band = bands[ch]
-        energyDecay, energyVector, lundebyParams = \
-            energy_decay_calculation(band,
-                                     signal.timeSignal,
-                                     signal.timeVector,
-                                     signal.samplingRate,
-                                     signal.numSamples,
-                                     signal.numChannels,
-                                     signal.timeLength,
-                                     bypassLundeby,
-                                     suppressWarnings=suppressWarnings)
-        listEDC.append((energyDecay, energyVector))
+        listEDC.append((energyDecay[:lengths[ch], ch],
+                        hSignal.timeVector[:lengths[ch]]))
         if plotLundebyResults:  # Placed here because Numba can't handle plots.
-            # plot_lundeby(band, timeVector, timeSignal,  samplingRate,
-            #             lundebyParams)
-            plot_lundeby()
+            plot_lundeby(bands[ch], tuple(param[ch] for param in lundebyParams))
     return listEDC, hSignal
 
-# @njit
+def _decay_regression(energyDecay, energyVector, upperLims, lowerLims):
+    """
+    Reverberation times of each column of `energyDecay`, for every pair of
+    upperLims and lowerLims, all fitted from the same running sums.
+
+    Returns a (limits, bands) array.
+    """
+    numSamples = energyDecay.shape[0]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        levels = 10*np.log10(energyDecay)
+        first = np.empty((len(upperLims), energyDecay.shape[1]), dtype=int)
+        last = np.empty_like(first)
+        found = np.ones(first.shape, dtype=bool)
+        for fit, (upperLim, lowerLim) in enumerate(zip(upperLims, lowerLims)):
+            for lim, idx in ((upperLim, first), (lowerLim, last)):
+                above = levels[::-1] >= lim
+                idx[fit] = numSamples - 1 - np.argmax(above, axis=0)
+                found[fit] &= above.any(axis=0)
+        c0, c1 = _line_fit(_running_sums(energyVector, levels), first, last)
+        RT = -60/c1
+    RT[last <= first] = 0
+    RT[~found] = np.nan
+    RT[:, ~np.any(energyDecay, axis=0)] = 0
+    return RT
+
+
 def reverb_time_regression(energyDecay, energyVector, upperLim, lowerLim):
     """Interpolate the EDT to get the reverberation time."""
-    if not np.any(energyDecay):
-        return 0
-    first = np.where(10*np.log10(energyDecay) >= upperLim)[0][-1]
-    last = np.where(10*np.log10(energyDecay) >= lowerLim)[0][-1]
-    if last <= first:
-        # return np.nan
-        return 0
-    X = np.ones((last-first, 2))
-    X[:, 1] = energyVector[first:last]
-    c = np.linalg.lstsq(X, 10*np.log10(energyDecay[first:last]), rcond=-1)[0]
-    return -60/c[1]
+    if _kernels.enabled(default.backend):
+        return _kernels.decay_regression(energyDecay, energyVector,
+                                         np.array([upperLim], dtype=float),
+                                         np.array([lowerLim], dtype=float))[0]
+    return _decay_regression(energyDecay[:, None], energyVector[:, None],
+                             [upperLim], [lowerLim])[0, 0]
 
 
-def reverberation_time(decay, listEDC):
-    """Call the reverberation time regression."""
+def _decay_limits(decay):
     try:
         decay = int(decay)
         y1 = -5
@@ -1523,11 +2236,95 @@ def reverberation_time(decay, listEDC):
             raise ValueError("Decay must be either 'EDT' or an integer \
                              corresponding to the amount of energy decayed to \
                              evaluate, e.g. (decay='20' | 20).")
-    RT = []
-    for ED in listEDC:
-        edc, edv = ED
-        RT.append(reverb_time_regression(edc, edv, y1, y2))
-    return np.array(RT, dtype='float32')
+    return y1, y2
+
+
+def _stack_decays(listEDC):
+    """
+    The energy decay curves and time vectors of `listEDC` as (samples, bands)
+    arrays, zero padded to the longest curve.
+    """
+    numSamples = max((len(edc) for edc, _ in listEDC), default=0)
+    dtype = listEDC[0][0].dtype if listEDC else 'float32'
+    energyDecay = np.zeros((numSamples, len(listEDC)), dtype=dtype)
+    energyVector = np.zeros((numSamples, len(listEDC)))
+    for band, (edc, edv) in enumerate(listEDC):
+        energyDecay[:len(edc), band] = edc
+        energyVector[:len(edv), band] = edv
+    return energyDecay, energyVector
+
+
+def energy_ratios(energyDecay: np.ndarray, fs: int,
+                  numerators: list, denominators: list) -> np.ndarray:
+    """
+    Ratios of the energy inside time intervals, for all bands at once.
+
+    Every energy parameter is one of these ratios, e.g. C80 is the energy in
+    (0, 80) ms over the energy in (80, None) ms, and D50 the energy in
+    (0, 50) ms over the whole, (0, None) ms.
+
+    Parameters
+    ----------
+    energyDecay : np.ndarray
+        Energy decay curves, the columns, zero padded after their ends.
+    fs : int
+        Sampling rate.
+    numerators : list
+        (start, stop) time intervals in milliseconds. A None stop is the end
+        of the decay curve.
+    denominators : list
+        (start, stop) time intervals, for each one of the numerators.
+
+    Returns
+    -------
+    ratios : np.ndarray
+        A (intervals, bands) array.
+
+    """
+    numSamples = energyDecay.shape[0]
+
+    def energy(intervals):
+        idx = np.array([(start * fs // 1000,
+                         numSamples if stop is None else stop * fs // 1000)
+                        for start, stop in intervals], dtype=int)
+        # The energy from each sample to the end, zero after the end
+        idx = np.minimum(idx, numSamples)
+        inside = idx < numSamples
+        tail = np.zeros(idx.shape + energyDecay.shape[1:],
+                        dtype=energyDecay.dtype)
+        tail[inside] = energyDecay[idx[inside]]
+        return tail[:, 0] - tail[:, 1]
+
+    return energy(numerators) / energy(denominators)
+
+
+def reverberation_times(decays, listEDC):
+    """
+    Reverberation times for several decays, e.g. ('EDT', 20, 30), with one
+    sweep over each energy decay curve.
+
+    Returns a (decays, bands) array.
+    """
+    upperLims, lowerLims = np.array([_decay_limits(decay)
+                                     for decay in decays], dtype=float).T
+    RT = np.zeros((len(upperLims), len(listEDC)),
+                  dtype=_result_dtype(listEDC[0][0]) if listEDC else 'float32')
+    if _kernels.enabled(default.backend):
+        for band, (edc, edv) in enumerate(listEDC):
+            RT[:, band] = _kernels.decay_regression(edc, edv,
+                                                    upperLims, lowerLims)
+        return RT
+    if not listEDC:
+        return RT
+    # Zero padding keeps the shorter curves out of the fits
+    energyDecay, energyVector = _stack_decays(listEDC)
+    RT[:] = _decay_regression(energyDecay, energyVector, upperLims, lowerLims)
+    return RT
+
+
+def reverberation_time(decay, listEDC):
+    """Call the reverberation time regression."""
+    return reverberation_times([decay], listEDC)[0]
 
 
 def definition(listEDC: list, fs: int, t: int = 50) -> np.ndarray:
@@ -1536,28 +2333,26 @@ def definition(listEDC: list, fs: int, t: int = 50) -> np.ndarray:
 
     Parameters
     ----------
-    sqrIR : np.ndarray
-        DESCRIPTION.
-    t_ms : int, optional
-        DESCRIPTION. The default is 50.
+    listEDC : list
+        Energy decay curve and time vector of each band.
+    fs : int
+        Sampling rate.
+    t : int | list, optional
+        Early time limit in milliseconds, or a list of them. The default is 50.
 
     Returns
     -------
     definition : np.ndarray
-        The room "Definition" parameter, in percentage [%].
+        The room "Definition" parameter, in percentage [%]. One row per time
+        limit if `t` is a list.
 
     """
-    t_ms = t * fs // 1000
-    definition = np.zeros((len(listEDC), ), dtype='float32')
-    for band, pair in enumerate(listEDC):
-        int_h2 = pair[0][0]  # sum of squared IR from start to the end
-        intr_h2_ms = pair[0][t_ms]  # sum of squared IR from the interval to the end
-        int_h2_ms = int_h2 - intr_h2_ms  # sum of squared IR from start to interval
-        definition[band] = (int_h2_ms / int_h2)
-    # sumSIRt = sqrIR.sum(axis=0)  # total sum of squared IR
-    # sumSIRi = sqrIR[:t_ms].sum(axis=0)  # sum of initial portion of squared IR
-    # definition = np.round(100 * (sumSIRi / sumSIRt), 2)  # [%]
-    return np.round(100 * definition, 2)  # [%]
+    t = np.asarray(t)
+    energyDecay, _ = _stack_decays(listEDC)
+    definition = energy_ratios(energyDecay, fs,
+                               [(0, ms) for ms in t.ravel()],
+                               [(0, None)] * t.size)
+    return np.round(100 * definition.reshape(t.shape + (-1,)), 2)  # [%]
 
 
 def clarity(listEDC: list, fs: int, t: int = 80) -> np.ndarray:
@@ -1566,28 +2361,27 @@ def clarity(listEDC: list, fs: int, t: int = 80) -> np.ndarray:
 
     Parameters
     ----------
-    sqrIR : np.ndarray
-        DESCRIPTION.
-    t_ms : int, optional
-        DESCRIPTION. The default is 80.
+    listEDC : list
+        Energy decay curve and time vector of each band.
+    fs : int
+        Sampling rate.
+    t : int | list, optional
+        Early time limit in milliseconds, or a list of them, e.g. [50, 80].
+        The default is 80.
 
     Returns
     -------
     clarity : np.ndarray
-        The room "Clarity" parameter, in decibel [dB].
+        The room "Clarity" parameter, in decibel [dB]. One row per time limit
+        if `t` is a list.
 
     """
-    t_ms = t * fs // 1000
-    clarity = np.zeros((len(listEDC), ), dtype='float32')
-    for band, pair in enumerate(listEDC):
-        int_h2 = pair[0][0]  # sum of squared IR from start to the end
-        intr_h2_ms = pair[0][t_ms]  # sum of squared IR from the interval to the end
-        int_h2_ms = int_h2 - intr_h2_ms  # sum of squared IR from start to interval
-        clarity[band] = 10 * np.log10(int_h2_ms / intr_h2_ms)  # [dB]
-    # sumSIRi = sqrIR[:t_ms].sum(axis=0)  # sum of initial portion of squared IR
-    # sumSIRe = sqrIR[t_ms:].sum(axis=0)  # sum of ending portion of squared IR
-    # clarity = np.round(10 * np.log10(sumSIRi / sumSIRe), 2)  # [dB]
-    return np.round(clarity, 2)
+    t = np.asarray(t)
+    energyDecay, _ = _stack_decays(listEDC)
+    clarity = energy_ratios(energyDecay, fs,
+                            [(0, ms) for ms in t.ravel()],
+                            [(ms, None) for ms in t.ravel()])
+    return np.round(10 * np.log10(clarity.reshape(t.shape + (-1,))), 2)  # [dB]
 
 
 def central_time(sqrIR: np.ndarray, tstamp: np.ndarray) -> np.ndarray:
@@ -1619,31 +2413,21 @@ def st_early(listEDC: list, fs: int) -> np.ndarray:
 
     Parameters
     ----------
-    sqrIR : np.ndarray
-        DESCRIPTION.
+    listEDC : list
+        Energy decay curve and time vector of each band.
+    fs : int
+        Sampling rate.
 
     Returns
     -------
     STearly : np.ndarray
-        DESCRIPTION.
+        Early reflections, 20 to 100 ms, level relative to the direct sound,
+        0 to 10 ms, in decibel [dB].
 
     """
-    ms = fs // 1000
-    STearly = np.zeros((len(listEDC), ), dtype='float32')
-    for band, pair in enumerate(listEDC):
-        int_h2 = pair[0][0]  # sum of squared IR from start to the end
-        intr_h2_10ms = pair[0][10 * ms]  # sum of squared IR from the interval to the end
-        int_h2_10ms = int_h2 - intr_h2_10ms
-
-        intr_h2_20ms = pair[0][20 * ms]  # sum of squared IR from the interval to the end
-        intr_h2_100ms = pair[0][100 * ms]  # sum of squared IR from the interval to the end
-        int_h2_20a100ms = intr_h2_20ms - intr_h2_100ms
-        STearly[band] = 10 * np.log10(int_h2_20a100ms / int_h2_10ms)  # [dB]
-
-    # sum10ms = sqrIR[:int(10 * ms)].sum(axis=0)
-    # sum20ms = sqrIR[int(20 * ms):int(100 * ms)].sum(axis=0)
-    # STearly = 10 * np.log10(sum20ms / sum10ms)
-    return np.round(STearly, 4)
+    energyDecay, _ = _stack_decays(listEDC)
+    STearly = energy_ratios(energyDecay, fs, [(20, 100)], [(0, 10)])[0]
+    return np.round(10 * np.log10(STearly), 4)  # [dB]
 
 
 def st_late(listEDC: list, fs: int) -> np.ndarray:
@@ -1652,40 +2436,35 @@ def st_late(listEDC: list, fs: int) -> np.ndarray:
 
     Parameters
     ----------
-    sqrIR : np.ndarray
-        DESCRIPTION.
+    listEDC : list
+        Energy decay curve and time vector of each band.
+    fs : int
+        Sampling rate.
 
     Returns
     -------
     STlate : np.ndarray
-        DESCRIPTION.
+        Late reflections, from 100 ms on, level relative to the direct sound,
+        0 to 10 ms, in decibel [dB].
 
     """
-    ms = fs // 1000
-    STlate = np.zeros((len(listEDC), ), dtype='float32')
-    for band, pair in enumerate(listEDC):
-        int_h2 = pair[0][0]  # sum of squared IR from start to the end
-        intr_h2_10ms = pair[0][10 * ms]  # sum of squared IR from the interval to the end
-        int_h2_10ms = int_h2 - intr_h2_10ms  # sum of squared IR from start to interval
-        intr_h2_100ms = pair[0][100 * ms]  # sum of squared IR from the interval to the end
-        STlate[band] = 10 * np.log10(intr_h2_100ms / int_h2_10ms)  # [dB]
-    # sum10ms = sqrIR[:int(10 * ms)].sum(axis=0)
-    # sum100ms = sqrIR[int(100 * ms):int(1000 * ms)].sum(axis=0)
-    # STlate = 10 * np.log10(sum100ms / sum10ms)
-    return np.round(STlate, 4)
+    energyDecay, _ = _stack_decays(listEDC)
+    STlate = energy_ratios(energyDecay, fs, [(100, None)], [(0, 10)])[0]
+    return np.round(10 * np.log10(STlate), 4)  # [dB]
 
 
 def crop_IR(SigObj, IREndManualCut):
-    """Cut the impulse response at background noise level."""
-    timeSignal = cp.copy(SigObj.timeSignal)
+    """
+    Cut the impulse response at background noise level.
+
+    On multichannel signals the end is the latest among the channels, and the
+    start the earliest, so no channel loses any part of its decay.
+    """
+    timeSignal = SigObj.timeSignal
     timeVector = SigObj.timeVector
     samplingRate = SigObj.samplingRate
     numSamples = SigObj.numSamples
-    # numChannels = SigObj.numChannels
-    if SigObj.numChannels > 1:
-        print('crop_IR: The provided impulsive response has more than one ' +
-              'channel. Cropping based on channel 1.')
-    numChannels = 1
+    numChannels = SigObj.numChannels
     # Cut the end automatically or manual
     if IREndManualCut is None:
         winTimeLength = 0.1  # [s]
@@ -1695,22 +2474,29 @@ def crop_IR(SigObj, IREndManualCut):
         timeWinData, timeVecWin = _level_profile(timeSignal, samplingRate,
                                                 numSamples, numChannels,
                                                 blockSamples)
+        # Level of each block and the mean of the previous meanSize blocks
+        cumBlocks = np.cumsum(timeWinData, axis=0)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            anteriorMean = 10*np.log10((cumBlocks[meanSize-1:-1]
+                                        - np.vstack([np.zeros(numChannels),
+                                                     cumBlocks[:-meanSize-1]]))
+                                       / meanSize)
+            replica = 10*np.log10(timeWinData[meanSize:]) \
+                > anteriorMean + dBtoReplica
         endTimeCut = timeVector[-1]
-        for blockIdx, blockAmplitude in enumerate(timeWinData):
-            if blockIdx >= meanSize:
-                anteriorMean = 10*np.log10( \
-                    np.sum(timeWinData[blockIdx-meanSize:blockIdx])/meanSize)
-                if 10*np.log10(blockAmplitude) > anteriorMean+dBtoReplica:
-                    endTimeCut = timeVecWin[blockIdx-meanSize//2]
-                    break
+        if replica.any():
+            cutBlock = np.argmax(replica, axis=0) + meanSize - meanSize//2
+            endTimeCut = np.max(np.where(replica.any(axis=0),
+                                         timeVecWin[cutBlock, 0], endTimeCut))
     else:
         endTimeCut = IREndManualCut
-    endTimeCutIdx = np.where(timeVector >= endTimeCut)[0][0]
+    endTimeCutIdx = np.searchsorted(timeVector, endTimeCut)
     timeSignal = timeSignal[:endTimeCutIdx]
     # Cut the start automatically
     timeSignal, _ = _circular_time_shift(timeSignal)
     result = SignalObj(timeSignal,
                        'time',
                        samplingRate,
-                       signalType='energy')
+                       signalType='energy',
+                       precision=SigObj.precision)
     return result
@@ -1,14 +1,80 @@
 # -*- coding: utf-8 -*-
 
+import os
+import hashlib
 import numpy as np
 from copy import copy
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from scipy import signal as ss
+try:
+    from scipy import fft as sfft
+except ImportError:  # pragma: no cover
+    # SciPy < 1.4, the transforms run on a single thread
+    from numpy import fft as sfft
+from pytta import default
 from pytta.classes import SignalObj
+from pytta.classes.signal import _precision_dtypes
 from pytta.classes._base import ChannelsList
 from pytta.utils import fractional_octave_frequencies, freq_to_band, \
                         normalize_frequencies, freqs_to_center_and_edges
 
 
+_designCache = OrderedDict()
+"""Process-wide least recently used filter designs, see OctFilter."""
+
+_responseCache = OrderedDict()
+"""
+Process-wide least recently used 'freq' domain band responses, bounded by
+their size in bytes and kept apart from the designs, see freq_responses.
+"""
+
+_responseChunkBytes = 2**26
+"""Size of the spectra products filtered at once on 'freq' domain filters."""
+
+_fftWorkers = sfft.__name__ == 'scipy.fft'
+"""If the FFTs can be threaded, on SciPy 1.4 or newer."""
+
+
+def _fft_kwargs(workers):
+    return {'workers': workers} if _fftWorkers else {}
+
+
+def _cache_get(key, cache=_designCache):
+    try:
+        cache.move_to_end(key)
+    except KeyError:
+        return None
+    return cache[key]
+
+
+def _cache_set(key, arrays):
+    for arr in arrays:
+        arr.flags.writeable = False
+    _designCache[key] = arrays
+    while len(_designCache) > max(default.filterCacheSize, 0):
+        _designCache.popitem(last=False)
+    return arrays
+
+
+def _response_cache_set(key, responses):
+    responses.flags.writeable = False
+    maxBytes = max(default.filterResponseCacheBytes, 0)
+    if responses.nbytes > maxBytes:
+        return responses
+    _responseCache[key] = responses
+    while sum(cached.nbytes for cached in _responseCache.values()) > maxBytes:
+        _responseCache.popitem(last=False)
+    return responses
+
+
+def _cache_file(key):
+    if default.filterCacheDir is None:
+        return None
+    name = hashlib.sha1(repr(key).encode()).hexdigest()
+    return os.path.join(default.filterCacheDir, f'octfilter_{name}.npz')
+
+
 class FilterBase(object):
     """Base class for filters."""
 
@@ -46,7 +112,10 @@ class OctFilter(FilterBase):
                  minFreq: float = None,
                  maxFreq: float = None,
                  refFreq: float = None,
-                 base: int = None) -> None:
+                 base: int = None,
+                 multirate: bool = False,
+                 domain: str = 'time',
+                 phase: str = 'zero') -> None:
         """
 
         Parameters
@@ -65,6 +134,19 @@ class OctFilter(FilterBase):
             DESCRIPTION. The default is None.
         base : int, optional
             DESCRIPTION. The default is None.
+        multirate : bool, optional
+            Run the lower bands on an octave-by-octave decimated version of
+            the signal, each band being designed at the sampling rate it
+            runs at. The default is False.
+        domain : str, optional
+            Where the filtering takes place. 'time' runs the band-pass second
+            order sections over the samples, 'freq' multiplies the signal's
+            spectrum by the band responses, all bands in a single transform.
+            The default is 'time'.
+        phase : str, optional
+            Phase of the 'freq' domain band responses, 'zero' for zero-phase
+            or 'minimum' for minimum-phase, with the magnitude of the
+            Butterworth bands in both cases. The default is 'zero'.
 
         Returns
         -------
@@ -80,6 +162,17 @@ class OctFilter(FilterBase):
         self.maxBand = freq_to_band(maxFreq, nthOct, refFreq, base)
         self.refFreq = refFreq
         self.base = base
+        if domain not in ['time', 'freq']:
+            raise ValueError("Filter domain must be either 'time' or 'freq'.")
+        if phase not in ['zero', 'minimum']:
+            raise ValueError("Filter phase must be either 'zero' or 'minimum'.")
+        if multirate and domain == 'freq':
+            raise ValueError("Multirate filtering is only available in the "
+                             + "'time' domain.")
+        self.multirate = multirate
+        self.domain = domain
+        self.phase = phase
+        self._zi = None
         self.sos = self.get_sos_filters()
         return
 
@@ -95,30 +188,226 @@ class OctFilter(FilterBase):
     def __design_sos_butter(self,
                             bandEdges: np.ndarray,
                             order: int = 4,
-                            samplingRate: int = 44100) -> np.ndarray:
+                            samplingRate: int = 44100,
+                            decimation: np.ndarray = None) -> np.ndarray:
+        if decimation is None:
+            decimation = np.ones(len(bandEdges), dtype=int)
         sos = np.zeros((order, 6, len(bandEdges)))
         for i, edges in enumerate(bandEdges):
-            if edges[1] >= samplingRate//2:
-                edges[1] = samplingRate//2 - 1
+            fs = samplingRate / decimation[i]
+            if edges[1] >= fs//2:
+                edges[1] = fs//2 - 1
             sos[:, :, i] = ss.butter(N=order, Wn=np.array([edges[0],
                                                           edges[1]]),
-                                     btype='bp', output='sos', fs=samplingRate)
+                                     btype='bp', output='sos', fs=fs)
         return sos
 
+    @staticmethod
+    def _decimation_factors(bandEdges: np.ndarray,
+                            samplingRate: int) -> np.ndarray:
+        """
+        Power of two decimation factor of each band, the largest one that keeps
+        the band's upper edge under half of the decimated Nyquist frequency.
+        """
+        ratio = samplingRate / (4 * np.asarray(bandEdges)[:, 1])
+        octaves = np.floor(np.log2(np.maximum(ratio, 1)))
+        return (2 ** octaves).astype(int)
+
+    @property
+    def designKey(self):
+        """Design parameters identifying the filter bank on the cache."""
+        return (self.order, self.nthOct, self.samplingRate, self.minFreq,
+                self.maxFreq, self.refFreq, self.base, self.multirate)
+
+    @staticmethod
+    def clear_cache():
+        """Clear the in memory filter designs and band responses caches."""
+        _designCache.clear()
+        _responseCache.clear()
+        return
+
     def get_sos_filters(self) -> np.ndarray:
+        """
+        Band-pass second order sections, with shape (order, 6, bands).
+
+        Designs are kept on a process-wide least recently used cache holding
+        up to `pytta.default.filterCacheSize` filter banks, so that each bank
+        is designed only once. If `pytta.default.filterCacheDir` is set, they
+        are also stored on, and loaded from, that directory. Cached arrays are
+        read only.
+        """
+        key = self.designKey
+        cached = _cache_get(key)
+        if cached is None:
+            fileName = _cache_file(key)
+            if fileName is not None and os.path.isfile(fileName):
+                with np.load(fileName) as npz:
+                    cached = (npz['center'], npz['decimation'], npz['sos'])
+            else:
+                cached = self.__design_filter_bank()
+                if fileName is not None:
+                    os.makedirs(default.filterCacheDir, exist_ok=True)
+                    tmpName = f'{fileName}.{os.getpid()}.npz'
+                    np.savez(tmpName, center=cached[0],
+                             decimation=cached[1], sos=cached[2])
+                    os.replace(tmpName, fileName)
+            cached = _cache_set(key, cached)
+        self.center, self.decimation, sos = cached
+        return sos
+
+    def __design_filter_bank(self):
         freqs = fractional_octave_frequencies(self.nthOct,
                                               (self.minFreq,
                                                self.maxFreq),
                                               self.refFreq,
                                               self.base)
-        self.center, edges = freqs_to_center_and_edges(freqs)
-        return self.__design_sos_butter(edges, self.order, self.samplingRate)
+        center, edges = freqs_to_center_and_edges(freqs)
+        if self.multirate:
+            decimation = self._decimation_factors(edges, self.samplingRate)
+        else:
+            decimation = np.ones(len(edges), dtype=int)
+        sos = self.__design_sos_butter(edges, self.order, self.samplingRate,
+                                       decimation)
+        return center, decimation, sos
+
+    def freq_responses(self, nfft: int, precision: str = None) -> np.ndarray:
+        """
+        Complex responses of all bands on the `nfft` points rFFT bins, with
+        shape (bins, bands), as used by the 'freq' domain filtering. They are
+        evaluated in double precision and stored with `precision`, by default
+        `pytta.default.precision`.
+
+        Butterworth band-pass filters are minimum-phase, so the 'minimum'
+        phase responses are the filters' own, while the 'zero' phase ones keep
+        only their magnitude. Responses are cached apart from the designs, up
+        to `pytta.default.filterResponseCacheBytes` bytes. Larger ones are
+        not cached at all.
+        """
+        if precision is None:
+            precision = default.precision
+        _, complexDtype = _precision_dtypes(precision)
+        key = self.designKey + (nfft, self.phase, precision)
+        cached = _cache_get(key, _responseCache)
+        if cached is None:
+            freqs = sfft.rfftfreq(nfft, 1/self.samplingRate)
+            responses = np.empty((len(freqs), self.sos.shape[2]),
+                                 dtype='complex128')
+            for k in range(self.sos.shape[2]):
+                _, responses[:, k] = ss.sosfreqz(self.sos[:, :, k], freqs,
+                                                 fs=self.samplingRate)
+            if self.phase == 'zero':
+                responses = np.abs(responses)
+            cached = _response_cache_set(key, responses.astype(complexDtype))
+        return cached
 
     # def filter(self, sigobj):
     #     print(":WARNING: `OctFilter.filter` method will soon be deprecated.")
     #     return self._filter(sigobj)
 
-    def filter(self, sigobj):
+    def filter_bank(self, sigobj, workers: int = None,
+                    interpolate: bool = True) -> np.ndarray:
+        """
+        Filter all channels of the signal object through all bands at once.
+
+        Each band's second-order sections are run over every channel in a
+        single call, writing straight into one pre-allocated block. As
+        `scipy.signal.sosfilt` releases the GIL, the bands can be spread
+        across a pool of threads.
+
+        On multirate filters the signal is decimated by two once per octave
+        and each band is filtered at its own rate, see `decimation`. On 'freq'
+        domain filters a single batched rFFT/irFFT pair filters every band
+        and channel, see `freq_responses`. The transform length is rounded up
+        to a power of two, so signals of close lengths share the responses,
+        and the bands are transformed back in chunks of bounded memory.
+
+        The signal is filtered with its own precision, see
+        `SignalObj.precision`, while the filters are designed in double
+        precision.
+
+        Args:
+            sigobj: SignalObj
+
+            workers: int, optional
+                Number of threads used to filter the bands, or by the FFTs on
+                'freq' domain filters (SciPy 1.4 or newer). The default is
+                None, which filters the bands serially.
+
+            interpolate: bool, optional
+                Only used by multirate filters. If True, the bands are brought
+                back to the signal's sampling rate. The default is True.
+
+        Return:
+            output: np.ndarray
+                The filtered data with shape (samples, bands, channels).
+                Multirate filters called with `interpolate=False` return
+                instead a list with one (samples, channels) array per band,
+                sampled at `samplingRate / decimation[band]`.
+
+        """
+        if self.samplingRate != sigobj.samplingRate:
+            raise ValueError("SignalObj must have same sampling rate of filter to be filtered.")
+        realDtype, _ = _precision_dtypes(sigobj.precision)
+        timeSignal = np.asarray(sigobj.timeSignal, dtype=realDtype)
+        numSamples = timeSignal.shape[0]
+        numBands = self.sos.shape[2]
+        if self.domain == 'freq':
+            # Twice the length leaves room for the bands' decay, and for the
+            # zero-phase pre-ringing, before it wraps around
+            nfft = 2**int(np.ceil(np.log2(max(2*numSamples, 2))))
+            spectrum = sfft.rfft(timeSignal, nfft, axis=0,
+                                 **_fft_kwargs(workers))
+            responses = self.freq_responses(nfft, sigobj.precision)
+            output = np.empty((numSamples, numBands, timeSignal.shape[1]),
+                              dtype=realDtype)
+            chunk = max(_responseChunkBytes // spectrum.nbytes, 1)
+            for first in range(0, numBands, chunk):
+                bands = slice(first, first + chunk)
+                output[:, bands] = sfft.irfft(
+                    spectrum[:, None, :] * responses[:, bands, None], nfft,
+                    axis=0, **_fft_kwargs(workers))[:numSamples]
+            return output
+        sos = np.ascontiguousarray(self.sos.transpose(2, 0, 1))
+        # Zeros ahead of the signal keep the non-causal tails of the
+        # resampling filters from being cut at its start
+        padding = 32 * self.decimation.max() if self.multirate else 0
+        decimated = {1: np.pad(timeSignal, ((padding, 0), (0, 0)))}
+        x, last = decimated[1], 1
+        for factor in np.unique(self.decimation):
+            while last < factor:
+                x = ss.resample_poly(x, 1, 2, axis=0)
+                last *= 2
+            decimated[factor] = x
+
+        if self.multirate and not interpolate:
+            output = [None] * numBands
+        else:
+            output = np.empty((numSamples, numBands, timeSignal.shape[1]),
+                              dtype=realDtype)
+
+        def filter_band(k):
+            factor = self.decimation[k]
+            filtered = ss.sosfilt(sos[k], decimated[factor], axis=0)
+            if factor > 1 and interpolate:
+                filtered = ss.resample_poly(filtered, factor, 1, axis=0)
+                filtered = filtered[padding:padding+numSamples]
+            else:
+                filtered = filtered[padding//factor:]
+            if isinstance(output, list):
+                output[k] = filtered.astype(realDtype, copy=False)
+            else:
+                output[:, k, :] = filtered
+            return
+
+        if workers is None or workers < 2:
+            for k in range(numBands):
+                filter_band(k)
+        else:
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                list(pool.map(filter_band, range(numBands)))
+        return output
+
+    def filter(self, sigobj, workers: int = None):
         """
         Filter the signal object.
 
@@ -128,42 +417,100 @@ class OctFilter(FilterBase):
         Args:
             sigobj: SignalObj
 
+            workers: int, optional
+                Number of threads used to filter the bands, see `filter_bank`.
+
         Return:
             output: List
                 A list containing one SignalObj with the filtered data for each
                 channel in the original signalObj.
 
         """
-        if self.samplingRate != sigobj.samplingRate:
-            raise ValueError("SignalObj must have same sampling rate of filter to be filtered.")
-        n = self.sos.shape[2]
+        filtered = self.filter_bank(sigobj, workers)
         output = []
-        chl = []
         for ch in range(sigobj.numChannels):
-            sobj = sigobj[ch]
-            filtered = np.zeros((sobj.numSamples, n))
-            for k in range(n):
-                cContigousArray = sobj.timeSignal[:].copy(order='C')
-                filtered[:, k] = ss.sosfilt(self.sos[:, :, k].copy(order='C'),
-                                            cContigousArray,
-                                            axis=0).T
-                chl.append(copy(sobj.channels[sobj.channels.mapping[0]]))
+            chObj = sigobj.channels[sigobj.channels.mapping[ch]]
+            chl = []
+            for k in range(filtered.shape[1]):
+                chl.append(copy(chObj))
                 chl[-1].num = k+1
                 chl[-1].name = f'Band {k+1}'
                 chl[-1].code = f'B{k+1}'
-            signalDict = {'signalArray': filtered,
+            signalDict = {'signalArray': filtered[:, :, ch],
                           'domain': 'time',
                           'samplingRate': self.samplingRate,
                           'freqMin': sigobj.freqMin,
                           'freqMax': sigobj.freqMax,
+                          'precision': sigobj.precision,
                           }
-            out = SignalObj(**signalDict)
+            out = SignalObj.from_array(**signalDict)
             out.channels = ChannelsList(chl)
-            # out.timeSignal = out.timeSignal * out.channels.CFlist()
             output.append(out)
-            chl.clear()
         return output
 
+    def reset_state(self):
+        """Clear the filters' state kept across `process_block` calls."""
+        self._zi = None
+        return
+
+    def process_block(self, block: np.ndarray) -> np.ndarray:
+        """
+        Filter one block of a longer signal through all bands.
+
+        The second order sections' state of every band and channel is kept
+        between calls, so filtering consecutive blocks gives the same result as
+        filtering the whole signal at once, with constant memory usage. Call
+        `reset_state` before starting a new signal.
+
+        Only available for the single rate, 'time' domain, filter bank.
+
+        Args:
+            block: np.ndarray
+                Samples with shape (samples,) or (samples, channels), at the
+                filter's sampling rate. The number of channels must be the same
+                across calls.
+
+        Return:
+            output: np.ndarray
+                The filtered block with shape (samples, bands, channels).
+
+        """
+        if self.multirate or self.domain != 'time':
+            raise ValueError("Block processing is only available for the "
+                             + "single rate 'time' domain filter bank.")
+        block = np.asarray(block, dtype='float64')
+        if block.ndim == 1:
+            block = block[:, None]
+        numBands = self.sos.shape[2]
+        if self._zi is None:
+            self._zi = np.zeros((numBands, self.sos.shape[0], 2,
+                                 block.shape[1]))
+        elif self._zi.shape[3] != block.shape[1]:
+            raise ValueError("Block must have the same number of channels of "
+                             + "the previous ones.")
+        output = np.empty((block.shape[0], numBands, block.shape[1]))
+        for k in range(numBands):
+            output[:, k, :], self._zi[k] = ss.sosfilt(
+                self.sos[:, :, k].copy(order='C'), block, axis=0,
+                zi=self._zi[k])
+        return output
+
+    def process_blocks(self, blocks):
+        """
+        Generator version of `process_block`.
+
+        Filter each block yielded by `blocks`, which may be any iterable of
+        arrays, e.g. a chunked file reader or a queue fed by a streaming
+        callback, starting from a clean state.
+
+            >>> for bandsBlock in octFilter.process_blocks(reader):
+            >>>     ...
+
+        """
+        self.reset_state()
+        for block in blocks:
+            yield self.process_block(block)
+
 
 
 class AntiAliasingFilter(object):
@@ -197,8 +544,9 @@ class AntiAliasingFilter(object):
                           'domain': 'time',
                           'samplingRate': self.samplingRate,
                           'freqMin': self.band[0],
-                          'freqMax': self.band[1]}
-            output.append(SignalObj(**signalDict))
+                          'freqMax': self.band[1],
+                          'precision': signalObj.precision}
+            output.append(SignalObj.from_array(**signalDict))
         else:
             return output
 
@@ -58,6 +58,10 @@ class SignalObj(_base.PyTTaObj):
         * comment ('No comments.'), (str):
             some commentary about the signal or measurement object;
 
+        * precision (default.precision), (str):
+            'float32' or 'float64' floating point precision of the time
+            signal, with complex64 or complex128 spectra respectively;
+
 
     Attributes (default), (data type):
     -----------------------------------
@@ -142,9 +146,25 @@ class SignalObj(_base.PyTTaObj):
         * calib_pressure(refSignalObj,refPrms,refFreq):
             pressure calibration from an input SignalObj;
 
+        * segment(startTime, endTime):
+            new in memory SignalObj with the provided time interval;
+
+        * blocks(blockSamples):
+            iterates over the timeSignal in blocks of samples;
+
         * save_mat(filename):
             save a SignalObj to a .mat file;
             
+    Disk backed SignalObj:
+    -----------------------
+
+        Recordings larger than the memory can be kept in disc, in a
+        numpy.memmap or an h5py.Dataset, through SignalObj.from_disk(...).
+        Its samples are only read when needed: crop and channel selection
+        just narrow the window over the disc data, while blocks(...) and
+        segment(...) read the requested intervals. The spectra are only
+        calculated for the segments, unless freqSignal is accessed.
+
     For further information on methods see its specific documentation.
     
     """
@@ -154,11 +174,13 @@ class SignalObj(_base.PyTTaObj):
                  domain='time',
                  *args,
                  **kwargs):
+        precision = kwargs.pop('precision', default.precision)
+        realDtype, complexDtype = _precision_dtypes(precision)
         # Check if input is a complex array
         if True in np.iscomplex(signalArray):
-            dtype = 'complex64'
+            dtype = complexDtype
         else:
-            dtype = 'float32'
+            dtype = realDtype
         # Converting signalArray from list to np.array
         if isinstance(signalArray, list):
             signalArray = np.array(signalArray, dtype=dtype, ndmin=2).T
@@ -178,16 +200,21 @@ class SignalObj(_base.PyTTaObj):
             signalType = 'power'
             
         if domain == 'freq':
-            if 'numSamples' in kwargs:
-                self._numSamples = kwargs.pop('numSamples')
-            else:
+            # numSamples is set by the PyTTaObj initialization
+            if 'numSamples' not in kwargs:
                 # Consider the full signal has EVEN numSamples
                 halfSpectraNumSamples = len(signalArray)
-                # self._numSamples = halfSpectraNumSamples*2-1  # ODD
-                self._numSamples = (halfSpectraNumSamples-1)*2  # EVEN
+                # kwargs['numSamples'] = halfSpectraNumSamples*2-1  # ODD
+                kwargs['numSamples'] = (halfSpectraNumSamples-1)*2  # EVEN
 
         super().__init__(*args, **kwargs)
 
+        self._precision = precision
+        # Domains are synchronized on demand (see timeSignal/freqSignal)
+        self._timeDirty = False
+        self._freqDirty = False
+        self._timeVector = None
+        self._freqVector = None
         self.channels = _base.ChannelsList()
         self.signalType = signalType
         self.lengthDomain = domain
@@ -207,8 +234,96 @@ class SignalObj(_base.PyTTaObj):
 
         return
 
+    @classmethod
+    def from_disk(cls, source, samplingRate, **kwargs):
+        """
+        Create a disk backed SignalObj over a numpy.memmap or h5py.Dataset,
+        with the samples on its first axis and the channels on the second.
+
+            >>> data = np.memmap('recording.raw', dtype='float32', mode='r',
+            ...                  shape=(numSamples, numChannels))
+            >>> signal = pytta.SignalObj.from_disk(data, 48000)
+
+        The source must stay open while the SignalObj is used. Other keyword
+        arguments are passed to the SignalObj creation, e.g. signalType.
+
+        Accessing timeSignal reads the whole window from disc, except for
+        memmaps with the SignalObj precision, which are just viewed. Use blocks(...) or
+        segment(...) to work on parts of it.
+        """
+        signal = cls(samplingRate=samplingRate, **kwargs)
+        signal._adopt_time_signal(_DiskSignal(source))
+        return signal
+
+    @classmethod
+    def from_array(cls, signalArray, samplingRate, copy=False, domain='time',
+                   **kwargs):
+        """
+        Create a SignalObj adopting an already valid array, skipping the
+        complex values scan, shape guessing and copies of the usual creation.
+        Meant for filters, loaders and other code that makes many SignalObjs
+        from arrays it owns.
+
+            >>> bands = [pytta.SignalObj.from_array(data[:, :, ch], 48000)
+            ...          for ch in range(data.shape[2])]
+
+        The array must have the samples, or the frequency bins if domain is
+        'freq', on its first axis and the channels on the second. A 1D array
+        is a single channel. It is only copied if `copy` is True or if its
+        dtype differs from the SignalObj precision, otherwise changes on the
+        array are seen by the SignalObj. In-place operators on the SignalObj
+        copy it first, leaving the array untouched.
+
+        Other keyword arguments are passed to the SignalObj creation, e.g.
+        signalType, or numSamples for a spectrum of an odd length signal.
+        """
+        if domain not in ['time', 'freq']:
+            raise ValueError("domain must be 'time' or 'freq'.")
+        numSamples = kwargs.pop('numSamples', None)
+        signal = cls(samplingRate=samplingRate, **kwargs)
+        realDtype, complexDtype = _precision_dtypes(signal.precision)
+        dtype = complexDtype if domain == 'freq' else realDtype
+        if copy:
+            signalArray = np.array(signalArray, dtype=dtype)
+        else:
+            adopted = np.asarray(signalArray, dtype=dtype)
+            if adopted is signalArray:
+                # Not owned, so in-place operations copy it instead of
+                # changing the caller's array
+                adopted = adopted.view()
+            signalArray = adopted
+        if signalArray.ndim == 1:
+            signalArray = signalArray[:, None]
+        signal.lengthDomain = domain
+        if domain == 'freq':
+            if numSamples is not None:
+                signal._numSamples = numSamples
+            signal._adopt_freq_signal(signalArray)
+        else:
+            signal._adopt_time_signal(signalArray)
+        return signal
+
     # SignalObj Properties
 
+    @property
+    def precision(self):
+        """
+        Floating point precision, 'float32' or 'float64'. Setting it converts
+        the signal, in memory, to the new precision.
+        """
+        return self._precision
+
+    @precision.setter
+    def precision(self, newPrecision):
+        realDtype, complexDtype = _precision_dtypes(newPrecision)
+        self._precision = newPrecision
+        if not self._timeDirty and not self.diskBacked:
+            self._timeSignal = self._timeSignal.astype(realDtype, copy=False)
+        if not self._freqDirty:
+            self._freqSignal = self._freqSignal.astype(complexDtype,
+                                                       copy=False)
+        return
+
     @property
     def signalType(self):
         return self._signalType
@@ -227,52 +342,106 @@ class SignalObj(_base.PyTTaObj):
             if newSigType == self.signalType:
                 print("'signalType' is already '" + self.signalType + "'.")
             else:
+                # the time signal must be synchronized with the old
+                # normalization before the spectrum is invalidated
+                if self._timeDirty:
+                    self._ifft()
                 self._signalType = newSigType
-                self._fft()
+                self._freqDirty = True
         # for initialization purposes
         else:
             self._signalType = newSigType
 
     @property
     def timeVector(self):
+        if self._timeVector is None:
+            self._timeVector = np.linspace(0,
+                                           self.timeLength
+                                           - 1/self.samplingRate,
+                                           self.numSamples)
         return self._timeVector
 
     @property
     def freqVector(self):
+        if self._freqVector is None:
+            self._freqVector = np.fft.rfftfreq(n=self.numSamples,
+                                               d=1/self.samplingRate)
         return self._freqVector
 
     @property
     def timeSignal(self):
+        """
+        Return the time domain signal. Calculated from the spectrum only when
+        the latter was changed since the last access.
+        """
+        if self._timeDirty:
+            self._ifft()
+        if self.diskBacked:
+            return self._timeSignal.read(dtype=self.precision)
         return self._timeSignal
 
     @timeSignal.setter
     def timeSignal(self, newSignal):
         if isinstance(newSignal, np.ndarray):
+            realDtype, _ = _precision_dtypes(self.precision)
             if self.size_check(newSignal) == 1:
-                newSignal = np.array(newSignal, ndmin=2, dtype='float32')
+                newSignal = np.array(newSignal, ndmin=2, dtype=realDtype)
             if newSignal.shape[1] > newSignal.shape[0]:
                 newSignal = newSignal.T
-            self._timeSignal = np.array(newSignal, dtype='float32')
-            self._numSamples = len(self._timeSignal)  # [-] number of samples
-            self._fftDegree = np.log2(self._numSamples)  # [-] size parameter
-            self._timeLength = self.numSamples/self.samplingRate  # [s]
-            self._timeVector = np.linspace(0,
-                                           self.timeLength
-                                           - 1/self.samplingRate,
-                                           self.numSamples)
-            self._fft()
-            self.channels.conform_to(self)
+            self._adopt_time_signal(np.array(newSignal, dtype=realDtype))
         else:
             raise TypeError('Input array must be a numpy ndarray')
         return
 
+    def _adopt_time_signal(self, timeSignal):
+        """
+        Take a (numSamples, numChannels) array, with the SignalObj precision,
+        or a _DiskSignal as the time signal, updating the length attributes and invalidating the
+        spectrum.
+
+        Adopting the current array again, after writing on it in place,
+        also makes the channel views sharing it drop their spectra.
+        """
+        if timeSignal is getattr(self, '_timeSignal', None):
+            self._writes[0] += 1
+        else:
+            self._writes = [0]
+        self._seenWrites = self._writes[0]
+        self._timeSignal = timeSignal
+        self._numSamples = timeSignal.shape[0]  # [-] number of samples
+        self._fftDegree = np.log2(self._numSamples)  # [-] size parameter
+        self._timeLength = self.numSamples/self.samplingRate  # [s]
+        self._timeVector = None
+        self._freqVector = None
+        # spectrum is only calculated when freqSignal is accessed
+        self._timeDirty = False
+        self._freqDirty = True
+        self.channels.conform_to(self)
+        return
+
     @property
     def freqSignal(self):
         """
         Return half of the RMS spectrum. Normalized in case of a power signal.
+
+        Calculated from the time signal only when the latter was changed since
+        the last access.
         """
+        self._check_shared_writes()
+        if self._freqDirty:
+            self._fft()
         return self._freqSignal
 
+    def _check_shared_writes(self):
+        """
+        Invalidate the spectrum of a channel view if its parent wrote on the
+        shared samples in place since the spectrum was taken.
+        """
+        if self._writes[0] != self._seenWrites and not self._timeDirty:
+            self._seenWrites = self._writes[0]
+            self._freqDirty = True
+        return
+
     @freqSignal.setter
     def freqSignal(self, newSignal):
         if isinstance(newSignal, np.ndarray):
@@ -280,35 +449,49 @@ class SignalObj(_base.PyTTaObj):
                 newSignal = np.array(newSignal, ndmin=2)
             if newSignal.shape[1] > newSignal.shape[0]:
                 newSignal = newSignal.T
-            # Time numSamples was provided (or is default) at init or old
-            # signal was already here. Check if numSamples calculated
-            # according to half spectra matches the current numSamples.
-            halfSpectraNumSamples = len(newSignal)
-            if (halfSpectraNumSamples-1)*2 == self._numSamples:
-                timeSignalNumSamplesIs = "EVEN"
-            elif halfSpectraNumSamples*2-1 == self._numSamples:
-                timeSignalNumSamplesIs = "ODD"
-            else:
-                # Old numSamples don't match with provided half spectrum
-                # number of samples.
-                timeSignalNumSamplesIs = "UNKNOWN"  
-                
-            if timeSignalNumSamplesIs == "UNKNOWN":
-                # Consider full spectrum has even number of samples
-                # self._numSamples = halfSpectraNumSamples*2-1  # ODD
-                self._numSamples = (halfSpectraNumSamples-1)*2  # EVEN
-            
-            self._freqSignal = np.array(newSignal, dtype='complex64')                                   
-            self._fftDegree = np.log2(self.numSamples)  # [-] size parameter
-            self._timeLength = self.numSamples/self.samplingRate
-            self._freqVector = np.fft.rfftfreq(n=self.numSamples,
-                                               d=1/self.samplingRate)
-            self._ifft()
-            self.channels.conform_to(self)
+            _, complexDtype = _precision_dtypes(self.precision)
+            self._adopt_freq_signal(np.array(newSignal, dtype=complexDtype))
         else:
             raise TypeError('Input array must be a numpy ndarray')
         return
 
+    def _adopt_freq_signal(self, freqSignal):
+        """
+        Take a (bins, numChannels) array, with the SignalObj complex dtype, as
+        the RMS spectrum, updating the length attributes and invalidating the
+        time signal.
+        """
+        # Time numSamples was provided (or is default) at init or old
+        # signal was already here. Check if numSamples calculated
+        # according to half spectra matches the current numSamples.
+        halfSpectraNumSamples = len(freqSignal)
+        if (halfSpectraNumSamples-1)*2 == self._numSamples:
+            timeSignalNumSamplesIs = "EVEN"
+        elif halfSpectraNumSamples*2-1 == self._numSamples:
+            timeSignalNumSamplesIs = "ODD"
+        else:
+            # Old numSamples don't match with provided half spectrum
+            # number of samples.
+            timeSignalNumSamplesIs = "UNKNOWN"
+
+        if timeSignalNumSamplesIs == "UNKNOWN":
+            # Consider full spectrum has even number of samples
+            # self._numSamples = halfSpectraNumSamples*2-1  # ODD
+            self._numSamples = (halfSpectraNumSamples-1)*2  # EVEN
+
+        self._freqSignal = freqSignal
+        self._writes = [0]
+        self._seenWrites = 0
+        self._fftDegree = np.log2(self.numSamples)  # [-] size parameter
+        self._timeLength = self.numSamples/self.samplingRate
+        self._timeVector = None
+        self._freqVector = None
+        # time signal is only calculated when timeSignal is accessed
+        self._freqDirty = False
+        self._timeDirty = True
+        self.channels.conform_to(self)
+        return
+
     @property
     def coordinates(self):
         coords = []
@@ -323,10 +506,18 @@ class SignalObj(_base.PyTTaObj):
             orientations.append(self.channels[chNum].orientation)
         return orientations
 
+    @property
+    def diskBacked(self):
+        """If the time signal is read on demand from disc."""
+        return not self._timeDirty and \
+            isinstance(self._timeSignal, _DiskSignal)
+
     @property
     def numChannels(self):
+        # avoid triggering a transform just to count the channels
+        data = self._freqSignal if self._timeDirty else self._timeSignal
         try:
-            numChannels = self.timeSignal.shape[1]
+            numChannels = data.shape[1]
         except IndexError:
             numChannels = 1
         return numChannels
@@ -376,20 +567,9 @@ class SignalObj(_base.PyTTaObj):
             
         spltdChs = []
         
-        idx = 0;
-        for chNum in channels:
-            newSignal = SignalObj(self.timeSignal[:,indexes[idx]],
-                                  domain='time',
-                                  samplingRate=self.samplingRate,
-                                  freqMin=self.freqMin,
-                                  freqMax=self.freqMax,
-                                  comment=self.comment)
-            newSignal.channels[1] = self.channels[chNum]
-            
-            spltdChs.append(newSignal)
-            
-            idx += 1
-                    
+        for idx in indexes:
+            spltdChs.append(self._channel_view(idx))
+
         return spltdChs
 
     def crop(self, startTime, endTime):
@@ -406,13 +586,77 @@ class SignalObj(_base.PyTTaObj):
                             "'end'.")
         if isinstance(endTime, str):
             if endTime == 'end':
-                endTime = self.timeVector[-1]
+                endTime = self.timeLength - 1/self.samplingRate
             else:
                 raise TypeError("'endTime' must be int, float or " +
                                 "'end'.")
-        endIdx = np.where(self.timeVector >= endTime)[0][0]
-        startIdx = np.where(self.timeVector >= startTime)[0][0]
-        self.timeSignal = self.timeSignal[startIdx:endIdx,:]
+        startIdx, endIdx = self._time_indexes(startTime, endTime)
+        if self.diskBacked:
+            self._adopt_time_signal(self._timeSignal.window(startIdx, endIdx))
+        else:
+            self.timeSignal = self.timeSignal[startIdx:endIdx,:]
+
+    def _time_indexes(self, startTime, endTime):
+        """
+        Indexes of the first timeVector values not below startTime and
+        endTime.
+        """
+        if not self.diskBacked:
+            endIdx = np.where(self.timeVector >= endTime)[0][0]
+            startIdx = np.where(self.timeVector >= startTime)[0][0]
+            return startIdx, endIdx
+        # Same values as timeVector's linspace, without allocating it
+        stop = self.timeLength - 1/self.samplingRate
+        step = stop/(self.numSamples - 1)
+        indexes = []
+        for time in (startTime, endTime):
+            if time > stop:
+                raise IndexError("Time out of the signal's timeVector.")
+            idx = max(int(np.ceil(time/step)) - 1, 0)
+            while idx < self.numSamples - 1 and idx*step < time:
+                idx += 1
+            indexes.append(idx)
+        return indexes
+
+    def segment(self, startTime, endTime):
+        """
+        New in memory SignalObj with the samples in the interval from
+        startTime to endTime, as in crop(...). Only this interval is read from
+        disc in case of a disk backed SignalObj, so its spectrum is computed
+        just for the segment.
+
+        :param startTime: segment start time
+        :type startTime: int, float
+        :param endTime: segment end time
+        :type endTime: int, float
+        :return: the segment
+        :rtype: SignalObj
+        """
+        startIdx, endIdx = self._time_indexes(startTime, endTime)
+        if self.diskBacked:
+            block = self._timeSignal.read(startIdx, endIdx, self.precision)
+        else:
+            block = self.timeSignal[startIdx:endIdx]
+        segment = cp.copy(self)
+        segment.channels = cp.deepcopy(self.channels)
+        segment._adopt_time_signal(np.array(block, dtype=self.precision))
+        return segment
+
+    def blocks(self, blockSamples):
+        """
+        Iterate over the time signal in (blockSamples, numChannels) arrays,
+        the last one possibly shorter. Each block is only read from disc when
+        reached in case of a disk backed SignalObj.
+
+        :param blockSamples: number of samples of each block
+        :type blockSamples: int
+        """
+        for start in range(0, self.numSamples, blockSamples):
+            stop = min(start + blockSamples, self.numSamples)
+            if self.diskBacked:
+                yield self._timeSignal.read(start, stop, self.precision)
+            else:
+                yield self.timeSignal[start:stop]
 
     def mean(self):
         print('DEPRECATED! This method will be renamed to',
@@ -427,9 +671,10 @@ class SignalObj(_base.PyTTaObj):
         """
         print('New method name in version 0.1.0!',
               'Remember to review your code.')
-        return SignalObj(signalArray=np.mean(self.timeSignal, axis=1,
-                                             dtype=self.timeSignal.dtype),
-                         lengthDomain='time', samplingRate=self.samplingRate)
+        return SignalObj.from_array(np.mean(self.timeSignal, axis=1,
+                                            dtype=self.timeSignal.dtype),
+                                    self.samplingRate,
+                                    precision=self.precision)
 
 
     def max_level(self):
@@ -824,10 +1069,11 @@ class SignalObj(_base.PyTTaObj):
         if chIndex in range(self.numChannels):
             chNum = self.channels.mapping[chIndex]
             self.channels[chNum].calib_volt(refSignalObj, refVrms, refFreq)
-            self.timeSignal[:, chIndex] = self.timeSignal[:, chIndex]\
+            timeSignal = self._writable_time_signal()
+            timeSignal[:, chIndex] = timeSignal[:, chIndex]\
                 * self.channels[chNum].CF
+            self._adopt_time_signal(timeSignal)
             self.channels[chNum].calibCheck = True
-            self._fft()
         else:
             raise IndexError('chIndex greater than channels number')
         return
@@ -861,10 +1107,11 @@ class SignalObj(_base.PyTTaObj):
         if chIndex in range(self.numChannels):
             chNum = self.channels.mapping[chIndex]
             self.channels[chNum].calib_press(refSignalObj, refPrms, refFreq)
-            self.timeSignal[:, chIndex] = self.timeSignal[:, chIndex]\
+            timeSignal = self._writable_time_signal()
+            timeSignal[:, chIndex] = timeSignal[:, chIndex]\
                 * self.channels[chNum].CF
+            self._adopt_time_signal(timeSignal)
             self.channels[chNum].calibCheck = True
-            self._fft()
         else:
             raise IndexError('chIndex greater than channels number')
         return
@@ -901,10 +1148,64 @@ class SignalObj(_base.PyTTaObj):
         h5group.attrs['class'] = 'SignalObj'
         h5group.attrs['channels'] = repr(self.channels)
         h5group.attrs['signalType'] = _h5.attr_parser(self.signalType)
+        h5group.attrs['precision'] = self.precision
         h5group['timeSignal'] = self.timeSignal
         super()._h5_save(h5group)
         pass
 
+    def _operand_signal_type(self, other):
+        """
+        Check if `other` SignalObj can operate with this one, with the same
+        sampling rate and the same number of channels or a single channel on
+        either side, and return the resulting signalType.
+        """
+        if other.samplingRate != self.samplingRate:
+            raise TypeError("Both SignalObj must have the same sampling rate.")
+        if self.numChannels > 1 and other.numChannels > 1 \
+                and other.numChannels != self.numChannels:
+            raise ValueError("Both signal-like objects must have the same " +
+                             "number of channels, or one of them a single " +
+                             "channel.")
+        if other.signalType == 'energy' or self.signalType == 'energy':
+            return 'energy'
+        return 'power'
+
+    def _operation_result(self, signalArray, domain, signalType, channels):
+        """New SignalObj with the result of an operation on this one."""
+        kwargs = {'numSamples': self.numSamples} if domain == 'freq' else {}
+        result = SignalObj.from_array(signalArray, cp.copy(self.samplingRate),
+                                      domain=domain,
+                                      freqMin=cp.copy(self.freqMin),
+                                      freqMax=cp.copy(self.freqMax),
+                                      signalType=signalType,
+                                      precision=self.precision,
+                                      **kwargs)
+        result.channels = channels
+        result.channels.conform_to(result)
+        return result
+
+    def _spectra_product(self, other, divide=False):
+        """
+        Product, or quotient, of the peak scaled spectra of both SignalObjs,
+        broadcasting a single channel over the other's channels, returned
+        RMS scaled.
+        """
+        spectra = _make_pk_spectra(self.freqSignal)
+        otherSpectra = _make_pk_spectra(other.freqSignal)
+        if divide:
+            with np.errstate(divide='ignore', invalid='ignore'):
+                spectra = np.divide(spectra, otherSpectra,
+                                    out=spectra if spectra.shape[1]
+                                    >= otherSpectra.shape[1] else None)
+            spectra[np.isinf(spectra)] = 0
+            spectra[np.isnan(spectra)] = 0
+        else:
+            spectra = np.multiply(spectra, otherSpectra,
+                                  out=spectra if spectra.shape[1]
+                                  >= otherSpectra.shape[1] else None)
+            spectra[np.isinf(spectra)] = 0
+        return _make_rms_spectra(spectra, out=spectra)
+
     def __truediv__(self, other):
         """
         Frequency domain division method
@@ -912,50 +1213,15 @@ class SignalObj(_base.PyTTaObj):
         For deconvolution divide by a SignalObj.
         For gain operation divide by a number.
         """
-        if type(other) == type(self):
-            if other.samplingRate != self.samplingRate:
-                raise TypeError("Both SignalObj must have the same sampling rate.")
-            currentFreqSignal = _make_pk_spectra(self.freqSignal)
-            otherFreqSignal = _make_pk_spectra(other.freqSignal)
-            result = SignalObj(np.zeros(self.timeSignal.shape),
-                               samplingRate=cp.copy(self.samplingRate),
-                               freqMin=cp.copy(self.freqMin),
-                               freqMax=cp.copy(self.freqMax),
-                               signalType='energy')
-            result.channels = cp.deepcopy(self.channels)
-            if self.numChannels > 1:
-                if other.numChannels > 1:
-                    if other.numChannels != self.numChannels:
-                        raise ValueError("Both signal-like objects must have the \
-                                        same number of channels.")
-                    result_freqSignal = np.zeros(self.freqSignal.shape,
-                                                dtype=np.complex_)
-                    for channel in range(other.numChannels):
-                        result_freqSignal[:, channel] = \
-                            currentFreqSignal[:, channel] \
-                            / otherFreqSignal[:, channel]
-                else:
-                    result_freqSignal = np.zeros(self.freqSignal.shape,
-                                                dtype=np.complex_)
-                    for channel in range(self.numChannels):
-                        result_freqSignal[:, channel] = \
-                            currentFreqSignal[:, channel] \
-                            / otherFreqSignal[:, 0]
-            else:
-                result_freqSignal = currentFreqSignal / otherFreqSignal
-            result_freqSignal[np.isinf(result_freqSignal)] = 0
-            result_freqSignal[np.isnan(result_freqSignal)] = 0
-            result.freqSignal = _make_rms_spectra(result_freqSignal)
-            result.channels = self.channels / other.channels
-        elif type(other) == float or type(other) == int:
-            result = SignalObj(np.zeros(self.timeSignal.shape),
-                               samplingRate=cp.copy(self.samplingRate),
-                               freqMin=cp.copy(self.freqMin),
-                               freqMax=cp.copy(self.freqMax),
-                               signalType='energy')
-            result.channels = cp.deepcopy(self.channels)
-            result.timeSignal = self.timeSignal / other
-
+        if isinstance(other, SignalObj):
+            self._operand_signal_type(other)
+            result = self._operation_result(
+                self._spectra_product(other, divide=True), 'freq', 'energy',
+                self.channels / other.channels)
+        elif isinstance(other, (float, int)):
+            result = self._operation_result(self.timeSignal / other, 'time',
+                                            'energy',
+                                            cp.deepcopy(self.channels))
         else:
             raise TypeError("A SignalObj can operate with other alike or a " +
                             "number in case of a gain operation.")
@@ -965,128 +1231,110 @@ class SignalObj(_base.PyTTaObj):
         """
         Gain apply method/FFT convolution
         """
-        if type(other) == type(self):
-            if other.samplingRate != self.samplingRate:
-                raise TypeError("Both SignalObj must have the same sampling rate.")
-            if other.signalType == 'energy' or self.signalType == 'energy':
-                signalType = 'energy'
-            else:
-                signalType = 'power'
-            currentFreqSignal = _make_pk_spectra(self.freqSignal)
-            otherFreqSignal = _make_pk_spectra(other.freqSignal)
-            result = SignalObj(np.zeros(self.timeSignal.shape),
-                            samplingRate=cp.copy(self.samplingRate),
-                            freqMin=cp.copy(self.freqMin),
-                            freqMax=cp.copy(self.freqMax),
-                            signalType=signalType)
-            result.channels = cp.deepcopy(self.channels)
-            if self.numChannels > 1:
-                if other.numChannels > 1:
-                    if other.numChannels != self.numChannels:
-                        raise ValueError("Both signal-like objects must have the \
-                                        same number of channels.")
-                    result_freqSignal = np.zeros(self.freqSignal.shape,
-                                                dtype=np.complex_)
-                    for channel in range(other.numChannels):
-                        result_freqSignal[:, channel] = \
-                            currentFreqSignal[:, channel] \
-                            * otherFreqSignal[:, channel]
-                else:
-                    result_freqSignal = np.zeros(self.freqSignal.shape,
-                                                dtype=np.complex_)
-                    for channel in range(self.numChannels):
-                        result_freqSignal[:, channel] = \
-                            currentFreqSignal[:, channel] \
-                            * otherFreqSignal[:, 0]
-            else:
-                result_freqSignal = currentFreqSignal * otherFreqSignal
-            result_freqSignal[np.isinf(result_freqSignal)] = 0
-            result.freqSignal = _make_rms_spectra(result_freqSignal)
-            result.channels = self.channels * other.channels
-        elif type(other) == float or type(other) == int:
-            result = SignalObj(np.zeros(self.timeSignal.shape),
-                            samplingRate=cp.copy(self.samplingRate),
-                            freqMin=cp.copy(self.freqMin),
-                            freqMax=cp.copy(self.freqMax),
-                            signalType=cp.copy(self.signalType))
-            result.timeSignal = self.timeSignal * other
-            result.channels = cp.deepcopy(self.channels)
+        if isinstance(other, SignalObj):
+            signalType = self._operand_signal_type(other)
+            result = self._operation_result(self._spectra_product(other),
+                                            'freq', signalType,
+                                            self.channels * other.channels)
+        elif isinstance(other, (float, int)):
+            result = self._operation_result(self.timeSignal * other, 'time',
+                                            cp.copy(self.signalType),
+                                            cp.deepcopy(self.channels))
         else:
             raise TypeError("A SignalObj can operate with other alike or a " +
                             "number in case of a gain operation.")
         return result
 
-    def __add__(self, other):
+    def __imul__(self, other):
         """
-        Time domain addition method
+        In-place gain apply/FFT convolution, see __mul__. A single channel
+        SignalObj may be applied to all channels, but the number of channels
+        can not grow.
         """
-        if other.signalType == 'energy' or self.signalType == 'energy':
-            signalType = 'energy'
-        else:
-            signalType = 'power'
-        result = SignalObj(np.zeros(self.timeSignal.shape),
-                        samplingRate=cp.copy(self.samplingRate),
-                        freqMin=cp.copy(self.freqMin),
-                        freqMax=cp.copy(self.freqMax),
-                        signalType=signalType)
-        result.channels = cp.deepcopy(self.channels)
         if isinstance(other, SignalObj):
-            if other.samplingRate != self.samplingRate:
-                raise TypeError("Both SignalObj must have the same sampling rate.")
-            if self.numChannels > 1:
-                if other.numChannels > 1:
-                    if other.numChannels != self.numChannels:
-                        raise ValueError("Both signal-like objects must have\
-                                        the same number of channels.")
-                    for channel in range(other.numChannels):
-                        result.timeSignal = self._timeSignal[:, channel]\
-                            + other._timeSignal[:, channel]
-                else:
-                    for channel in range(other.numChannels):
-                        result.timeSignal = self._timeSignal[:, channel]\
-                            + other._timeSignal
-            else:
-                result.timeSignal = self._timeSignal + other._timeSignal
+            signalType = self._operand_signal_type(other)
+            spectra = _make_pk_spectra(self.freqSignal)
+            np.multiply(spectra, _make_pk_spectra(other.freqSignal),
+                        out=spectra)
+            spectra[np.isinf(spectra)] = 0
+            self._freqSignal = _make_rms_spectra(spectra, out=spectra)
+            self._signalType = signalType
+            self._timeDirty = True
+            self.channels = self.channels * other.channels
         elif isinstance(other, (float, int)):
-            result.timeSignal = self._timeSignal + other
+            # Both synchronized domains take the gain, no transform needed
+            if self._freqDirty:
+                freqSignal = None
+            else:
+                freqSignal = self._freqSignal * other
+            if not self._timeDirty:
+                timeSignal = self._writable_time_signal()
+                timeSignal *= other
+                self._adopt_time_signal(timeSignal)
+            if freqSignal is not None:
+                self._freqSignal = freqSignal
+                self._freqDirty = False
         else:
-            raise TypeError("A SignalObj can only operate with other alike, " +
-                            "int, or float.")
-        return result
+            raise TypeError("A SignalObj can operate with other alike or a " +
+                            "number in case of a gain operation.")
+        return self
+
+    def __add__(self, other):
+        """
+        Time domain addition method
+        """
+        return self._time_operation(other, np.add)
+
+    def __iadd__(self, other):
+        """
+        In-place time domain addition, e.g. to accumulate takes before
+        averaging. The number of channels can not grow.
+        """
+        return self._time_operation(other, np.add, inPlace=True)
 
     def __sub__(self, other):
         """
         Time domain subtraction method
         """
-        if type(other) != type(self):
-            raise TypeError("A SignalObj can only operate with other alike.")
-        if other.samplingRate != self.samplingRate:
-            raise TypeError("Both SignalObj must have the same sampling rate.")
-        if other.signalType == 'energy' or self.signalType == 'energy':
-            signalType = 'energy'
-        else:
-            signalType = 'power'
-        result = SignalObj(np.zeros(self.timeSignal.shape),
-                        samplingRate=cp.copy(self.samplingRate),
-                        freqMin=cp.copy(self.freqMin),
-                        freqMax=cp.copy(self.freqMax),
-                        signalType=signalType)
-        result.channels = cp.deepcopy(self.channels)
-        if self.numChannels > 1:
-            if other.numChannels > 1:
-                if other.numChannels != self.numChannels:
-                    raise ValueError("Both signal-like objects must have\
-                                     the same number of channels.")
-                for channel in range(other.numChannels):
-                    result.timeSignal = self._timeSignal[:, channel]\
-                        - other._timeSignal[:, channel]
-            else:
-                for channel in range(other.numChannels):
-                    result.timeSignal = self._timeSignal[:, channel]\
-                        - other._timeSignal
+        return self._time_operation(other, np.subtract)
+
+    def _time_operation(self, other, operation, inPlace=False):
+        """
+        Apply the `operation` ufunc between the time signals, broadcasting a
+        single channel over the other's channels, or with a number.
+        """
+        if isinstance(other, SignalObj):
+            signalType = self._operand_signal_type(other)
+            operand = other.timeSignal
+        elif isinstance(other, (float, int)):
+            signalType = self.signalType
+            operand = other
         else:
-            result.timeSignal = self._timeSignal - other._timeSignal
-        return result
+            raise TypeError("A SignalObj can only operate with other alike, " +
+                            "int, or float.")
+        if not inPlace:
+            return self._operation_result(operation(self.timeSignal, operand),
+                                          'time', signalType,
+                                          cp.deepcopy(self.channels))
+        timeSignal = self._writable_time_signal()
+        operation(timeSignal, operand, out=timeSignal)
+        if signalType != self.signalType:
+            self.signalType = signalType
+        self._adopt_time_signal(timeSignal)
+        return self
+
+    def _writable_time_signal(self):
+        """
+        Time signal that may be changed in-place. It is a copy if the samples
+        are read from disk, or are not owned by this SignalObj, e.g. a
+        channel view or an array adopted by from_array, so no other object
+        sees the change.
+        """
+        timeSignal = self.timeSignal
+        if self.diskBacked or not timeSignal.flags.owndata \
+                or not timeSignal.flags.writeable:
+            return np.array(timeSignal)
+        return timeSignal
 
     def __repr__(self):
         return (f'{self.__class__.__name__}('
@@ -1097,14 +1345,45 @@ class SignalObj(_base.PyTTaObj):
                 f'comment={self.comment!r})')
 
     def __getitem__(self, key):
-        if key > self.numChannels:
+        """
+        One channel SignalObj sharing the data of the channel index `key`.
+
+        No data is copied. The returned object's samples and spectra are
+        read-only, its in-place operators and calibrations copy them first,
+        and assigning a new timeSignal or freqSignal breaks the link. This
+        SignalObj stays writeable, and its in-place operators and
+        calibrations make the views recalculate their spectra.
+        """
+        if key >= self.numChannels:
             raise IndexError("Index out of bounds.")
         elif key < 0:
             key += self.numChannels
-        ret = SignalObj(self.timeSignal[:, key], 'time', self.samplingRate)
-        chnum = self.channels.mapping[key]
-        ret.channels[1] = self.channels[chnum]
-        return ret
+        return self._channel_view(key)
+
+    def _channel_view(self, index):
+        """
+        Create a one channel SignalObj holding a strided view of the channel
+        at `index`, without copies, transforms or the initialization checks.
+
+        Spectra are shared when already calculated, otherwise they are
+        derived on demand by the new object. The view's arrays are read-only,
+        see __getitem__.
+        """
+        self._check_shared_writes()
+        view = cp.copy(self)
+        if self._timeDirty:
+            view._timeSignal = None
+        elif self.diskBacked:
+            view._timeSignal = self._timeSignal.window(channels=[index])
+        else:
+            view._timeSignal = _read_only(self._timeSignal[:, index:index+1])
+        if self._freqDirty:
+            view._freqSignal = None
+        else:
+            view._freqSignal = _read_only(self._freqSignal[:, index:index+1])
+        chNum = self.channels.mapping[index]
+        view.channels = _base.ChannelsList(self.channels[chNum])
+        return view
 
     def _fft(self):
         """fft do the transformation to the frequency domain of the current
@@ -1112,17 +1391,16 @@ class SignalObj(_base.PyTTaObj):
         """
         # FFT
         newFreqSignal = \
-            np.fft.rfft(self._timeSignal, axis=0, norm=None)
+            np.fft.rfft(self.timeSignal, axis=0, norm=None)
         # turning peak amplitude into RMS amplitude
-        newFreqSignal = _make_rms_spectra(newFreqSignal)
+        _make_rms_spectra(newFreqSignal, out=newFreqSignal)
         # spectrum normalization
         if self.signalType == 'power':
             newFreqSignal /= len(newFreqSignal)
         # assign new freq signal
-        self._freqSignal = newFreqSignal
-        # frequency vector (x axis)
-        self._freqVector = np.fft.rfftfreq(n=self.numSamples,
-                                           d=1/self.samplingRate)
+        _, complexDtype = _precision_dtypes(self.precision)
+        self._freqSignal = newFreqSignal.astype(complexDtype, copy=False)
+        self._freqDirty = False
         return
 
     def _ifft(self):
@@ -1132,21 +1410,19 @@ class SignalObj(_base.PyTTaObj):
         # spectrum denormalization
         if self.signalType == 'power':
             adjustedFreqSignal = \
-                self._freqSignal*len(self._freqSignal)
+                self.freqSignal*len(self.freqSignal)
+            # turning RMS amplitude into peak amplitude except DC freq
+            _make_pk_spectra(adjustedFreqSignal, out=adjustedFreqSignal)
         else:
-            adjustedFreqSignal = self._freqSignal
-        # turning RMS amplitude into peak amplitude except DC freq
-        adjustedFreqSignal = _make_pk_spectra(adjustedFreqSignal)
+            adjustedFreqSignal = _make_pk_spectra(self.freqSignal)
         # IFFT
         self._timeSignal = \
             np.array(np.fft.irfft(adjustedFreqSignal,
                                   n=self.numSamples, axis=0, norm=None),
-                    dtype='float32')
-        # time vector (x axis)
-        self._timeVector = np.linspace(0,
-                                       self.timeLength
-                                       - 1/self.samplingRate,
-                                       self.numSamples)
+                    dtype=self.precision)
+        self._writes = [0]
+        self._seenWrites = 0
+        self._timeDirty = False
         return
 
 
@@ -1425,11 +1701,12 @@ class ImpulsiveResponse(_base.PyTTaObj):
                             * 1/2
                 C = np.conj(data) / \
                     (np.conj(data)*data + eps)
-                C = _make_rms_spectra(C)
+                _make_rms_spectra(C, out=C)
                 C = SignalObj(C,
                               'freq',
                               inputSignal.samplingRate,
-                              signalType='energy')
+                              signalType='energy',
+                              precision=outputSignal.precision)
                 result = outputSignal * C
             else:
                 result = outputSignal / inputSignal
@@ -1445,7 +1722,8 @@ class ImpulsiveResponse(_base.PyTTaObj):
                                          outputSignal.freqSignal.shape[1])),
                                domain='freq',
                                samplingRate=inputSignal.samplingRate,
-                               signalType='energy')
+                               signalType='energy',
+                               precision=outputSignal.precision)
             if outputSignal.numChannels > 1:
                 if inputSignal.numChannels > 1:
                     if inputSignal.numChannels\
@@ -1485,7 +1763,8 @@ class ImpulsiveResponse(_base.PyTTaObj):
             if overlap is None:
                 overlap = 0.5
             result = SignalObj(samplingRate=inputSignal.samplingRate,
-                               signalType='energy')
+                               signalType='energy',
+                               precision=outputSignal.precision)
             result.domain = 'freq'
             if outputSignal.numChannels > 1:
                 if inputSignal.numChannels > 1:
@@ -1525,7 +1804,8 @@ class ImpulsiveResponse(_base.PyTTaObj):
             if overlap is None:
                 overlap = 0.5
             result = SignalObj(samplingRate=inputSignal.samplingRate,
-                               signalType='energy')
+                               signalType='energy',
+                               precision=outputSignal.precision)
             result.domain = 'freq'
             if outputSignal.numChannels > 1:
                 if inputSignal.numChannels > 1:
@@ -1626,16 +1906,95 @@ class ImpulsiveResponse(_base.PyTTaObj):
         return S12, S11
 
 
-def _make_rms_spectra(freqSignal):
-    newFreqSignal = np.zeros(freqSignal.shape, dtype=np.complex_)
-    newFreqSignal[:,:] = freqSignal / 2**(1/2)
-    newFreqSignal[0,:] = freqSignal[0,:] * 2**(1/2)
-    return newFreqSignal
+class _DiskSignal(object):
+    """
+    Window over the (numSamples, numChannels) samples of a numpy.memmap or
+    h5py.Dataset, read as floating point arrays only on request.
+    """
+
+    def __init__(self, source, start=0, stop=None, channels=None):
+        self.source = source
+        self.start = start
+        self.stop = source.shape[0] if stop is None else stop
+        if channels is None:
+            channels = range(1 if len(source.shape) == 1 else source.shape[1])
+        self.channels = list(channels)
+
+    @property
+    def shape(self):
+        return (self.stop - self.start, len(self.channels))
+
+    def window(self, start=0, stop=None, channels=None):
+        """Narrower window, with start, stop and channels relative to it."""
+        stop = self.shape[0] if stop is None else stop
+        if channels is not None:
+            channels = [self.channels[ch] for ch in channels]
+        return _DiskSignal(self.source, self.start + start, self.start + stop,
+                           channels)
+
+    def read(self, start=0, stop=None, dtype='float32'):
+        """Samples from start to stop. Memmaps of dtype are not copied."""
+        stop = self.shape[0] if stop is None else stop
+        rows = slice(self.start + start, self.start + stop)
+        if len(self.source.shape) == 1:
+            block = self.source[rows][:, None]
+        else:
+            first = min(self.channels)
+            last = max(self.channels) + 1
+            block = self.source[rows, first:last]
+            if self.channels != list(range(first, last)):
+                block = block[:, [ch - first for ch in self.channels]]
+        return np.asarray(block, dtype=dtype)
+
+    def __array__(self, dtype=None):
+        return self.read(dtype='float32' if dtype is None else dtype)
+
 
+def _read_only(array):
+    """Read-only view of `array`, leaving the array itself writeable."""
+    view = array.view()
+    view.flags.writeable = False
+    return view
 
-def _make_pk_spectra(freqSignal):
-    newFreqSignal = np.zeros(freqSignal.shape, dtype=np.complex_)
-    newFreqSignal[:,:] = freqSignal * 2**(1/2)
-    newFreqSignal[0,:] = freqSignal[0,:] / 2**(1/2)
-    return newFreqSignal
+
+def _precision_dtypes(precision):
+    """Real and complex dtypes of a 'float32' or 'float64' precision."""
+    if precision == 'float32':
+        return np.dtype('float32'), np.dtype('complex64')
+    elif precision == 'float64':
+        return np.dtype('float64'), np.dtype('complex128')
+    raise ValueError("precision must be 'float32' or 'float64'.")
+
+
+_SQRT2 = 2**(1/2)
+
+
+def _spectra_out(freqSignal, out):
+    if out is None:
+        out = np.empty(freqSignal.shape,
+                       dtype=np.result_type(freqSignal, np.complex64))
+    return out
+
+
+def _make_rms_spectra(freqSignal, out=None):
+    """
+    RMS amplitude spectra from peak amplitude ones. SignalObj.freqSignal is
+    always RMS scaled, the peak scaled spectra only exist inside the FFTs and
+    the frequency domain operations.
+
+    The result is written on `out`, which may be `freqSignal` itself for an
+    in-place scaling, or on a new array if it is None.
+    """
+    out = _spectra_out(freqSignal, out)
+    np.divide(freqSignal[1:], _SQRT2, out=out[1:])
+    np.multiply(freqSignal[:1], _SQRT2, out=out[:1])
+    return out
+
+
+def _make_pk_spectra(freqSignal, out=None):
+    """Peak amplitude spectra from RMS amplitude ones, see _make_rms_spectra."""
+    out = _spectra_out(freqSignal, out)
+    np.multiply(freqSignal[1:], _SQRT2, out=out[1:])
+    np.divide(freqSignal[:1], _SQRT2, out=out[:1])
+    return out
 
@@ -42,7 +42,7 @@ import h5py
 from typing import Union, List
 from pytta.classes import SignalObj, ImpulsiveResponse, \
                     RecMeasure, PlayRecMeasure, FRFMeasure, \
-                    Analysis, OctFilter
+                    Analysis, AnalysisSet, OctFilter
 from pytta.classes._base import ChannelsList, ChannelObj
 from pytta.generate import measurement  # TODO: Change to class instantiation.
 from pytta import _h5utils as _h5
@@ -110,7 +110,7 @@ def read_wav(fileName):
         data = data/(2**15)
     if data.dtype == 'int32':
         data = data/(2**31)
-    signal = SignalObj(data, 'time', samplingRate=samplingRate)
+    signal = SignalObj.from_array(data, samplingRate)
     return signal
 
 
@@ -868,7 +868,8 @@ def __h5_pack(rootH5Group, pObj, objDesc):
                          RecMeasure,
                          PlayRecMeasure,
                          FRFMeasure,
-                         Analysis)):
+                         Analysis,
+                         AnalysisSet)):
         # Creation name
         if isinstance(objDesc, str):
             creationName = objDesc
@@ -1013,14 +1014,18 @@ def __h5_unpack(objH5Group):
             signalType = _h5.attr_parser(objH5Group.attrs['signalType'])
         else:
             signalType = 'power'
+        if 'precision' in objH5Group.attrs:
+            precision = objH5Group.attrs['precision']
+        else:
+            precision = 'float32'
         # Creating and conforming SignalObj
-        SigObj = SignalObj(signalArray=np.array(objH5Group['timeSignal']),
-                           domain='time',
-                           signalType=signalType,
-                           samplingRate=samplingRate,
-                           freqMin=freqMin,
-                           freqMax=freqMax,
-                           comment=comment)
+        SigObj = SignalObj.from_array(objH5Group['timeSignal'][()],
+                                      samplingRate,
+                                      signalType=signalType,
+                                      precision=precision,
+                                      freqMin=freqMin,
+                                      freqMax=freqMax,
+                                      comment=comment)
         SigObj.channels = channels
         SigObj.lengthDomain = lengthDomain
         return SigObj
@@ -1170,6 +1175,27 @@ def __h5_unpack(objH5Group):
                             title=title)
         return anObject
 
+    elif objH5Group.attrs['class'] == 'AnalysisSet':
+        # AnalysisSet attrs unpacking
+        anType = _h5.attr_parser(objH5Group.attrs['anType'])
+        nthOct = _h5.attr_parser(objH5Group.attrs['nthOct'])
+        minBand = _h5.attr_parser(objH5Group.attrs['minBand'])
+        maxBand = _h5.attr_parser(objH5Group.attrs['maxBand'])
+        comment = _h5.attr_parser(objH5Group.attrs['comment'])
+        dataLabels = json.loads(objH5Group.attrs['dataLabels'])
+        tags = json.loads(objH5Group.attrs['tags'])
+        # All the items data in a single dataset
+        data = np.array(objH5Group['data'])
+        anSetObject = AnalysisSet(anType=anType,
+                                  nthOct=nthOct,
+                                  minBand=minBand,
+                                  maxBand=maxBand,
+                                  data=data,
+                                  tags=tags,
+                                  dataLabels=dataLabels,
+                                  comment=comment)
+        return anSetObject
+
     elif objH5Group.attrs['class'] == 'dict':
         dictObj = {}
         for PyTTaObjName, PyTTaObjH5Group in objH5Group.items():
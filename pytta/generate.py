@@ -799,7 +799,10 @@ def octfilter(order: int = 4,
               minFreq: float = 20,
               maxFreq: float = 20000,
               refFreq: float = 1000,
-              base: int = 10) -> _OctFilter:
+              base: int = 10,
+              multirate: bool = False,
+              domain: str = 'time',
+              phase: str = 'zero') -> _OctFilter:
     # Code snippet to guarantee that generated object name is
     # the declared at global scope
     # for frame, line in traceback.walk_stack(None):
@@ -817,6 +820,6 @@ def octfilter(order: int = 4,
     creation_name = extracted_text[3].split("=")[0].strip()
 
     of = _OctFilter(order, nthOct, samplingRate, minFreq,
-                   maxFreq, refFreq, base)
+                   maxFreq, refFreq, base, multirate, domain, phase)
     of.creation_name = creation_name
     return of
@@ -42,7 +42,8 @@ import copy as cp
 from warnings import warn
 
 
-def G_Lpe(IR, nthOct, minFreq, maxFreq, IREndManualCut=None):
+def G_Lpe(IR, nthOct, minFreq, maxFreq, IREndManualCut=None,
+          filterDomain='time'):
     """
     Calculate the energy level from the room impulsive response.
 
@@ -62,6 +63,10 @@ def G_Lpe(IR, nthOct, minFreq, maxFreq, IREndManualCut=None):
     :param maxFreq: analysis superior frequency limit
     :type maxFreq: float
 
+    :param filterDomain: 'time' for the IIR octave filter bank or 'freq' for
+                         the FFT-domain one
+    :type filterDomain: str
+
     :return: Analysis object with the calculated parameter
     :rtype: Analysis
     """
@@ -100,7 +105,7 @@ def G_Lpe(IR, nthOct, minFreq, maxFreq, IREndManualCut=None):
                         SigObj.lengthDomain,
                         SigObj.samplingRate)
     hSignal = _filter(signal=hSignal, nthOct=nthOct, minFreq=minFreq,
-                      maxFreq=maxFreq)
+                      maxFreq=maxFreq, domain=filterDomain)
     bands = FOF(nthOct=nthOct,
                 freqRange=[minFreq,maxFreq])[:,1]
     Lpe = []
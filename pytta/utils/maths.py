@@ -9,6 +9,9 @@ Created on Tue May  5 00:34:36 2020
 
 import numpy as np
 import numba as nb
+from scipy import stats
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
 
 
 @nb.njit
@@ -106,3 +109,74 @@ def fft_degree(timeLength: float = 0, samplingRate: int = 1) -> float:
 
     """
     return np.log2(round(timeLength*samplingRate))
+
+
+@lru_cache(maxsize=None)
+def _t_quantile(confidence: float, dof: int) -> float:
+    """Two-sided Student's t quantile, cached by confidence and dof."""
+    return stats.t.ppf((1 + confidence) / 2., dof)
+
+
+def _bootstrap_means(data: np.ndarray, numResamples: int,
+                     seed) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    numSamples = data.shape[-2]
+    idx = rng.integers(0, numSamples, size=(numResamples, numSamples))
+    return np.take(data, idx, axis=-2).mean(axis=-2)
+
+
+def mean_confidence_interval(data: np.ndarray, confidence: float = 0.95,
+                             bootstrap: int = None, workers: int = None,
+                             seed: int = None) -> tuple:
+    """
+    Mean and confidence interval half width of sampled data.
+
+    The samples lie along the first axis of 1D and 2D arrays, e.g.
+    (averages, bands), and along the second one of 3D arrays, e.g.
+    (groups, averages, bands), so all the bands and groups are computed at
+    once.
+
+    Parameters
+    ----------
+        * data (np.ndarray):
+            The samples.
+
+        * confidence (float = 0.95):
+            Confidence level of the interval.
+
+        * bootstrap (int = None):
+            Number of resamples for a percentile bootstrap interval, instead
+            of the Student's t one.
+
+        * workers (int = None):
+            Number of threads sharing the bootstrap resamples.
+
+        * seed (int = None):
+            Seed of the bootstrap random resampling.
+
+    Returns
+    -------
+        mean, halfWidth (np.ndarray | float):
+            The mean and the confidence interval half width.
+
+    """
+    data = 1.0 * np.asarray(data)
+    axis = 0 if data.ndim < 3 else 1
+    numSamples = data.shape[axis]
+    mean = np.mean(data, axis=axis)
+    if bootstrap is None:
+        sem = stats.sem(data, axis=axis)
+        return mean, sem * _t_quantile(confidence, numSamples - 1)
+    samples = data if data.ndim > 1 else data[:, None]
+    workers = max(min(workers or 1, bootstrap), 1)
+    chunks = [len(chunk) for chunk in np.array_split(np.arange(bootstrap),
+                                                     workers)]
+    seeds = np.random.SeedSequence(seed).spawn(workers)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        means = np.concatenate(list(pool.map(
+            lambda args: _bootstrap_means(samples, *args),
+            zip(chunks, seeds))), axis=-2)
+    alpha = (1 - confidence) / 2
+    low, high = np.quantile(means, [alpha, 1 - alpha], axis=-2)
+    halfWidth = (high - low) / 2
+    return mean, halfWidth if data.ndim > 1 else halfWidth[0]
@@ -1,4 +1,5 @@
 import unittest
+import numpy as np
 import pytta
 
 
@@ -65,6 +66,97 @@ class TestAnalysisOperations(unittest.TestCase):
         test = self.b/self.a
         self.assertEqual(test.data.tolist(), [3/2,1,2])
 
+    def test_level_ops(self):
+        a = pytta.Analysis(anType='L', nthOct=self.nthOct,
+                           minBand=self.minFreq, maxBand=self.maxFreq,
+                           data=np.array([60, 70, 1000], dtype='float32'))
+        test = a + a
+        self.assertEqual(test.data.dtype, np.float32)
+        self.assertTrue(np.allclose(test.data, a.data + 10*np.log10(2)))
+        test = (a + a) / 2
+        self.assertTrue(np.allclose(test.data, a.data))
+        test = test - 60
+        self.assertTrue(np.allclose(test.data[1:], a.data[1:], atol=0.5))
+        self.assertEqual(test.data[0], -np.inf)
+
+    def test_reducers(self):
+        levels = [pytta.Analysis(anType='L', nthOct=self.nthOct,
+                                 minBand=self.minFreq, maxBand=self.maxFreq,
+                                 data=[60 + idx, 70, 80 - idx])
+                  for idx in range(4)]
+        total = pytta.Analysis.sum(levels)
+        expected = levels[0] + levels[1] + levels[2] + levels[3]
+        self.assertTrue(np.allclose(total.data, expected.data))
+        mean = pytta.Analysis.mean(levels)
+        self.assertEqual(mean.anType, 'L')
+        self.assertTrue(np.allclose(mean.data, (expected/4).data))
+        mean = pytta.Analysis.mean([self.a, self.b], energetic=False)
+        self.assertEqual(mean.data.tolist(), [2.5, 1, -1.5])
+        self.assertEqual(mean.anType, 'RT')
+        with self.assertRaises(ValueError):
+            pytta.Analysis.sum([])
+
+
+class TestAnalysisSet(unittest.TestCase):
+
+    def setUp(self):
+        """
+        It runs first before each test
+        """
+        np.random.seed(0)
+        self.data = 1 + np.random.rand(6, 3)
+        self.anSet = pytta.AnalysisSet(anType='RT', nthOct=3, minBand=100,
+                                       maxBand=160, data=self.data,
+                                       tags={'source': ['S1']*3 + ['S2']*3,
+                                             'take': [1, 2, 3]*2})
+
+    def test_stats(self):
+        mean = self.anSet.mean(energetic=False)
+        self.assertEqual(mean.anType, 'RT')
+        self.assertTrue(np.allclose(mean.data, self.data.mean(axis=0)))
+        energetic = pytta.Analysis.mean(self.anSet.to_analyses())
+        self.assertTrue(np.allclose(self.anSet.mean().data, energetic.data))
+        self.assertTrue(np.allclose(self.anSet.std(),
+                                    self.data.std(axis=0, ddof=1)))
+        halfWidth = 2.5706 * self.data.std(axis=0, ddof=1) / np.sqrt(6)
+        self.assertTrue(np.allclose(self.anSet.confidence_interval(),
+                                    halfWidth, rtol=1e-4))
+
+    def test_groupby_and_items(self):
+        groups = self.anSet.groupby('source')
+        self.assertEqual(list(groups), ['S1', 'S2'])
+        self.assertTrue(np.array_equal(groups['S2'].data, self.data[3:]))
+        pairs = self.anSet.groupby('source', 'take')
+        self.assertEqual(len(pairs), 6)
+        self.assertEqual(len(pairs[('S1', 2)]), 1)
+        an = self.anSet[4]
+        self.assertIsInstance(an, pytta.Analysis)
+        self.assertEqual(an.data.tolist(), self.data[4].tolist())
+        subset = self.anSet[self.anSet.tags['take'] > 1]
+        self.assertEqual(subset.tags['source'].tolist(),
+                         ['S1', 'S1', 'S2', 'S2'])
+        stacked = pytta.AnalysisSet.from_analyses(self.anSet.to_analyses(),
+                                                  take=range(6))
+        self.assertTrue(np.array_equal(stacked.data, self.data))
+        with self.assertRaises(ValueError):
+            pytta.AnalysisSet('RT', 3, 100, 160, self.data, tags={'take': [1]})
+
+    def test_mean_confidence_interval(self):
+        mci = pytta.utils.mean_confidence_interval
+        mean, halfWidth = mci(self.data)
+        for band in range(3):
+            bandMean, bandHalfWidth = mci(self.data[:, band])
+            self.assertAlmostEqual(mean[band], bandMean)
+            self.assertAlmostEqual(halfWidth[band], bandHalfWidth)
+        groups = np.stack([self.data[:3], self.data[3:]])
+        _, groupsHalfWidth = mci(groups)
+        self.assertTrue(np.allclose(groupsHalfWidth[1], mci(self.data[3:])[1]))
+        _, boot = mci(self.data, bootstrap=2000, workers=2, seed=0)
+        self.assertEqual(boot.shape, (3,))
+        self.assertTrue(np.array_equal(
+            boot, mci(self.data, bootstrap=2000, workers=2, seed=0)[1]))
+        self.assertTrue(np.allclose(boot, halfWidth, rtol=0.5))
+
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -1,3 +1,5 @@
+import os
+import tempfile
 import unittest
 import pytta
 
@@ -24,6 +26,9 @@ class TestH5IO(unittest.TestCase):
         """
         It runs first before each test
         """
+        self.cwd = os.getcwd()
+        self.tempDir = tempfile.TemporaryDirectory()
+        os.chdir(self.tempDir.name)
         self.filename = 'h5teste.hdf5'
 
 
@@ -31,7 +36,8 @@ class TestH5IO(unittest.TestCase):
         """
         It runs after each test
         """
-        pass
+        os.chdir(self.cwd)
+        self.tempDir.cleanup()
 
 
     def test_h5save_signalobj(self):
@@ -435,5 +441,38 @@ class TestH5IO(unittest.TestCase):
             self.assertEqual(pobj.error.tolist(),
                                 savedlst[idx].error.tolist())    
 
+    def test_h5save_analysisset(self):
+        """
+        AnalysisSet hdf5 save test.
+        """
+        anSet = pytta.AnalysisSet(anType='RT', nthOct=1, minBand=125,
+                                  maxBand=4000,
+                                  data=[[1.2, 1.1, 1.0, 0.9, 0.8, 0.7],
+                                        [1.3, 1.2, 1.1, 1.0, 0.9, 0.8]],
+                                  tags={'source': ['S1', 'S2'],
+                                        'take': [1, 2]},
+                                  dataLabels=['first', None],
+                                  comment='Testando')
+
+        pytta.save(self.filename, anSet)
+
+        a = pytta.load(self.filename)
+
+        pobj = a[list(a)[0]]
+
+        self.assertEqual(pobj.anType, anSet.anType)
+
+        self.assertEqual(pobj.range, anSet.range)
+
+        self.assertEqual(pobj.data.tolist(), anSet.data.tolist())
+
+        self.assertEqual(pobj.tags['source'].tolist(), ['S1', 'S2'])
+
+        self.assertEqual(pobj.tags['take'].tolist(), [1, 2])
+
+        self.assertEqual(pobj.dataLabels, ['first', None])
+
+        self.assertEqual(pobj.comment, anSet.comment)
+
 if __name__ == '__main__':
     unittest.main()
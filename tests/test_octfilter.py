@@ -0,0 +1,143 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+from scipy import signal as ss
+import pytta
+from pytta.classes import filter as pyttaFilter
+from pytta.classes.filter import OctFilter
+
+
+class TestOctFilter(unittest.TestCase):
+
+    def setUp(self):
+        """
+        It runs first before each test
+        """
+        np.random.seed(0)
+        self.samplingRate = 48000
+        self.signal = pytta.SignalObj(np.random.randn(2**14, 3), 'time',
+                                      self.samplingRate)
+        self.of = OctFilter(order=4, nthOct=1,
+                            samplingRate=self.samplingRate,
+                            minFreq=100, maxFreq=4000,
+                            refFreq=1000, base=10)
+
+    def test_filter_bank(self):
+        block = self.of.filter_bank(self.signal)
+        numBands = self.of.sos.shape[2]
+        self.assertEqual(block.shape, (self.signal.numSamples, numBands, 3))
+        expected = ss.sosfilt(self.of.sos[:, :, 2].copy(order='C'),
+                              self.signal.timeSignal[:, 1].astype('float64'))
+        self.assertTrue(np.allclose(block[:, 2, 1], expected))
+        threaded = self.of.filter_bank(self.signal, workers=3)
+        self.assertTrue(np.array_equal(block, threaded))
+
+    def test_filter(self):
+        result = self.of.filter(self.signal)
+        block = self.of.filter_bank(self.signal)
+        self.assertEqual(len(result), 3)
+        self.assertEqual(result[2].numChannels, block.shape[1])
+        self.assertEqual(result[2].channels[1].name, 'Band 1')
+        self.assertTrue(np.allclose(result[2].timeSignal, block[:, :, 2]))
+
+    def test_multirate(self):
+        of = OctFilter(order=4, nthOct=1, samplingRate=self.samplingRate,
+                       minFreq=100, maxFreq=4000, refFreq=1000, base=10,
+                       multirate=True)
+        self.assertEqual(of.decimation.tolist(), [64, 32, 16, 8, 4, 2])
+        block = self.of.filter_bank(self.signal)[2048:]
+        multi = of.filter_bank(self.signal)[2048:]
+        self.assertEqual(block.shape, multi.shape)
+        levels = 10*np.log10(np.mean(block**2, axis=0))
+        multiLevels = 10*np.log10(np.mean(multi**2, axis=0))
+        self.assertTrue(np.allclose(levels, multiLevels, atol=0.2))
+        bands = of.filter_bank(self.signal, interpolate=False)
+        self.assertEqual(bands[0].shape, (self.signal.numSamples//64, 3))
+
+    def test_freq_domain(self):
+        kwargs = dict(order=4, nthOct=1, samplingRate=self.samplingRate,
+                      minFreq=100, maxFreq=4000, refFreq=1000, base=10)
+        minimum = OctFilter(domain='freq', phase='minimum', **kwargs)
+        block = self.of.filter_bank(self.signal)
+        self.assertTrue(np.allclose(minimum.filter_bank(self.signal), block,
+                                    atol=1e-6))
+        zero = OctFilter(domain='freq', **kwargs)
+        nfft = 2**15
+        responses = zero.freq_responses(nfft)
+        self.assertEqual(responses.shape, (nfft//2 + 1, block.shape[1]))
+        self.assertTrue(np.allclose(np.abs(minimum.freq_responses(nfft)),
+                                    responses.real))
+        self.assertTrue(np.all(responses.imag == 0))
+        result = zero.filter(self.signal)
+        self.assertEqual(result[0].timeSignal.shape, block[:, :, 0].shape)
+        with self.assertRaises(ValueError):
+            OctFilter(domain='freq', multirate=True, **kwargs)
+
+    def test_precision(self):
+        kwargs = dict(order=4, nthOct=1, samplingRate=self.samplingRate,
+                      minFreq=100, maxFreq=4000, refFreq=1000, base=10)
+        double = pytta.SignalObj(self.signal.timeSignal, 'time',
+                                 self.samplingRate, precision='float64')
+        for of in [self.of, OctFilter(domain='freq', **kwargs)]:
+            self.assertEqual(of.filter_bank(self.signal).dtype, 'float32')
+            self.assertEqual(of.filter_bank(double).dtype, 'float64')
+        self.assertEqual(of.freq_responses(2**15).dtype, 'complex64')
+        self.assertEqual(of.freq_responses(2**15, 'float64').dtype,
+                         'complex128')
+
+    def test_design_cache(self):
+        kwargs = dict(order=4, nthOct=1, samplingRate=self.samplingRate,
+                      minFreq=100, maxFreq=4000, refFreq=1000, base=10)
+        self.assertIs(OctFilter(**kwargs).sos, self.of.sos)
+        self.assertFalse(self.of.sos.flags.writeable)
+        with tempfile.TemporaryDirectory() as cacheDir:
+            pytta.default.filterCacheDir = cacheDir
+            try:
+                OctFilter.clear_cache()
+                sos = OctFilter(**kwargs).sos
+                self.assertEqual(len(os.listdir(cacheDir)), 1)
+                OctFilter.clear_cache()
+                self.assertTrue(np.array_equal(OctFilter(**kwargs).sos, sos))
+            finally:
+                pytta.default.filterCacheDir = None
+
+    def test_response_cache(self):
+        kwargs = dict(order=4, nthOct=1, samplingRate=self.samplingRate,
+                      minFreq=100, maxFreq=4000, refFreq=1000, base=10)
+        of = OctFilter(domain='freq', **kwargs)
+        OctFilter.clear_cache()
+        block = of.filter_bank(self.signal)
+        shorter = pytta.SignalObj(self.signal.timeSignal[:-1000], 'time',
+                                  self.samplingRate)
+        of.filter_bank(shorter)
+        self.assertEqual(len(pyttaFilter._responseCache), 1)
+        self.assertEqual(len(pyttaFilter._designCache), 0)
+        chunkBytes = pyttaFilter._responseChunkBytes
+        pyttaFilter._responseChunkBytes = 1
+        try:
+            self.assertTrue(np.allclose(of.filter_bank(self.signal), block))
+        finally:
+            pyttaFilter._responseChunkBytes = chunkBytes
+        pytta.default.filterResponseCacheBytes = 1
+        try:
+            OctFilter.clear_cache()
+            of.freq_responses(2**15)
+            self.assertEqual(len(pyttaFilter._responseCache), 0)
+        finally:
+            pytta.default.filterResponseCacheBytes = 2**28
+
+    def test_process_blocks(self):
+        block = self.of.filter_bank(self.signal)
+        chunks = np.array_split(self.signal.timeSignal, 7)
+        streamed = np.concatenate(list(self.of.process_blocks(chunks)))
+        self.assertTrue(np.allclose(streamed, block))
+        self.of.reset_state()
+        first = self.of.process_block(self.signal.timeSignal[:100, 0])
+        self.assertEqual(first.shape, (100, block.shape[1], 1))
+        with self.assertRaises(ValueError):
+            self.of.process_block(self.signal.timeSignal[100:200])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,3 +1,5 @@
+import os
+import tempfile
 import unittest
 import pytta
 
@@ -22,13 +24,17 @@ class TestPyttaSave(unittest.TestCase):
         """
         It runs first before each test
         """
+        self.cwd = os.getcwd()
+        self.tempDir = tempfile.TemporaryDirectory()
+        os.chdir(self.tempDir.name)
         self.filename = 'pyttatest.pytta'
 
     def tearDown(self):
         """
         It runs after each test
         """
-        pass
+        os.chdir(self.cwd)
+        self.tempDir.cleanup()
 
     def test_pytta_signalobj(self):
         """
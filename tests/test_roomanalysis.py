@@ -0,0 +1,197 @@
+import unittest
+import numpy as np
+import pytta
+from pytta.classes import _kernels
+from pytta.classes.analysis import energy_decay_curves, crop_IR, \
+    _start_samples_ISO3382, _start_sample_ISO3382, \
+    energy_decay_calculation, _level_profile, _energy_cumsum, \
+    reverberation_time, reverberation_times, clarity, definition, \
+    _batch_init, _batch_settings
+
+
+class TestRoomAnalysis(unittest.TestCase):
+
+    def setUp(self):
+        """
+        It runs first before each test
+        """
+        np.random.seed(0)
+        self.samplingRate = 48000
+        time = np.arange(2*self.samplingRate) / self.samplingRate
+        decays = np.exp(-6.9*time[:, None]/np.array([1.5, 0.8, 0.4]))
+        self.bandsIR = np.random.randn(len(time), 3) * decays \
+            + 1e-4*np.random.randn(len(time), 3)
+        self.bandsIR[:100] = 0
+        self.bandsIR[100] = 2
+        self.timeVector = time
+
+    def test_energy_decay_curves_bypass(self):
+        edc, lengths, _ = energy_decay_curves(self.bandsIR, self.samplingRate,
+                                              bypassLundeby=True)
+        self.assertEqual(edc.shape, self.bandsIR.shape)
+        self.assertTrue(np.all(lengths == self.bandsIR.shape[0] - 1))
+        sqrIR = self.bandsIR[:-1, 1]**2
+        expected = np.cumsum(sqrIR[::-1])[::-1]
+        self.assertTrue(np.allclose(edc[:-1, 1], expected/expected[0]))
+        self.assertTrue(np.all(edc[-1] == 0))
+
+    def test_energy_decay_curves(self):
+        edc, lengths, params = energy_decay_curves(self.bandsIR,
+                                                   self.samplingRate)
+        c0, c1, interIdx, BGL = params
+        self.assertTrue(np.all(c1 < 0))
+        self.assertTrue(np.all(lengths == interIdx))
+        self.assertTrue(np.all(np.diff(edc[:lengths.min()], axis=0) <= 0))
+        rt = -60/c1
+        self.assertTrue(np.allclose(rt, [1.5, 0.8, 0.4], rtol=0.1))
+        for band in range(3):
+            single, timeVector, singleParams = \
+                energy_decay_calculation(band, self.bandsIR[:, [band]],
+                                         self.timeVector, self.samplingRate,
+                                         None, 1, None, False)
+            self.assertTrue(np.array_equal(single,
+                                           edc[:lengths[band], band]))
+            self.assertEqual(len(timeVector), lengths[band])
+            self.assertEqual(singleParams[2], interIdx[band])
+
+    def test_energy_decay_curves_precision(self):
+        edc, _, params = energy_decay_curves(self.bandsIR, self.samplingRate)
+        self.assertEqual(edc.dtype, np.float64)
+        self.assertTrue(all(param.dtype == np.float64
+                            for param in params[:2] + params[3:]))
+        edc32, _, params32 = energy_decay_curves(
+            self.bandsIR.astype('float32'), self.samplingRate)
+        self.assertEqual(edc32.dtype, np.float32)
+        self.assertEqual(params32[1].dtype, np.float32)
+
+    def test_level_profile(self):
+        numSamples = self.bandsIR.shape[0]
+        profile, timeStamp = _level_profile(self.bandsIR, self.samplingRate,
+                                            numSamples, 3, 480)
+        expected = np.mean(self.bandsIR[:200*480].reshape(200, 480, 3)**2,
+                           axis=1)
+        self.assertTrue(np.allclose(profile, expected))
+        self.assertEqual(timeStamp[1, 0], 0.01)
+        cumEnergy = _energy_cumsum(self.bandsIR)
+        profile, timeStamp = _level_profile(self.bandsIR, self.samplingRate,
+                                            numSamples, 3, [480, 960, 480],
+                                            [0, 0, 100], cumEnergy)
+        self.assertTrue(np.allclose(profile[:, 0], expected[:, 0]))
+        self.assertTrue(np.all(np.isnan(profile[100:, 1])))
+        self.assertTrue(np.isnan(profile[-1, 2]))
+        self.assertTrue(np.allclose(profile[0, 2],
+                                    np.mean(self.bandsIR[100:580, 2]**2)))
+
+    def test_reverberation_times(self):
+        edc, lengths, _ = energy_decay_curves(self.bandsIR, self.samplingRate)
+        listEDC = [(edc[:lengths[band], band], self.timeVector[:lengths[band]])
+                   for band in range(3)]
+        rts = reverberation_times(('EDT', 20, 30), listEDC)
+        self.assertEqual(rts.shape, (3, 3))
+        for rt, decay in zip(rts, ('EDT', 20, 30)):
+            self.assertTrue(np.array_equal(rt, reverberation_time(decay,
+                                                                  listEDC)))
+        levels = 10*np.log10(listEDC[1][0])
+        first = np.where(levels >= -5)[0][-1]
+        last = np.where(levels >= -25)[0][-1]
+        slope = np.polyfit(listEDC[1][1][first:last], levels[first:last], 1)[0]
+        self.assertAlmostEqual(rts[1, 1], -60/slope, places=4)
+
+    def test_energy_ratios(self):
+        edc, lengths, _ = energy_decay_curves(self.bandsIR, self.samplingRate,
+                                              bypassLundeby=True)
+        listEDC = [(edc[:lengths[band], band], self.timeVector[:lengths[band]])
+                   for band in range(3)]
+        C = clarity(listEDC, self.samplingRate, [50, 80])
+        self.assertEqual(C.shape, (2, 3))
+        self.assertTrue(np.array_equal(C[1], clarity(listEDC,
+                                                     self.samplingRate)))
+        sqrIR = self.bandsIR[:-1]**2
+        early = np.sum(sqrIR[:2400], axis=0)
+        expected = 10*np.log10(early / np.sum(sqrIR[2400:], axis=0))
+        self.assertTrue(np.allclose(C[0], expected, atol=0.01))
+        D50 = definition(listEDC, self.samplingRate)
+        expected = 100 * early / np.sum(sqrIR, axis=0)
+        self.assertTrue(np.allclose(D50, expected, atol=0.01))
+
+    def test_crop_IR(self):
+        bandsIR = self.bandsIR.copy()
+        bandsIR[:150, 1] = 0
+        bandsIR[150, 1] = 2
+        starts = _start_samples_ISO3382(bandsIR, 20)
+        self.assertEqual(starts.tolist(),
+                         [_start_sample_ISO3382(bandsIR[:, [ch]], 20)
+                          for ch in range(3)])
+        ir = pytta.SignalObj(bandsIR, 'time', self.samplingRate)
+        cropped = crop_IR(ir, 1.5)
+        self.assertEqual(cropped.numChannels, 3)
+        self.assertEqual(cropped.numSamples, 72000 - starts.min())
+        self.assertTrue(np.array_equal(cropped.timeSignal[:, 1],
+                                       ir.timeSignal[starts.min():72000, 1]))
+        # A replica on the first channel cuts it, but not the others
+        bandsIR[48000:52800, 0] += 0.1*np.random.randn(4800)
+        ir = pytta.SignalObj(bandsIR, 'time', self.samplingRate)
+        self.assertLess(crop_IR(ir[0], None).numSamples, 48000)
+        self.assertEqual(crop_IR(ir, None).numSamples,
+                         ir.numSamples - 1 - starts.min())
+
+    def test_batch(self):
+        irs = [pytta.SignalObj(self.bandsIR[:, band], 'time',
+                               self.samplingRate) for band in range(3)]
+        kwargs = dict(nthOct=1, minFreq=125, maxFreq=4000)
+        data, analyses = pytta.RoomAnalysis.batch(irs, **kwargs)
+        self.assertEqual(data.shape, (3, 6, len(analyses[0].parameters)))
+        single = pytta.RoomAnalysis(irs[1], **kwargs)
+        idx = single.parameters.index('T30')
+        self.assertTrue(np.array_equal(data[1, :, idx], single.T30))
+        pooled, _ = pytta.RoomAnalysis.batch(irs, workers=2, **kwargs)
+        self.assertTrue(np.array_equal(pooled, data, equal_nan=True))
+        # Spawned workers take the parent's settings from the initializer
+        settings = {name: getattr(pytta.default, name)
+                    for name in _batch_settings}
+        try:
+            _batch_init({}, dict(settings, precision='float64',
+                                 filterCacheSize=3))
+            self.assertEqual(pytta.default.precision, 'float64')
+            self.assertEqual(pytta.default.filterCacheSize, 3)
+        finally:
+            _batch_init({}, settings)
+
+    def test_lazy_parameters(self):
+        ir = pytta.SignalObj(self.bandsIR[:, 0], 'time', self.samplingRate)
+        kwargs = dict(nthOct=1, minFreq=125, maxFreq=4000)
+        full = pytta.RoomAnalysis(ir, **kwargs)
+        lazy = pytta.RoomAnalysis(ir, parameters=['T30', 'SPL'], **kwargs)
+        self.assertEqual(lazy.parameters, ('T30', 'SPL'))
+        self.assertEqual(lazy._params, {})
+        self.assertTrue(np.array_equal(lazy.T30, full.T30))
+        self.assertNotIn('D50', lazy._params)
+        self.assertIn('hSignal', lazy._memo)
+        self.assertTrue(np.array_equal(lazy.SPL, full.SPL))
+        self.assertEqual(lazy._memo, {})
+        with self.assertRaises(ValueError):
+            pytta.RoomAnalysis(ir, parameters=['T25'], **kwargs)
+
+    @unittest.skipUnless(_kernels.available, "Numba is not installed")
+    def test_numba_backend(self):
+        edc, lengths, params = energy_decay_curves(self.bandsIR,
+                                                   self.samplingRate)
+        listEDC = [(edc[:lengths[band], band], self.timeVector[:lengths[band]])
+                   for band in range(3)]
+        rt = reverberation_time(20, listEDC)
+        pytta.default.backend = 'numba'
+        try:
+            edcJit, lengthsJit, paramsJit = \
+                energy_decay_curves(self.bandsIR, self.samplingRate)
+            rtJit = reverberation_time(20, listEDC)
+        finally:
+            pytta.default.backend = 'numpy'
+        self.assertTrue(np.array_equal(lengths, lengthsJit))
+        for param, paramJit in zip(params, paramsJit):
+            self.assertTrue(np.allclose(param, paramJit))
+        self.assertTrue(np.allclose(edc, edcJit))
+        self.assertTrue(np.allclose(rt, rtJit))
+
+
+if __name__ == '__main__':
+    unittest.main()
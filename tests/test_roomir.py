@@ -0,0 +1,136 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+from scipy import signal as ss
+import pytta
+from pytta import roomir
+from pytta.classes._base import ChannelObj
+
+
+class TestMeasurementData(unittest.TestCase):
+
+    def setUp(self):
+        """
+        It runs first before each test
+        """
+        np.random.seed(0)
+        self.cwd = os.getcwd()
+        self.tempDir = tempfile.TemporaryDirectory()
+        os.chdir(self.tempDir.name)
+        samplingRate = 48000
+        time = np.arange(2**15) / samplingRate
+        sweep = ss.chirp(time, 50, time[-1], 20000, 'logarithmic') \
+            * np.hanning(len(time))
+        self.MS = roomir.MeasurementSetup(
+            'medtest', samplingRate, 0,
+            {'SWP15': pytta.SignalObj(sweep, 'time', samplingRate)},
+            100, 10000, {'Mic1': (1, 'Mic 1')},
+            {'Mic1': (np.array([100, 1000, 10000]), np.array([0., 1., 2.]))},
+            {'O1': (1, 'Dodecahedron')}, {}, 2, False, 1, 1)
+        self.D = roomir.MeasurementData(self.MS)
+        inChannels = roomir._MeasurementChList(
+            kind='in', chList=[ChannelObj(1, 'Mic 1', 'Mic1')])
+        outChannel = roomir._MeasurementChList(
+            kind='out', chList=[ChannelObj(1, 'Dodecahedron', 'O1')])
+        for receiverPos in ['R1', 'R2']:
+            IR = np.random.randn(200) * np.exp(-np.arange(200)/30)
+            recordings = [pytta.SignalObj(np.convolve(sweep, IR)[:len(time)]
+                                          + 1e-4*np.random.randn(len(time)),
+                                          'time', samplingRate)
+                          for avg in range(2)]
+            msdThng = roomir.MeasuredThing(kind='roomres', arrayName='Mic1',
+                                           measuredSignals=recordings,
+                                           inChannels=inChannels,
+                                           sourcePos='S1',
+                                           receiverPos=receiverPos,
+                                           excitation='SWP15',
+                                           outChannel=outChannel)
+            msdThng.creation_name = str(msdThng) + '_1'
+            roomir._h5_save(self.D.path + msdThng.creation_name, msdThng)
+            self.D._h5_link(msdThng)
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        self.tempDir.cleanup()
+
+    def test_calculate_ir_unchanged_inputs(self):
+        first = self.D.calculate_ir(self.D.get('roomres', skipMsgs=True),
+                                    skipRegularization=True)
+        self.assertEqual(len(first), 2)
+        name = 'roomir_S1-R1_O1-Mic1_SWP15_1'
+        inputsHash = first[name].inputsHash
+        self.assertEqual(self.D._saved_hash(name), inputsHash)
+        # Unchanged inputs load the saved IRs instead of rewriting them
+        fileStat = os.stat(self.D.path + name + '.hdf5')
+        second = self.D.calculate_ir(self.D.get('roomres', skipMsgs=True),
+                                     skipRegularization=True)
+        self.assertEqual(os.stat(self.D.path + name + '.hdf5').st_mtime_ns,
+                         fileStat.st_mtime_ns)
+        self.assertEqual(second[name].inputsHash, inputsHash)
+        self.assertTrue(np.array_equal(
+            first[name].measuredSignals[1].systemSignal.timeSignal,
+            second[name].measuredSignals[1].systemSignal.timeSignal))
+        # Changed options or compensations recalculate
+        options = self.D.calculate_ir(self.D.get('roomres', skipMsgs=True),
+                                      skipRegularization=True,
+                                      skipInCompensation=True)
+        self.assertNotEqual(options[name].inputsHash, inputsHash)
+        self.MS.inCompensations['Mic1'][1][2] = 3.
+        compensation = self.D.calculate_ir(self.D.get('roomres', skipMsgs=True),
+                                           skipRegularization=True)
+        self.assertNotIn(compensation[name].inputsHash,
+                         [inputsHash, options[name].inputsHash])
+        forced = self.D.calculate_ir(self.D.get('roomres', skipMsgs=True),
+                                     skipRegularization=True, force=True)
+        self.assertEqual(forced[name].inputsHash, compensation[name].inputsHash)
+
+    def test_calculate_ir_workers(self):
+        serial = self.D.calculate_ir(self.D.get('roomres', skipMsgs=True),
+                                     skipRegularization=True, skipSave=True)
+        pooled = self.D.calculate_ir(self.D.get('roomres', skipMsgs=True),
+                                     skipRegularization=True, workers=2)
+        self.assertEqual(list(pooled), list(serial))
+        for name, msdThng in pooled.items():
+            self.assertEqual(self.D._saved_hash(name), msdThng.inputsHash)
+            for IR, serialIR in zip(msdThng.measuredSignals,
+                                    serial[name].measuredSignals):
+                self.assertTrue(np.array_equal(IR.systemSignal.timeSignal,
+                                               serialIR.systemSignal.timeSignal))
+        self.assertEqual(len(self.D.get('roomir', skipMsgs=True)), 2)
+
+    def test_calculate_ir_channel_calibration(self):
+        inChannels = roomir._MeasurementChList(
+            kind='in', chList=[ChannelObj(1, 'Mic 1', 'Mic1')])
+        outChannel = roomir._MeasurementChList(
+            kind='out', chList=[ChannelObj(1, 'Dodecahedron', 'O1')])
+        sweep = self.MS.excitationSignals['SWP15'].timeSignal[:, 0]
+        recordings = [pytta.SignalObj(0.5*sweep, 'time', self.MS.samplingRate)
+                      for avg in range(2)]
+        calibThng = roomir.MeasuredThing(kind='channelcalibration',
+                                         arrayName='Mic1',
+                                         measuredSignals=recordings,
+                                         inChannels=inChannels,
+                                         excitation='SWP15',
+                                         outChannel=outChannel)
+        calibThng.creation_name = str(calibThng) + '_1'
+        roomir._h5_save(self.D.path + calibThng.creation_name, calibThng)
+        self.D._h5_link(calibThng)
+        # The roomres comes first, but takes the channel calibration IR
+        # calculated in the same call
+        getDict = self.D.get('roomres', 'R1', skipMsgs=True)
+        getDict.update(self.D.get('channelcalibration', skipMsgs=True))
+        IRs = self.D.calculate_ir(getDict, skipRegularization=True)
+        self.assertEqual(list(IRs), ['roomir_S1-R1_O1-Mic1_SWP15_1',
+                                     'channelcalibir_O1-Mic1_SWP15_1'])
+        name = 'roomir_S1-R1_O1-Mic1_SWP15_1'
+        fileStat = os.stat(self.D.path + name + '.hdf5')
+        again = self.D.calculate_ir(self.D.get('roomres', 'R1', skipMsgs=True),
+                                    skipRegularization=True)
+        self.assertEqual(again[name].inputsHash, IRs[name].inputsHash)
+        self.assertEqual(os.stat(self.D.path + name + '.hdf5').st_mtime_ns,
+                         fileStat.st_mtime_ns)
+
+
+if __name__ == '__main__':
+    unittest.main()
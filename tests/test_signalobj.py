@@ -0,0 +1,259 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+import h5py
+import pytta
+from pytta.classes.signal import _make_rms_spectra, _make_pk_spectra
+
+
+class TestSignalObj(unittest.TestCase):
+
+    def setUp(self):
+        """
+        It runs first before each test
+        """
+        np.random.seed(0)
+        self.samplingRate = 44100
+        self.timeSignal = np.random.randn(2**12, 2).astype('float32')
+
+    def test_lazy_fft(self):
+        sig = pytta.SignalObj(self.timeSignal, 'time', self.samplingRate)
+        self.assertTrue(sig._freqDirty)
+        expected = np.fft.rfft(self.timeSignal, axis=0)
+        expected[1:] /= 2**(1/2)
+        expected[0] *= 2**(1/2)
+        expected /= expected.shape[0]
+        self.assertTrue(np.allclose(sig.freqSignal, expected, atol=1e-6))
+        self.assertFalse(sig._freqDirty)
+
+    def test_lazy_ifft(self):
+        sig = pytta.SignalObj(self.timeSignal, 'time', self.samplingRate)
+        other = pytta.SignalObj(sig.freqSignal, 'freq', self.samplingRate)
+        self.assertTrue(other._timeDirty)
+        self.assertEqual(other.numChannels, 2)
+        self.assertTrue(np.allclose(other.timeSignal, self.timeSignal,
+                                    atol=1e-5))
+        self.assertFalse(other._timeDirty)
+
+    def test_spectra_scaling(self):
+        peak = np.fft.rfft(self.timeSignal, axis=0)
+        rms = _make_rms_spectra(peak)
+        self.assertTrue(np.array_equal(rms[1:], peak[1:] / 2**(1/2)))
+        self.assertTrue(np.array_equal(rms[0], peak[0] * 2**(1/2)))
+        inPlace = peak.copy()
+        self.assertIs(_make_rms_spectra(inPlace, out=inPlace), inPlace)
+        self.assertTrue(np.array_equal(inPlace, rms))
+        _make_pk_spectra(inPlace, out=inPlace)
+        self.assertTrue(np.allclose(inPlace, peak))
+
+    def test_invalidation(self):
+        sig = pytta.SignalObj(self.timeSignal, 'time', self.samplingRate)
+        sig.freqSignal
+        sig.crop(0, 0.05)
+        self.assertTrue(sig._freqDirty)
+        self.assertEqual(sig.freqSignal.shape[0], sig.numSamples//2 + 1)
+        self.assertEqual(len(sig.freqVector), sig.numSamples//2 + 1)
+        self.assertEqual(len(sig.timeVector), sig.numSamples)
+
+    def test_channel_view(self):
+        sig = pytta.SignalObj(self.timeSignal, 'time', self.samplingRate)
+        sig.channels[2].name = 'Right'
+        view = sig[1]
+        self.assertEqual(view.numChannels, 1)
+        self.assertEqual(view.channels['Right'].num, 2)
+        self.assertTrue(np.shares_memory(view.timeSignal, sig.timeSignal))
+        self.assertTrue(np.array_equal(view.timeSignal[:, 0],
+                                       self.timeSignal[:, 1]))
+        self.assertTrue(np.allclose(view.freqSignal[:, 0],
+                                    sig.freqSignal[:, 1]))
+        with self.assertRaises(IndexError):
+            sig[2]
+
+    def test_channel_view_writes(self):
+        sig = pytta.SignalObj(self.timeSignal, 'time', self.samplingRate)
+        spectrum = sig.freqSignal.copy()
+        view = sig[1]
+        with self.assertRaises(ValueError):
+            view.timeSignal[:] = 0
+        time = np.arange(self.samplingRate) / self.samplingRate
+        reference = pytta.SignalObj(2*np.sin(2*np.pi*1000*time), 'time',
+                                    self.samplingRate)
+        view.calib_pressure(0, reference)
+        self.assertTrue(np.allclose(view.timeSignal[:, 0],
+                                    self.timeSignal[:, 1]
+                                    * view.channels[2].CF))
+        self.assertTrue(np.array_equal(sig.timeSignal, self.timeSignal))
+        self.assertTrue(np.array_equal(sig.freqSignal, spectrum))
+        # The parent stays writeable, and the views still sharing its
+        # samples recalculate their spectra
+        left, right = sig.split()
+        right.freqSignal
+        sig += 1.0
+        self.assertTrue(np.allclose(sig.freqSignal[1:], spectrum[1:]))
+        fresh = pytta.SignalObj(right.timeSignal.copy(), 'time',
+                                self.samplingRate)
+        self.assertTrue(np.array_equal(right.freqSignal, fresh.freqSignal))
+        sig.timeSignal[0, 0] = 1
+        self.assertEqual(left.timeSignal[0, 0], 1)
+        self.assertTrue(np.allclose(view.timeSignal[:, 0],
+                                    self.timeSignal[:, 1]
+                                    * view.channels[2].CF))
+
+    def test_split_views(self):
+        sig = pytta.SignalObj(self.timeSignal, 'time', self.samplingRate)
+        left, right = sig.split()
+        self.assertTrue(np.shares_memory(left.timeSignal, sig.timeSignal))
+        self.assertTrue(np.array_equal(right.timeSignal[:, 0],
+                                       self.timeSignal[:, 1]))
+
+    def test_disk_backed(self):
+        with tempfile.TemporaryDirectory() as tempDir:
+            fileName = os.path.join(tempDir, 'recording.raw')
+            data = np.memmap(fileName, dtype='float32', mode='w+',
+                             shape=self.timeSignal.shape)
+            data[:] = self.timeSignal
+            sig = pytta.SignalObj.from_disk(data, self.samplingRate)
+            ref = pytta.SignalObj(self.timeSignal, 'time', self.samplingRate)
+            self.assertTrue(sig.diskBacked)
+            self.assertEqual(sig.numChannels, 2)
+            self.assertTrue(np.shares_memory(sig.timeSignal, data))
+            sig.crop(0.01, 0.05)
+            ref.crop(0.01, 0.05)
+            self.assertTrue(sig.diskBacked)
+            self.assertTrue(np.array_equal(sig.timeSignal, ref.timeSignal))
+            right = sig[1]
+            self.assertTrue(right.diskBacked)
+            self.assertTrue(np.array_equal(right.timeSignal,
+                                           ref.timeSignal[:, 1:]))
+            segment = sig.segment(0.02, 0.03)
+            self.assertFalse(segment.diskBacked)
+            self.assertTrue(np.allclose(segment.freqSignal,
+                                        ref.segment(0.02, 0.03).freqSignal))
+            self.assertTrue(np.array_equal(np.concatenate(list(sig.blocks(100))),
+                                           ref.timeSignal))
+            del data, sig, right
+            with h5py.File(os.path.join(tempDir, 'recording.hdf5'), 'w') as f:
+                f['timeSignal'] = self.timeSignal
+                sig = pytta.SignalObj.from_disk(f['timeSignal'],
+                                                self.samplingRate)
+                left, = sig.split([1])
+                self.assertTrue(np.array_equal(left.timeSignal[:, 0],
+                                               self.timeSignal[:, 0]))
+                self.assertTrue(np.allclose(sig.freqSignal,
+                                            pytta.SignalObj(self.timeSignal,
+                                                            'time',
+                                                            self.samplingRate
+                                                            ).freqSignal))
+
+    def test_broadcasting_operations(self):
+        sig = pytta.SignalObj(self.timeSignal, 'time', self.samplingRate)
+        other = pytta.SignalObj(self.timeSignal[::-1], 'time',
+                                self.samplingRate, signalType='energy')
+        added = sig + other
+        self.assertEqual(added.numChannels, 2)
+        self.assertEqual(added.signalType, 'energy')
+        self.assertTrue(np.array_equal(added.timeSignal,
+                                       self.timeSignal
+                                       + self.timeSignal[::-1]))
+        self.assertTrue(np.array_equal((sig - other[1]).timeSignal,
+                                       self.timeSignal
+                                       - self.timeSignal[::-1, 1:]))
+        product = sig[0] * other
+        self.assertEqual(product.numChannels, 2)
+        self.assertEqual(len(product.channels), 2)
+        self.assertTrue(np.allclose(product.timeSignal[:, 1],
+                                    (sig[0] * other[1]).timeSignal[:, 0]))
+        with self.assertRaises(ValueError):
+            sig + pytta.SignalObj(np.zeros((2**12, 3)), 'time',
+                                  self.samplingRate)
+
+    def test_inplace_operations(self):
+        sig = pytta.SignalObj(self.timeSignal, 'time', self.samplingRate)
+        other = pytta.SignalObj(self.timeSignal[::-1], 'time',
+                                self.samplingRate, signalType='energy')
+        total = pytta.SignalObj(self.timeSignal, 'time', self.samplingRate)
+        total += other
+        self.assertTrue(np.array_equal(total.timeSignal,
+                                       (sig + other).timeSignal))
+        self.assertEqual(total.signalType, 'energy')
+        convolved = pytta.SignalObj(self.timeSignal, 'time',
+                                    self.samplingRate)
+        convolved *= other[0]
+        self.assertTrue(np.array_equal(convolved.freqSignal,
+                                       (sig * other[0]).freqSignal))
+        gain = pytta.SignalObj(self.timeSignal, 'time', self.samplingRate)
+        gain.freqSignal
+        gain *= 2
+        self.assertFalse(gain._freqDirty)
+        self.assertTrue(np.array_equal(gain.timeSignal, (sig * 2).timeSignal))
+        self.assertTrue(np.allclose(gain.freqSignal, (sig * 2).freqSignal,
+                                    atol=1e-5))
+        # Views and adopted arrays are copied, not written through
+        sig.freqSignal
+        spectrum = sig.freqSignal.copy()
+        view = sig[0]
+        view += 1.0
+        view *= 3.0
+        self.assertTrue(np.array_equal(sig.timeSignal, self.timeSignal))
+        self.assertTrue(np.array_equal(sig.freqSignal, spectrum))
+        self.assertTrue(np.allclose(view.timeSignal[:, 0],
+                                    (self.timeSignal[:, 0] + 1) * 3))
+        data = self.timeSignal.copy()
+        adopted = pytta.SignalObj.from_array(data, self.samplingRate)
+        adopted += 1.0
+        self.assertTrue(np.array_equal(data, self.timeSignal))
+        with self.assertRaises(ValueError):
+            single = pytta.SignalObj(self.timeSignal[:, 0], 'time',
+                                     self.samplingRate)
+            single += other
+
+    def test_from_array(self):
+        sig = pytta.SignalObj.from_array(self.timeSignal, self.samplingRate)
+        self.assertTrue(np.shares_memory(sig.timeSignal, self.timeSignal))
+        self.assertEqual(sig.numChannels, 2)
+        self.assertTrue(np.array_equal(
+            sig.freqSignal,
+            pytta.SignalObj(self.timeSignal, 'time',
+                            self.samplingRate).freqSignal))
+        copied = pytta.SignalObj.from_array(self.timeSignal[:, 0],
+                                            self.samplingRate, copy=True)
+        self.assertFalse(np.shares_memory(copied.timeSignal,
+                                          self.timeSignal))
+        self.assertEqual(copied.timeSignal.shape, (2**12, 1))
+        odd = pytta.SignalObj(self.timeSignal[1:], 'time', self.samplingRate)
+        spectrum = pytta.SignalObj.from_array(odd.freqSignal,
+                                              self.samplingRate,
+                                              domain='freq',
+                                              numSamples=odd.numSamples)
+        self.assertEqual(spectrum.numSamples, 2**12 - 1)
+        self.assertTrue(np.allclose(spectrum.timeSignal, odd.timeSignal,
+                                    atol=1e-5))
+        with self.assertRaises(ValueError):
+            pytta.SignalObj.from_array(self.timeSignal, self.samplingRate,
+                                       domain='space')
+
+    def test_precision(self):
+        sig = pytta.SignalObj(self.timeSignal, 'time', self.samplingRate)
+        self.assertEqual(sig.precision, 'float32')
+        self.assertEqual(sig.freqSignal.dtype, np.complex64)
+        self.assertEqual((sig * sig).freqSignal.dtype, np.complex64)
+        sig.precision = 'float64'
+        self.assertEqual(sig.timeSignal.dtype, np.float64)
+        self.assertEqual(sig.freqSignal.dtype, np.complex128)
+        pytta.default.precision = 'float64'
+        try:
+            sig = pytta.SignalObj(self.timeSignal, 'time', self.samplingRate)
+        finally:
+            pytta.default.precision = 'float32'
+        self.assertTrue(np.array_equal(sig.timeSignal, self.timeSignal))
+        product = sig * sig
+        self.assertEqual(product.precision, 'float64')
+        self.assertEqual(product.timeSignal.dtype, np.float64)
+        with self.assertRaises(ValueError):
+            pytta.SignalObj(self.timeSignal, 'time', self.samplingRate,
+                            precision='float16')
+
+
+if __name__ == '__main__':
+    unittest.main()